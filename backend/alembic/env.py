@@ -24,7 +24,7 @@ This file ensures that when you make changes to your SQLAlchemy models, Alembic
 """
 
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import create_engine, pool
 from alembic import context
 from app.core.config import settings  # Import application settings
 from app.db.base import Base  # Import SQLAlchemy Base with all models
@@ -79,20 +79,17 @@ def run_migrations_online():
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
-    # Get the Alembic configuration section
-    configuration = config.get_section(config.config_ini_section)
-    # Override the SQLAlchemy URL with the one from application settings
-    configuration["sqlalchemy.url"] = get_url()
+    # Create a SQLAlchemy engine for the migrations directly from the application URL
+    # NullPool is fine here because the whole run shares the single connection below
+    connectable = create_engine(get_url(), poolclass=pool.NullPool, future=True)
     
-    # Create a SQLAlchemy engine for the migrations
-    connectable = engine_from_config(
-        configuration, prefix="sqlalchemy.", poolclass=pool.NullPool,
-    )
-    
-    # Execute the migrations within a connection
+    # Execute the migrations within a single connection
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_schemas=False,  # Only reflect the default schema during autogenerate
+            compare_type=False,  # Skip column type comparison to cut reflection round-trips
         )
         with context.begin_transaction():
             context.run_migrations()
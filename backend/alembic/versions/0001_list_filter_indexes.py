@@ -0,0 +1,59 @@
+"""
+Add indexes for the user and document list filters
+
+Composite indexes cover the equality filters used by GET /users and
+GET /documents, and trigram GIN indexes let the ILIKE search use an index
+scan instead of reading the whole table.
+
+Revision ID: 0001_list_filter_indexes
+Revises:
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0001_list_filter_indexes"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Trigram operator classes for ILIKE '%term%' searches
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Users: role filter over active accounts, search on email and full name
+    op.create_index(
+        "ix_users_role_active", "users", ["role", "is_active"],
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_users_trgm_email", "users", ["email"],
+        postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_users_trgm_full_name", "users", ["full_name"],
+        postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"},
+    )
+
+    # Documents: owner and type filters, search on file name and description
+    op.create_index("ix_documents_user_type", "documents", ["user_id", "document_type"])
+    op.create_index(
+        "ix_documents_trgm_file_name", "documents", ["file_name"],
+        postgresql_using="gin", postgresql_ops={"file_name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_documents_trgm_desc", "documents", ["description"],
+        postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_trgm_desc", table_name="documents")
+    op.drop_index("ix_documents_trgm_file_name", table_name="documents")
+    op.drop_index("ix_documents_user_type", table_name="documents")
+    op.drop_index("ix_users_trgm_full_name", table_name="users")
+    op.drop_index("ix_users_trgm_email", table_name="users")
+    op.drop_index("ix_users_role_active", table_name="users")
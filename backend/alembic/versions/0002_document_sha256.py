@@ -0,0 +1,29 @@
+"""
+Add a SHA-256 digest column to documents
+
+The digest is computed while uploads are streamed to storage and is used
+for integrity checks and spotting duplicate uploads.
+
+Revision ID: 0002_document_sha256
+Revises: 0001_list_filter_indexes
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0002_document_sha256"
+down_revision = "0001_list_filter_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("sha256", sa.String(length=64), nullable=True))
+    op.create_index("ix_documents_sha256", "documents", ["sha256"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_sha256", table_name="documents")
+    op.drop_column("documents", "sha256")
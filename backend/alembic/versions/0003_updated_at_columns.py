@@ -0,0 +1,38 @@
+"""
+Add updated_at timestamps to users, documents and enrollments
+
+The timestamps version the records returned by GET /users/{id} and
+GET /documents/{id}, so those endpoints can answer conditional requests
+with 304 Not Modified.
+
+Revision ID: 0003_updated_at_columns
+Revises: 0002_document_sha256
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0003_updated_at_columns"
+down_revision = "0002_document_sha256"
+branch_labels = None
+depends_on = None
+
+TABLES = ("users", "documents", "enrollments")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        )
+    # Enrollment versions are looked up per student
+    op.create_index("ix_enrollments_student_updated", "enrollments", ["student_id", "updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_enrollments_student_updated", table_name="enrollments")
+    for table in reversed(TABLES):
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,44 @@
+"""
+Add indexes for the enrollment list filters
+
+Composite indexes cover the student and course filters of GET /enrollments
+together with the status filter, and an index on courses.instructor_id
+serves the JOIN that scopes instructors to their own courses. The indexes
+are built concurrently so the tables stay writable during the migration.
+
+Revision ID: 0004_enrollment_list_indexes
+Revises: 0003_updated_at_columns
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# Revision identifiers, used by Alembic
+revision = "0004_enrollment_list_indexes"
+down_revision = "0003_updated_at_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_enrollments_student_status", "enrollments", ["student_id", "status"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_enrollments_course_status", "enrollments", ["course_id", "status"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_courses_instructor_id", "courses", ["instructor_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_courses_instructor_id", table_name="courses", postgresql_concurrently=True)
+        op.drop_index("ix_enrollments_course_status", table_name="enrollments", postgresql_concurrently=True)
+        op.drop_index("ix_enrollments_student_status", table_name="enrollments", postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""
+Add indexes for newest-first notification pages
+
+GET /notifications pages through a user's notifications by descending ID.
+These indexes turn each page into a range scan, with or without the
+read-status filter, however deep the page.
+
+Revision ID: 0005_notification_keyset_indexes
+Revises: 0004_enrollment_list_indexes
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0005_notification_keyset_indexes"
+down_revision = "0004_enrollment_list_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_user_id_desc", "notifications", ["user_id", sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_notifications_user_read_id_desc", "notifications", ["user_id", "is_read", sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_notifications_user_read_id_desc", table_name="notifications", postgresql_concurrently=True)
+        op.drop_index("ix_notifications_user_id_desc", table_name="notifications", postgresql_concurrently=True)
@@ -0,0 +1,41 @@
+"""
+Add indexes for the notification type filter and unread counts
+
+Extends the keyset indexes from 0005 with one for the notification type
+filter, and adds a partial index over unread notifications that serves
+COUNT(*) for the unread badge and the mark-all-read UPDATE.
+
+Revision ID: 0006_notification_filter_indexes
+Revises: 0005_notification_keyset_indexes
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0006_notification_filter_indexes"
+down_revision = "0005_notification_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_user_type_id_desc", "notifications",
+            ["user_id", "notification_type", sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_notifications_user_unread", "notifications", ["user_id"],
+            postgresql_where=sa.text("NOT is_read"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_notifications_user_unread", table_name="notifications", postgresql_concurrently=True)
+        op.drop_index("ix_notifications_user_type_id_desc", table_name="notifications", postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""
+Add indexes for the payment list filters
+
+The payment list scopes rows through their enrollment and filters on
+status and a payment_date range. Equality columns lead each index and the
+date range comes last, so each filter combination is an index range scan.
+The student and instructor scopes are already served by the enrollments
+(student_id, ...) and courses(instructor_id) indexes.
+
+Revision ID: 0007_payment_filter_indexes
+Revises: 0006_notification_filter_indexes
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# Revision identifiers, used by Alembic
+revision = "0007_payment_filter_indexes"
+down_revision = "0006_notification_filter_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_payments_enrollment_date", "payments", ["enrollment_id", "payment_date"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_payments_status_date", "payments", ["status", "payment_date"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_payments_payment_date", "payments", ["payment_date"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_payments_payment_date", table_name="payments", postgresql_concurrently=True)
+        op.drop_index("ix_payments_status_date", table_name="payments", postgresql_concurrently=True)
+        op.drop_index("ix_payments_enrollment_date", table_name="payments", postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""
+Add a table of processed webhook events
+
+Stripe delivers webhooks at least once. Recording each handled event ID
+under a unique constraint lets a retried delivery be recognised and
+skipped even after the short-lived Redis claim has expired.
+
+Revision ID: 0008_processed_webhook_events
+Revises: 0007_payment_filter_indexes
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0008_processed_webhook_events"
+down_revision = "0007_payment_filter_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "processed_webhook_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("stripe_event_id", sa.String(length=255), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("stripe_event_id", name="uq_processed_webhook_events_stripe_event_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("processed_webhook_events")
@@ -0,0 +1,35 @@
+"""
+Add updated_at timestamps to payments and courses
+
+GET /enrollments/{id} returns the enrollment with its course and payments
+and answers If-Modified-Since from their latest timestamp, so a new payment,
+a refund or a course edit must move that timestamp too.
+
+Revision ID: 0009_payment_course_updated_at
+Revises: 0008_processed_webhook_events
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0009_payment_course_updated_at"
+down_revision = "0008_processed_webhook_events"
+branch_labels = None
+depends_on = None
+
+TABLES = ("payments", "courses")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, "updated_at")
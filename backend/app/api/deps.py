@@ -46,114 +46,410 @@ This file is crucial for enforcing security across the API and follows the princ
 
 """
 
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+import hashlib
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import AsyncIterator, Generator, Optional, Union
+from cachetools import TTLCache  # Short-lived cache for decoded tokens
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool  # Offload blocking work from the event loop
 from fastapi.security import OAuth2PasswordBearer  # FastAPI's OAuth2 password flow
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError  # JWT token handling
-from pydantic import ValidationError
+import jwt  # JWT token handling (PyJWT, HMAC via the cryptography/OpenSSL backend)
+import orjson  # Fast JSON parsing for token payloads
+from jwt import DecodeError, PyJWTError
+import msgspec  # Token claims conversion
+from app.core.cache import cache_user_profile, get_cached_user_profile  # Per-user profile cache
 from app.core.config import settings
 from app.core.security import ALGORITHM
-from app.db.session import SessionLocal
-from app.domain.models.user import User
-from app.repositories.user_repository import UserRepository
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.domain.models.user import (
+    User, UserRole, ROLE_MASK_ACTIVE, ROLE_MASK_ADMIN, ROLE_MASK_INSTRUCTOR, role_mask_for
+)
+from app.repositories import user_repository as user_repo  # Stateless user lookups
 from app.domain.schemas.token import TokenPayload
+from app.domain.schemas.user import User as UserSchema
+from app.services.enrollment_service import EnrollmentService
+from app.services.notification_service import NotificationService
+from app.services.payment_service import PaymentService
 
 # Configure OAuth2 with the token endpoint URL
 # This sets up the authentication scheme for the API
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-# Create an instance of the user repository for user-related operations
-user_repository = UserRepository()
+# Snapshot the settings used on every authenticated request so the hot path
+# reads module globals instead of going through the settings object
+_SECRET_KEY = settings.SECRET_KEY
+_JWT_ALGORITHMS = (ALGORITHM,)
+_JWT_OPTIONS = {"verify_signature": True, "verify_exp": True, "verify_aud": False}
+
+class _OrjsonJWT(jwt.PyJWT):
+    """PyJWT decoder that parses the claims with orjson instead of the stdlib json module."""
+    
+    def _decode_payload(self, decoded: dict) -> dict:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+# Shared decoder instance used for every authenticated request
+_jwt_decoder = _OrjsonJWT()
+
+# Permission bits checked by the authorization dependencies
+_ACTIVE = ROLE_MASK_ACTIVE
+_ADMIN = ROLE_MASK_ADMIN
+_STAFF = ROLE_MASK_ADMIN | ROLE_MASK_INSTRUCTOR
+
+# Authentication/authorization failures. A new exception is built for every
+# failure: raising mutates the exception (traceback, context), so sharing one
+# instance across concurrent requests would leak state between them.
+def _credentials_error() -> HTTPException:
+    """401 for a missing, invalid or expired token."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},  # Required by OAuth2 spec
+    )
+
+def _user_not_found_error() -> HTTPException:
+    """404 for a token whose user no longer exists."""
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+def _inactive_user_error() -> HTTPException:
+    """400 for a deactivated account."""
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+
+def _forbidden_error() -> HTTPException:
+    """403 for a user without the required role."""
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="The user doesn't have enough privileges",
+    )
+
+# Cache of validated token payloads keyed by a hash of the raw token
+# Only the claims (user ID, role, active flag and expiry) are stored, never the token itself
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+def _token_cache_key(token: str) -> str:
+    """Build the cache key for a raw JWT."""
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
 
 def get_db() -> Generator:
     """
     Dependency for database session.
     
-    Creates a new database session for each request and ensures it's closed
-    after the request is processed, even if an exception occurs.
+    Provides the request-scoped session. Cleanup is handled by
+    DBSessionMiddleware, which removes the session once the response is
+    produced, so connections are not held while FastAPI finalizes dependencies.
     """
-    try:
-        db = SessionLocal()  # Create a new database session
-        yield db  # Provide the session to the endpoint
-    finally:
-        db.close()  # Ensure the session is closed after use
+    yield SessionLocal()  # Provide the session bound to the current request
 
-def get_current_user(
-    db: Session = Depends(get_db),  # Get database session
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for an async database session.
+    
+    Used by endpoints that await their queries so database waits don't
+    occupy a threadpool worker. The session is closed when the request ends.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+class TokenUser:
+    """
+    Authenticated user built from the token claims, without a database row.
+    
+    Carries just enough to make authorization decisions (ID, role and active
+    status), so read endpoints don't need a SELECT per request. Endpoints that
+    modify or return the user's own record depend on get_current_active_db_user.
+    """
+    
+    __slots__ = ("id", "role", "is_active")
+    
+    def __init__(self, id: int, role: UserRole, is_active: bool):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+    
+    @property
+    def role_mask(self) -> int:
+        """Bitmask of the user's role and active status (see ROLE_MASK_* constants)."""
+        return role_mask_for(self.role, self.is_active)
+
+async def get_token_payload(
+    request: Request,  # Current request, used to remember auth failures
     token: str = Depends(oauth2_scheme)  # Get JWT token from request
-) -> User:
+) -> TokenPayload:
     """
-    Dependency for getting the current authenticated user.
+    Dependency for the validated claims of the bearer token.
     
-    Validates the JWT token, decodes it, and returns the corresponding user.
-    Raises appropriate HTTP exceptions if authentication fails.
+    A failure is stored on the request state and re-raised if the dependency
+    is evaluated again within the same request, instead of decoding again.
     """
+    cached_error = getattr(request.state, "_auth_error", None)
+    if cached_error is not None:
+        raise cached_error
+    
     try:
-        # Decode and validate the JWT token
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)  # Parse token data using Pydantic model
-    except (JWTError, ValidationError):
-        # If token is invalid, raise 401 Unauthorized
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},  # Required by OAuth2 spec
-        )
-    
-    # Get the user from the database using the user ID from the token
-    user = user_repository.get(db, id=token_data.sub)
+        return await _decode_token(token)
+    except HTTPException as exc:
+        # Failures are deterministic for a given token, so remember them
+        request.state._auth_error = exc
+        raise
+
+async def _decode_token(token: str) -> TokenPayload:
+    """
+    Validate a bearer token and return its claims.
+    
+    Signature verification runs in the threadpool so the event loop stays
+    free for other requests.
+    """
+    # Reuse the decoded payload if this token was validated recently
+    cache_key = _token_cache_key(token)
+    token_data = _token_cache.get(cache_key)
+    if token_data is not None and token_data.exp is not None and token_data.exp <= time.time():
+        # Token expired while cached, drop it and validate from scratch
+        _token_cache.pop(cache_key, None)
+        token_data = None
+    
+    if token_data is None:
+        try:
+            # Decode and validate the JWT token
+            payload = await run_in_threadpool(
+                _jwt_decoder.decode, token, _SECRET_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_OPTIONS
+            )
+            # Parse token claims; non-strict so a string "sub" is coerced to int
+            token_data = msgspec.convert(payload, TokenPayload, strict=False)
+            if token_data.sub is None:
+                raise ValueError("Token has no subject")
+            if token_data.role is not None:
+                UserRole(token_data.role)  # Reject unknown roles up front
+        except (PyJWTError, msgspec.ValidationError, ValueError):
+            # If token is invalid, raise 401 Unauthorized
+            raise _credentials_error() from None
+        _token_cache[cache_key] = token_data
+    
+    return token_data
+
+async def _load_user(db: Session, token_data: TokenPayload) -> User:
+    """Fetch the user row for validated token claims."""
+    # The user row is always resolved through the request's session, since
+    # ORM instances cannot be shared safely across sessions
+    user = await run_in_threadpool(user_repo.get, db, id=token_data.sub)
     if not user:
         # If user not found, raise 404 Not Found
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
+        raise _user_not_found_error()
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_user(
+    db: Session = Depends(get_db),  # Get database session
+    token_data: TokenPayload = Depends(get_token_payload),  # Validated token claims
+) -> User:
+    """
+    Dependency for getting the current authenticated user's database row.
+    
+    Validates the JWT token and returns the corresponding user.
+    Raises appropriate HTTP exceptions if authentication fails.
+    """
+    return await _load_user(db, token_data)
+
+async def get_current_principal(
+    token_data: TokenPayload = Depends(get_token_payload),  # Validated token claims
+) -> Union[TokenUser, User]:
+    """
+    Dependency for the current user as needed for authorization checks.
+    
+    Tokens carrying role and active claims are trusted as-is and no query is
+    made, so role changes and deactivation take effect when the token is
+    reissued. Tokens issued before these claims existed fall back to loading
+    the user row. Only read endpoints authorize this way; endpoints that
+    modify data depend on the get_current_*db* variants, which check the
+    user row.
+    """
+    if token_data.role is None or token_data.active is None:
+        return await _load_user(SessionLocal(), token_data)
+    return TokenUser(token_data.sub, UserRole(token_data.role), token_data.active)
+
+async def get_current_active_user(
+    current_user: Union[TokenUser, User] = Depends(get_current_principal),
+) -> Union[TokenUser, User]:
     """
     Dependency for getting the current active user.
     
     Ensures the authenticated user is active (not disabled).
     """
-    if not user_repository.is_active(current_user):
+    if not current_user.role_mask & _ACTIVE:
         # If user is inactive, raise 400 Bad Request
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user"
-        )
+        raise _inactive_user_error()
     return current_user
 
-def get_current_admin(current_user: User = Depends(get_current_active_user)) -> User:
+async def get_current_active_db_user(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency for getting the current active user's database row.
+    
+    Used by endpoints that read or modify the user's own record, and checks
+    the active status stored in the database rather than in the token.
+    """
+    if not current_user.role_mask & _ACTIVE:
+        # If user is inactive, raise 400 Bad Request
+        raise _inactive_user_error()
+    return current_user
+
+async def get_current_active_async_db_user(
+    db: AsyncSession = Depends(get_async_db),  # Request's async session, shared with the endpoint
+    token_data: TokenPayload = Depends(get_token_payload),  # Validated token claims
+) -> User:
+    """
+    Async variant of get_current_active_db_user for endpoints using get_async_db.
+    
+    The user row is loaded through the endpoint's own async session, so the
+    check costs one query and no extra connection.
+    """
+    user = await db.get(User, token_data.sub)
+    if not user:
+        # If user not found, raise 404 Not Found
+        raise _user_not_found_error()
+    if not user.role_mask & _ACTIVE:
+        # If user is inactive, raise 400 Bad Request
+        raise _inactive_user_error()
+    return user
+
+async def get_current_profile(
+    db: AsyncSession = Depends(get_async_db),  # Only queried on a cache miss
+    token_data: TokenPayload = Depends(get_token_payload),  # Validated token claims
+) -> dict:
+    """
+    Dependency for the current user's serialized profile.
+    
+    The profile is served from the per-user cache, so repeated /me requests
+    cost a token check and a cache read instead of a user query. Changes to
+    the user drop the entry through invalidate_user.
+    """
+    profile = await get_cached_user_profile(token_data.sub)
+    if profile is None:
+        user = await db.get(User, token_data.sub)
+        if not user:
+            # If user not found, raise 404 Not Found
+            raise _user_not_found_error()
+        profile = UserSchema.model_validate(user).model_dump(mode="json")
+        await cache_user_profile(token_data.sub, profile)
+    return profile
+
+async def get_current_active_profile(profile: dict = Depends(get_current_profile)) -> dict:
+    """Dependency for the current active user's serialized profile."""
+    if not profile["is_active"]:
+        # If user is inactive, raise 400 Bad Request
+        raise _inactive_user_error()
+    return profile
+
+async def get_current_db_admin(current_user: User = Depends(get_current_active_db_user)) -> User:
+    """
+    Dependency for the current admin's database row.
+    
+    Used by endpoints that modify data, so an admin who was demoted or
+    deactivated loses access immediately rather than when the token expires.
+    """
+    if not current_user.role_mask & _ADMIN:
+        # If user is not an admin, raise 403 Forbidden
+        raise _forbidden_error()
+    return current_user
+
+async def get_current_async_db_admin(
+    current_user: User = Depends(get_current_active_async_db_user),
+) -> User:
+    """Async variant of get_current_db_admin for endpoints using get_async_db."""
+    if not current_user.role_mask & _ADMIN:
+        # If user is not an admin, raise 403 Forbidden
+        raise _forbidden_error()
+    return current_user
+
+async def get_current_db_instructor_or_admin(
+    current_user: User = Depends(get_current_active_db_user),
+) -> User:
+    """
+    Dependency for the current instructor's or admin's database row.
+    
+    Used by endpoints that modify data; see get_current_db_admin.
+    """
+    if not current_user.role_mask & _STAFF:
+        # If user is neither an admin nor an instructor, raise 403 Forbidden
+        raise _forbidden_error()
+    return current_user
+
+async def get_current_admin(
+    current_user: Union[TokenUser, User] = Depends(get_current_active_user),
+) -> Union[TokenUser, User]:
     """
     Dependency for getting the current admin user.
     
     Ensures the authenticated user has admin privileges.
     """
-    if not user_repository.is_admin(current_user):
+    if not current_user.role_mask & _ADMIN:
         # If user is not an admin, raise 403 Forbidden
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="The user doesn't have enough privileges"
-        )
+        raise _forbidden_error()
     return current_user
 
-def get_current_instructor_or_admin(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+async def get_current_instructor_or_admin(
+    current_user: Union[TokenUser, User] = Depends(get_current_active_user),
+) -> Union[TokenUser, User]:
     """
     Dependency for getting the current instructor or admin user.
     
     Ensures the authenticated user has instructor or admin privileges.
     """
-    if not (user_repository.is_admin(current_user) or user_repository.is_instructor(current_user)):
+    if not current_user.role_mask & _STAFF:
         # If user is neither an admin nor an instructor, raise 403 Forbidden
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="The user doesn't have enough privileges"
-        )
-    return current_user
\ No newline at end of file
+        raise _forbidden_error()
+    return current_user
+
+@dataclass(frozen=True, slots=True)
+class AuthContext:
+    """Async database session and active authenticated user for a request."""
+    
+    db: AsyncSession
+    user: Union[TokenUser, User]
+
+async def get_auth_context(
+    db: AsyncSession = Depends(get_async_db),
+    user: Union[TokenUser, User] = Depends(get_current_active_user),
+) -> AuthContext:
+    """
+    Dependency bundling the async session and the current active user.
+    
+    Endpoints declare this single dependency instead of resolving the session
+    and the user separately, keeping their signatures and dependency trees small.
+    """
+    return AuthContext(db, user)
+
+async def get_write_auth_context(
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_active_async_db_user),
+) -> AuthContext:
+    """
+    Dependency bundling the async session and the current active user's row.
+    
+    Used instead of get_auth_context by endpoints that modify data, so the
+    role and active status are checked against the database.
+    """
+    return AuthContext(db, user)
+
+@lru_cache(maxsize=None)
+def _service_instance(service_class: type):
+    """Create a stateless service on first use and share it for the worker's lifetime."""
+    return service_class()
+
+async def get_enrollment_service() -> EnrollmentService:
+    """Dependency for the shared enrollment service."""
+    return _service_instance(EnrollmentService)
+
+async def get_notification_service() -> NotificationService:
+    """Dependency for the shared notification service."""
+    return _service_instance(NotificationService)
+
+async def get_payment_service() -> PaymentService:
+    """Dependency for the shared payment service."""
+    return _service_instance(PaymentService)
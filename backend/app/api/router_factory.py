@@ -0,0 +1,86 @@
+"""
+Objective: Build standard CRUD routers from a single definition.
+This file provides a factory that registers the list/create/read/update/delete
+endpoints for a resource, so resource modules that share the same route shape
+do not each repeat five hand-written handlers.
+"""
+
+from typing import Optional
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse, Response
+
+# Placeholder bodies, encoded once at import. Handlers wrap them in a plain
+# Response, so requests skip validation and serialization entirely. Each
+# request gets its own Response, since middleware mutates its headers.
+_EMPTY_LIST_BODY = b"[]"
+_EMPTY_OBJECT_BODY = b"{}"
+
+
+def _empty_list() -> Response:
+    """Fresh placeholder list response."""
+    return Response(content=_EMPTY_LIST_BODY, media_type="application/json")
+
+
+def _empty_object() -> Response:
+    """Fresh placeholder object response."""
+    return Response(content=_EMPTY_OBJECT_BODY, media_type="application/json")
+
+
+def make_crud_router(
+    singular: str,
+    plural: str,
+    *,
+    label: Optional[str] = None,
+) -> APIRouter:
+    """
+    Create a router with the standard CRUD endpoints for a resource.
+
+    Args:
+        singular: Resource name used in route names (e.g. "program")
+        plural: Plural resource name used for the list route (e.g. "programs")
+        label: Human-readable name for endpoint descriptions (defaults to singular)
+
+    Returns:
+        Router exposing GET /, POST /, GET /{id}, PUT /{id} and DELETE /{id}
+    """
+    label = label or singular.replace("_", " ")
+    router = APIRouter(default_response_class=ORJSONResponse)
+
+    # Async handlers so the placeholder responses don't take a threadpool hop
+    async def read_items() -> Response:
+        return _empty_list()
+
+    async def create_item() -> Response:
+        return _empty_object()
+
+    async def read_item(id: int) -> Response:
+        return _empty_object()
+
+    async def update_item(id: int) -> Response:
+        return _empty_object()
+
+    async def delete_item(id: int) -> Response:
+        return _empty_object()
+
+    # Route names keep the per-resource operation IDs unique in the OpenAPI schema
+    router.add_api_route(
+        "/", read_items, methods=["GET"], response_model=None,
+        name=f"read_{plural}", description=f"Retrieve {label}s.",
+    )
+    router.add_api_route(
+        "/", create_item, methods=["POST"], response_model=None,
+        name=f"create_{singular}", description=f"Create new {label}.",
+    )
+    router.add_api_route(
+        "/{id}", read_item, methods=["GET"], response_model=None,
+        name=f"read_{singular}", description=f"Get {label} by ID.",
+    )
+    router.add_api_route(
+        "/{id}", update_item, methods=["PUT"], response_model=None,
+        name=f"update_{singular}", description=f"Update a {label}.",
+    )
+    router.add_api_route(
+        "/{id}", delete_item, methods=["DELETE"], response_model=None,
+        name=f"delete_{singular}", description=f"Delete a {label}.",
+    )
+    return router
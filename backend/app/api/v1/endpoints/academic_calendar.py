@@ -1,44 +1,3 @@
-from fastapi import APIRouter, Depends
-from typing import Any, List
+from app.api.router_factory import make_crud_router
 
-router = APIRouter()
-
-
-@router.get("/", response_model=List[Any])
-def read_events() -> Any:
-    """
-    Retrieve academic calendar events.
-    """
-    return []
-
-
-@router.post("/", response_model=Any)
-def create_event() -> Any:
-    """
-    Create new academic calendar event.
-    """
-    return {}
-
-
-@router.get("/{id}", response_model=Any)
-def read_event(id: int) -> Any:
-    """
-    Get academic calendar event by ID.
-    """
-    return {}
-
-
-@router.put("/{id}", response_model=Any)
-def update_event(id: int) -> Any:
-    """
-    Update an academic calendar event.
-    """
-    return {}
-
-
-@router.delete("/{id}", response_model=Any)
-def delete_event(id: int) -> Any:
-    """
-    Delete an academic calendar event.
-    """
-    return {}
+router = make_crud_router("event", "events", label="academic calendar event")
@@ -46,7 +46,7 @@ Proper HTTP status codes and headers for authentication errors
 Integration Points:
 
 Uses authentication dependencies from deps.py
-Delegates business logic to UserService
+Delegates business logic to the user service
 Uses domain schemas for request/response data validation
 
 
@@ -55,10 +55,11 @@ This file follows RESTful API design principles with clearly defined endpoints f
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool  # Run blocking password checks off the event loop
 from fastapi.security import OAuth2PasswordRequestForm  # For standard OAuth2 login form
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_user  # Authentication dependencies
-from app.services.user_service import UserService  # User-related business logic
+from app.api.deps import get_db, get_current_profile  # Authentication dependencies
+from app.services import user_service  # Stateless user operations
 from app.domain.schemas.user import UserCreate, User, UserWithToken  # Data models/schemas
 from app.domain.schemas.token import Token  # Token response schema
 from app.core.exceptions import AuthenticationError, ValidationError  # Custom exceptions
@@ -66,11 +67,8 @@ from app.core.exceptions import AuthenticationError, ValidationError  # Custom e
 # Create a router for authentication endpoints
 router = APIRouter()
 
-# Create a service instance for user-related operations
-user_service = UserService()
-
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     db: Session = Depends(get_db),  # Get database session
     form_data: OAuth2PasswordRequestForm = Depends()  # Parse OAuth2 login form
 ) -> Token:
@@ -82,7 +80,9 @@ def login(
     """
     try:
         # Authenticate the user (username in OAuth2 form = email in our system)
-        user_with_token = user_service.authenticate(
+        # bcrypt verification is deliberately slow, so keep it off the event loop
+        user_with_token = await run_in_threadpool(
+            user_service.authenticate,
             db, email=form_data.username, password=form_data.password
         )
         
@@ -95,7 +95,7 @@ def login(
         # Handle authentication failures with appropriate HTTP response
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(e.detail),
+            detail=e.detail,
             headers={"WWW-Authenticate": "Bearer"},  # Required by OAuth2 spec
         )
 
@@ -115,15 +115,16 @@ def register(*, db: Session = Depends(get_db), user_in: UserCreate) -> User:
         # Handle validation errors with appropriate HTTP response
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e.detail),
+            detail=e.detail,
         )
 
 @router.get("/me", response_model=User)
-def read_users_me(current_user: User = Depends(get_current_user)) -> User:
+async def read_users_me(current_user: dict = Depends(get_current_profile)) -> User:
     """
     Get current user information.
     
     This endpoint returns the authenticated user's information.
     Requires a valid JWT token in the Authorization header.
+    The profile is served from a per-user cache for up to 30 seconds.
     """
-    return current_user
\ No newline at end of file
+    return current_user
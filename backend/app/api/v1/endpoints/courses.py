@@ -5,7 +5,9 @@ and deleting user accounts, with appropriate access control.
 """
 
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api import deps
@@ -13,18 +15,17 @@ from app.domain.models.user import User
 from app.domain.schemas.user import (
     User as UserSchema, UserCreate, UserUpdate, UserWithEnrollments
 )
-from app.services.user_service import UserService
-from app.core.exceptions import NotFoundError, ValidationError
+from app.services import user_service  # Stateless user operations
+from app.core.cache import invalidate_user
+from app.utils.etag import etag_matches, make_etag  # Conditional GET support
+from anyio.from_thread import run as run_async  # Call async cache helpers from sync handlers
 
 # Create a router for user endpoints
 router = APIRouter()
 
-# Create a service instance for user operations
-user_service = UserService()
-
 @router.get("/", response_model=List[UserSchema])
-def read_users(
-    db: Session = Depends(deps.get_db),
+async def read_users(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,  # Pagination offset
     limit: int = 100,  # Pagination limit
     role: Optional[str] = None,  # Filter by role
@@ -36,7 +37,9 @@ def read_users(
     Retrieve users with filtering.
     
     This endpoint returns a list of users with optional filtering by role,
-    active status, and search term. Admin access only.
+    active status, and search term. Admin access only. The total number of
+    matching users is returned in the X-Total-Count header. Rows are
+    serialized straight to JSON, skipping response_model re-validation.
     """
     # Build filters
     filters = {}
@@ -47,16 +50,21 @@ def read_users(
     if search:
         filters["search"] = search
     
-    return user_service.get_filtered_users(
+    users = await user_service.get_filtered_users(
         db, skip=skip, limit=limit, **filters
     )
+    total = await user_service.count_filtered_users(db, **filters)
+    return ORJSONResponse(
+        [UserSchema.model_validate(user).model_dump() for user in users],
+        headers={"X-Total-Count": str(total)},
+    )
 
 @router.post("/", response_model=UserSchema)
 def create_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: UserCreate,  # User data
-    current_user: User = Depends(deps.get_current_admin),  # Admin user only
+    current_user: User = Depends(deps.get_current_db_admin),  # Admin user only
 ) -> Any:
     """
     Create new user.
@@ -64,35 +72,26 @@ def create_user(
     This endpoint creates a new user with the provided information.
     Admin access only.
     """
-    try:
-        # Check if email already exists
-        user = user_service.get_by_email(db, email=user_in.email)
-        if user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        
-        # Create user
-        return user_service.create_user(db, obj_in=user_in)
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
+    # Check if email already exists
+    user = user_service.get_by_email(db, email=user_in.email)
+    if user:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
         )
+    
+    # Create user
+    return user_service.create_user(db, obj_in=user_in)
 
 @router.get("/me", response_model=UserSchema)
-def read_user_me(
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+async def read_user_me(
+    current_user: dict = Depends(deps.get_current_active_profile),  # Authenticated user's cached profile
 ) -> Any:
     """
     Get current user.
     
     This endpoint returns the authenticated user's profile information.
+    The profile is served from a per-user cache for up to 30 seconds.
     """
     return current_user
 
@@ -101,36 +100,30 @@ def update_user_me(
     *,
     db: Session = Depends(deps.get_db),
     user_in: UserUpdate,  # Update data
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+    current_user: User = Depends(deps.get_current_active_db_user),  # Authenticated user
 ) -> Any:
     """
     Update current user.
     
     This endpoint allows users to update their own profile information.
     """
-    try:
-        # Users cannot change their own role
-        if user_in.role and user_in.role != current_user.role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Cannot change your own role"
-            )
-        
-        # Update user
-        return user_service.update(db, db_obj=current_user, obj_in=user_in)
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
+    # Users cannot change their own role
+    if user_in.role and user_in.role != current_user.role:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot change your own role",
         )
+    
+    # Update user and drop its cached views
+    user = user_service.update_user(db, id=current_user.id, obj_in=user_in)
+    run_async(invalidate_user, current_user.id)
+    return user
 
 @router.get("/{id}", response_model=UserWithEnrollments)
 def read_user(
     *,
+    request: Request,  # Used for If-None-Match
+    response: Response,  # Used to set the ETag
     db: Session = Depends(deps.get_db),
     id: int,  # User ID
     current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
@@ -140,27 +133,31 @@ def read_user(
     
     This endpoint returns a user's profile with their enrollments.
     Users can only view their own profile, while admins can view any user.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified
+    without loading the user.
     """
-    try:
-        # Check permissions - users can only view their own profile
-        if current_user.role != "admin" and current_user.id != id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this user"
-            )
-        
-        # Get user with enrollments
-        user = user_service.get_with_enrollments(db, id)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
-        return user
-    except Exception as e:
-        # Handle unexpected errors
+    # Check permissions - users can only view their own profile
+    if current_user.role != "admin" and current_user.id != id:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this user",
         )
+    
+    # Answer from the version alone if the client's copy is current
+    version = user_service.get_version(db, id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    etag = make_etag("user", id, *version)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # Get user with enrollments
+    user = user_service.get_with_enrollments(db, id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    
+    return user
 
 @router.put("/{id}", response_model=UserSchema)
 def update_user(
@@ -168,37 +165,25 @@ def update_user(
     db: Session = Depends(deps.get_db),
     id: int,  # User ID
     user_in: UserUpdate,  # Update data
-    current_user: User = Depends(deps.get_current_admin),  # Admin user only
+    current_user: User = Depends(deps.get_current_db_admin),  # Admin user only
 ) -> Any:
     """
     Update user.
     
     This endpoint allows admins to update any user's profile.
     """
-    try:
-        # Get user
-        user = user_service.get(db, id)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
-        # Update user
-        return user_service.update(db, db_obj=user, obj_in=user_in)
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Update user and drop its cached views
+    # (NotFoundError is mapped to 404 by the app's handlers)
+    user = user_service.update_user(db, id=id, obj_in=user_in)
+    run_async(invalidate_user, id)
+    return user
 
 @router.delete("/{id}", response_model=UserSchema)
 def delete_user(
     *,
     db: Session = Depends(deps.get_db),
     id: int,  # User ID
-    current_user: User = Depends(deps.get_current_admin),  # Admin user only
+    current_user: User = Depends(deps.get_current_db_admin),  # Admin user only
 ) -> Any:
     """
     Delete user.
@@ -206,51 +191,37 @@ def delete_user(
     This endpoint allows admins to delete users.
     Users cannot be permanently deleted, only deactivated.
     """
-    try:
-        # Get user
-        user = user_service.get(db, id)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
-        # Prevent deleting the last admin
-        if user.role == "admin":
-            admin_count = user_service.count_admins(db)
-            if admin_count <= 1:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Cannot delete the last admin user"
-                )
-        
-        # Soft delete user
-        return user_service.deactivate_user(db, id=id)
-    except Exception as e:
-        # Handle unexpected errors
+    # Get user
+    user = user_service.get(db, id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    
+    # Prevent deleting the last admin
+    if user.role == "admin" and not user_service.has_other_admin(db, id):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete the last admin user",
         )
+    
+    # Soft delete user and drop its cached views
+    user = user_service.deactivate_user(db, id=id)
+    run_async(invalidate_user, id)
+    return user
 
 @router.put("/{id}/activate", response_model=UserSchema)
 def activate_user(
     *,
     db: Session = Depends(deps.get_db),
     id: int,  # User ID
-    current_user: User = Depends(deps.get_current_admin),  # Admin user only
+    current_user: User = Depends(deps.get_current_db_admin),  # Admin user only
 ) -> Any:
     """
     Activate user.
     
     This endpoint allows admins to activate a deactivated user.
     """
-    try:
-        # Activate user
-        return user_service.activate_user(db, id=id)
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
\ No newline at end of file
+    # Activate user and drop its cached views
+    # (NotFoundError is mapped to 404 by the app's handlers)
+    user = user_service.activate_user(db, id=id)
+    run_async(invalidate_user, id)
+    return user
\ No newline at end of file
@@ -1,44 +1,3 @@
-from fastapi import APIRouter, Depends
-from typing import Any, List
+from app.api.router_factory import make_crud_router
 
-router = APIRouter()
-
-
-@router.get("/", response_model=List[Any])
-def read_mappings() -> Any:
-    """
-    Retrieve curriculum mappings.
-    """
-    return []
-
-
-@router.post("/", response_model=Any)
-def create_mapping() -> Any:
-    """
-    Create new curriculum mapping.
-    """
-    return {}
-
-
-@router.get("/{id}", response_model=Any)
-def read_mapping(id: int) -> Any:
-    """
-    Get curriculum mapping by ID.
-    """
-    return {}
-
-
-@router.put("/{id}", response_model=Any)
-def update_mapping(id: int) -> Any:
-    """
-    Update a curriculum mapping.
-    """
-    return {}
-
-
-@router.delete("/{id}", response_model=Any)
-def delete_mapping(id: int) -> Any:
-    """
-    Delete a curriculum mapping.
-    """
-    return {}
+router = make_crud_router("mapping", "mappings", label="curriculum mapping")
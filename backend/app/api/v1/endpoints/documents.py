@@ -35,7 +35,7 @@ Secure file handling
 Notable Implementation Details:
 
 Uses FastAPI's File handling for uploads
-Uses FileResponse for file downloads
+Uses a zero-copy FileResponse for file downloads
 Implements filtering, pagination, and search
 Differentiates between metadata operations vs. file operations
 
@@ -46,42 +46,41 @@ This endpoint demonstrates a mature approach to file management in a web API, pr
 """
 
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
-from fastapi.responses import FileResponse  # For file downloads
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File, status
+from fastapi.responses import ORJSONResponse
+from app.core.config import settings  # Application settings
+from app.core.exceptions import NotFoundError  # Service-layer exceptions
+from app.utils.file_response import file_download_response  # For zero-copy or proxy-served file downloads
 import os
 
 from app.api import deps  # Authentication dependencies
-from app.domain.models.user import User
 from app.domain.models.document import DocumentType  # Enum of document types
 from app.domain.schemas.document import (
     Document, DocumentCreate, DocumentUpdate, DocumentWithUser  # Data models/schemas
 )
-from app.services.document_service import DocumentService  # Document business logic
-from app.core.exceptions import NotFoundError, ValidationError  # Custom exceptions
+from app.services import document_service  # Stateless document operations
+from app.utils.etag import etag_matches, make_etag  # Conditional GET support
 
 # Create a router for document endpoints
 router = APIRouter()
 
-# Create a service instance for document operations
-document_service = DocumentService()
-
 @router.get("/", response_model=List[Document])
-def read_documents(
-    db: Session = Depends(deps.get_db),
+async def read_documents(
+    ctx: deps.AuthContext = Depends(deps.get_auth_context),  # Session and authenticated user
     skip: int = 0,  # Pagination offset
     limit: int = 100,  # Pagination limit
     user_id: Optional[int] = None,  # Filter by user ID
     document_type: Optional[DocumentType] = None,  # Filter by document type
     search: Optional[str] = None,  # Search in document metadata
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Retrieve documents with filtering.
     
     This endpoint returns a list of documents with optional filtering by user,
     document type, and search term. Access control ensures users only see
-    documents they're authorized to view.
+    documents they're authorized to view. The total number of matching
+    documents is returned in the X-Total-Count header. Rows are serialized
+    straight to JSON, skipping response_model re-validation.
     """
     # Build filters dictionary for the service layer
     filters = {}
@@ -91,93 +90,95 @@ def read_documents(
         filters["search"] = search
     
     # Apply access control based on user role
-    if current_user.role == "admin":
+    if ctx.user.role == "admin":
         # Admins can view anyone's documents
         if user_id:
             filters["user_id"] = user_id
     else:
         # Regular users can only view their own documents
-        filters["user_id"] = current_user.id
-        if user_id and user_id != current_user.id:
+        filters["user_id"] = ctx.user.id
+        if user_id and user_id != ctx.user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access other users' documents"
+                detail="Not authorized to access other users' documents",
             )
     
     # Get filtered documents from service
-    return document_service.get_filtered_documents(
-        db, skip=skip, limit=limit, **filters
+    documents = await document_service.get_filtered_documents(
+        ctx.db, skip=skip, limit=limit, **filters
+    )
+    total = await document_service.count_filtered_documents(ctx.db, **filters)
+    return ORJSONResponse(
+        [Document.model_validate(document).model_dump() for document in documents],
+        headers={"X-Total-Count": str(total)},
     )
 
 @router.post("/", response_model=Document)
 async def upload_document(
     *,
-    db: Session = Depends(deps.get_db),
+    ctx: deps.AuthContext = Depends(deps.get_write_auth_context),  # Session and active user row
     file: UploadFile = File(...),  # The uploaded file
     document_type: DocumentType,  # Document classification
     description: Optional[str] = None,  # Optional document description
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Upload a new document.
     
     This endpoint handles file uploads, stores the file, and creates a
     document record in the database linking the file to the user.
+    The file is copied to storage in chunks rather than read into memory.
     """
-    try:
-        # Use document service to handle the upload
-        return await document_service.upload_document(
-            db, 
-            file=file, 
-            document_type=document_type,
-            user_id=current_user.id,
-            description=description
-        )
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Use document service to handle the upload
+    return await document_service.upload_document(
+        ctx.db, 
+        file=file, 
+        document_type=document_type,
+        user_id=ctx.user.id,
+        description=description
+    )
 
 @router.get("/{id}", response_model=DocumentWithUser)
-def read_document(
+async def read_document(
     *,
-    db: Session = Depends(deps.get_db),
+    request: Request,  # Used for If-None-Match
+    response: Response,  # Used to set the ETag
+    ctx: deps.AuthContext = Depends(deps.get_auth_context),  # Session and authenticated user
     id: int,  # Document ID
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Get document by ID with user details.
     
     This endpoint returns a single document with its associated user's information,
     ensuring the requester has permission to view it.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified
+    without loading the document.
     """
-    try:
-        # Get document with user details
-        document = document_service.get_with_user(db, id)
-        
-        # Check permissions - only admins or the document owner can view
-        if current_user.role != "admin" and document.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this document"
-            )
-        
-        return document
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
+    version = await document_service.get_version(ctx.db, id)
+    if version is None:
+        raise NotFoundError(detail="Document not found")
+    owner_id = version[0]
+    
+    # Check permissions - only admins or the document owner can view
+    if ctx.user.role != "admin" and owner_id != ctx.user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this document",
+        )
+    
+    # Answer from the version alone if the client's copy is current
+    etag = make_etag("document", id, *version)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # Get document with user details
+    return await document_service.get_with_user(ctx.db, id)
 
 @router.get("/{id}/download")
-def download_document(
+async def download_document(
     *,
-    db: Session = Depends(deps.get_db),
+    ctx: deps.AuthContext = Depends(deps.get_auth_context),  # Session and authenticated user
     id: int,  # Document ID
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Download document file.
@@ -185,43 +186,26 @@ def download_document(
     This endpoint streams the actual document file to the client,
     with proper content type and filename headers.
     """
-    try:
-        # Get document metadata
-        document = document_service.get(db, id)
-        
-        # Check permissions - only admins or the document owner can download
-        if current_user.role != "admin" and document.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to download this document"
-            )
-        
-        # Get file info including path
-        file_info = document_service.get_document_file(db, id=id)
-        
-        # Return file as a downloadable response
-        return FileResponse(
-            path=file_info["file_path"],
-            filename=file_info["file_name"],
-            media_type=f"application/{file_info['file_type']}"
-        )
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Get file info including path; only admins or the document owner can download
+    file_info = await document_service.get_document_file(ctx.db, id=id, requester=ctx.user)
+    
+    # Return file as a downloadable response; behind nginx the proxy serves it
+    # via X-Accel-Redirect, otherwise the server sends it with sendfile()
+    # when it supports the pathsend extension
+    return file_download_response(
+        file_info["file_path"],
+        file_info["file_name"],
+        f"application/{file_info['file_type']}",
+        root_dir=settings.UPLOAD_DIR,
+        accel_redirect_prefix=settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX,
+    )
 
 @router.put("/{id}", response_model=Document)
-def update_document(
+async def update_document(
     *,
-    db: Session = Depends(deps.get_db),
+    ctx: deps.AuthContext = Depends(deps.get_write_auth_context),  # Session and active user row
     id: int,  # Document ID
     document_in: DocumentUpdate,  # Update data
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Update document metadata.
@@ -229,35 +213,17 @@ def update_document(
     This endpoint updates document information such as title, description,
     or document type, but does not replace the file itself.
     """
-    try:
-        # Get document to check permissions
-        document = document_service.get(db, id)
-        
-        # Check permissions - only admins or the document owner can update
-        if current_user.role != "admin" and document.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to update this document"
-            )
-        
-        # Update document
-        return document_service.update(db, id=id, obj_in=document_in)
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Update document; only admins or the document owner can update
+    document = await document_service.update_document(
+        ctx.db, id=id, obj_in=document_in, requester=ctx.user
+    )
+    return document
 
 @router.delete("/{id}", response_model=Document)
-def delete_document(
+async def delete_document(
     *,
-    db: Session = Depends(deps.get_db),
+    ctx: deps.AuthContext = Depends(deps.get_write_auth_context),  # Session and active user row
     id: int,  # Document ID
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Delete document and its file.
@@ -265,25 +231,6 @@ def delete_document(
     This endpoint removes both the document record from the database
     and the associated file from storage.
     """
-    try:
-        # Get document to check permissions
-        document = document_service.get(db, id)
-        
-        # Check permissions - only admins or the document owner can delete
-        if current_user.role != "admin" and document.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to delete this document"
-            )
-        
-        # Delete document and file
-        return document_service.delete_document(db, id=id)
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
\ No newline at end of file
+    # Delete document and file; only admins or the document owner can delete
+    document = await document_service.delete_document(ctx.db, id=id, requester=ctx.user)
+    return document
\ No newline at end of file
@@ -38,43 +38,58 @@ Email notifications for important status changes
 Statistics aggregation for administrative oversight
 
 
-Improvement Notes:
-
-There's a missing import for course_service which is used in the read_enrollments function
-
-
-
 This endpoint demonstrates sophisticated role-based access control and business logic that goes beyond simple CRUD operations, incorporating event-driven notifications and complex permission rules based on the user's relationship to the data.
 
 """
 
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.api import deps  # Authentication dependencies
-from app.domain.models.user import User
+from app.domain.models.user import (
+    User, ROLE_MASK_ADMIN, ROLE_MASK_INSTRUCTOR, ROLE_MASK_STUDENT  # Role bits
+)
 from app.domain.models.enrollment import EnrollmentStatus, PaymentStatus  # Enrollment enums
 from app.domain.schemas.enrollment import (
     Enrollment, EnrollmentCreate, EnrollmentUpdate, EnrollmentWithDetails  # Data models/schemas
 )
+from app.core.exceptions import NotFoundError  # Mapped to 404 by the app's handler
 from app.services.enrollment_service import EnrollmentService  # Enrollment business logic
-from app.services.notification_service import NotificationService  # Notification service for alerts
-from app.core.exceptions import NotFoundError, ValidationError  # Custom exceptions
+from app.tasks.notifications import (
+    notify_enrollment_status_changed, notify_enrollment_submitted,  # Background notification tasks
+    publish_notification,
+)
+from app.utils.etag import etag_matches, http_date, make_etag, not_modified_since  # Conditional GET support
+
+# Create a router for enrollment endpoints; responses are encoded with orjson
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Create a router for enrollment endpoints
-router = APIRouter()
+# Statistics are recomputed at most every 30 seconds, so clients may reuse them as long
+_STATS_CACHE_CONTROL = "private, max-age=30"
 
-# Create service instances
-enrollment_service = EnrollmentService()
-notification_service = NotificationService()
-# Note: course_service is not imported but used in the code (minor issue to fix)
+# Enrollment fields an update request touches, as bits
+_FIELD_NOTES = 1
+_FIELD_STATUS = 2
+_FIELD_PAYMENT_STATUS = 4
+_ROLE_BITS = ROLE_MASK_ADMIN | ROLE_MASK_INSTRUCTOR | ROLE_MASK_STUDENT
+
+# Fields each role may update, with the 403 detail for anything else:
+# students only notes, instructors notes and status, admins everything
+_UPDATE_FIELD_RULES = {
+    ROLE_MASK_STUDENT: (_FIELD_NOTES, "Students can only update notes"),
+    ROLE_MASK_INSTRUCTOR: (_FIELD_NOTES | _FIELD_STATUS, "Instructors cannot update payment status"),
+    ROLE_MASK_ADMIN: (_FIELD_NOTES | _FIELD_STATUS | _FIELD_PAYMENT_STATUS, None),
+}
 
 @router.get("/", response_model=List[Enrollment])
 def read_enrollments(
+    response: Response,  # Used to set the next-page header
     db: Session = Depends(deps.get_db),
-    skip: int = 0,  # Pagination offset
-    limit: int = 100,  # Pagination limit
+    enrollment_service: EnrollmentService = Depends(deps.get_enrollment_service),  # Shared service
+    after_id: Optional[int] = Query(None, ge=0),  # Return enrollments after this ID (keyset pagination)
+    limit: int = Query(100, ge=1, le=200),  # Pagination limit, capped to keep pages small
     status: Optional[EnrollmentStatus] = None,  # Filter by enrollment status
     payment_status: Optional[PaymentStatus] = None,  # Filter by payment status
     student_id: Optional[int] = None,  # Filter by student
@@ -86,7 +101,11 @@ def read_enrollments(
     
     This endpoint returns a list of enrollments with optional filtering.
     Access control ensures users only see enrollments they're authorized to view.
+    Results are ordered by ID. When a full page is returned, the X-Next-After-Id
+    header carries the after_id for the next page.
     """
+    role_mask = current_user.role_mask  # Role bits, computed once per request
+    
     # Build filters dictionary for the service layer
     filters = {}
     if status:
@@ -95,41 +114,37 @@ def read_enrollments(
         filters["payment_status"] = payment_status
     
     # Apply access control based on user role
-    if current_user.role == "student":
+    if role_mask & ROLE_MASK_STUDENT:
         # Students can only see their own enrollments
         filters["student_id"] = current_user.id
-    elif current_user.role == "instructor":
-        # If student_id is specified, verify it's for a student in instructor's course
-        if student_id:
-            filters["student_id"] = student_id
-        
-        # Instructors can only see enrollments for their courses
-        if course_id:
-            filters["course_id"] = course_id
-        else:
-            # Get all courses taught by this instructor
-            instructor_courses = course_service.get_instructor_courses(db, instructor_id=current_user.id)
-            if not instructor_courses:
-                return []
-            filters["course_id"] = [course.id for course in instructor_courses]
-    else:
-        # Admins can see all enrollments with optional filters
-        if student_id:
-            filters["student_id"] = student_id
-        if course_id:
-            filters["course_id"] = course_id
+    elif student_id:
+        filters["student_id"] = student_id
+    if course_id:
+        filters["course_id"] = course_id
     
     # Get filtered enrollments from service
-    return enrollment_service.get_filtered_enrollments(
-        db, skip=skip, limit=limit, **filters
-    )
+    if role_mask & ROLE_MASK_INSTRUCTOR:
+        # Instructors can only see enrollments for their courses,
+        # scoped with a JOIN on courses in the same query
+        enrollments = enrollment_service.get_filtered_enrollments_for_instructor(
+            db, instructor_id=current_user.id, after_id=after_id, limit=limit, **filters
+        )
+    else:
+        enrollments = enrollment_service.get_filtered_enrollments(
+            db, after_id=after_id, limit=limit, **filters
+        )
+    
+    if enrollments and len(enrollments) == limit:
+        response.headers["X-Next-After-Id"] = str(enrollments[-1].id)
+    return enrollments
 
 @router.post("/", response_model=Enrollment)
 def create_enrollment(
     *,
     db: Session = Depends(deps.get_db),
+    enrollment_service: EnrollmentService = Depends(deps.get_enrollment_service),  # Shared service
     enrollment_in: EnrollmentCreate,  # Enrollment data
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+    current_user: User = Depends(deps.get_current_active_db_user),  # Authenticated user
 ) -> Any:
     """
     Create new enrollment.
@@ -137,54 +152,59 @@ def create_enrollment(
     This endpoint creates a new course enrollment and sends notifications
     to relevant parties (student and instructor).
     """
+    role_mask = current_user.role_mask  # Role bits, computed once per request
+    
     # Only allow students to enroll themselves or admins to enroll anyone
-    if current_user.role == "student" and enrollment_in.student_id != current_user.id:
+    if role_mask & ROLE_MASK_STUDENT and enrollment_in.student_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Students can only enroll themselves"
+            detail="Students can only enroll themselves",
         )
     
-    try:
-        # Create the enrollment
-        enrollment = enrollment_service.create_enrollment(db, obj_in=enrollment_in)
-        
-        # Create notification for student
-        notification_service.create_system_notification(
-            db,
-            user_id=enrollment.student_id,
-            title="Enrollment Submitted",
-            message=f"Your enrollment for {enrollment.course.title} has been submitted and is pending approval.",
-            entity_id=enrollment.id,
-            entity_type="enrollment",
-            send_email=True  # Send email notification too
-        )
-        
-        # If course has instructor, notify them too
-        if enrollment.course.instructor_id:
-            notification_service.create_system_notification(
-                db,
-                user_id=enrollment.course.instructor_id,
-                title="New Enrollment",
-                message=f"A new student has enrolled in your course {enrollment.course.title}.",
-                entity_id=enrollment.id,
-                entity_type="enrollment"
-            )
-        
-        return enrollment
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Create the enrollment (ValidationError is mapped to 400 by the app's handler)
+    enrollment = enrollment_service.create_enrollment(db, obj_in=enrollment_in)
+    
+    # Notify the student and instructor from the email queue; the enrollment is
+    # committed, so a broker outage is logged rather than failing the request
+    publish_notification(notify_enrollment_submitted, enrollment.id)
+    
+    return enrollment
+
+@router.get("/stats", response_model=dict)
+def get_enrollment_stats(
+    request: Request,  # Used for If-None-Match
+    response: Response,  # Used to set the caching headers
+    db: Session = Depends(deps.get_db),
+    enrollment_service: EnrollmentService = Depends(deps.get_enrollment_service),  # Shared service
+    current_user: User = Depends(deps.get_current_admin),  # Admin only endpoint
+) -> Any:
+    """
+    Get enrollment statistics (admin only).
+    
+    This endpoint returns aggregated statistics about enrollments,
+    such as counts by status, payment status, course, etc.
+    Responses carry an ETag of the counts and may be cached privately for
+    30 seconds; a matching If-None-Match gets 304 Not Modified.
+    """
+    stats = enrollment_service.get_enrollment_stats(db)
+    
+    etag = make_etag(
+        "enrollment-stats", stats["total"],
+        *stats["by_status"].values(), *stats["by_payment_status"].values(),
+    )
+    headers = {"ETag": etag, "Cache-Control": _STATS_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return stats
 
 @router.get("/{id}", response_model=EnrollmentWithDetails)
 def read_enrollment(
     *,
+    request: Request,  # Used for If-Modified-Since
+    response: Response,  # Used to set Last-Modified
     db: Session = Depends(deps.get_db),
+    enrollment_service: EnrollmentService = Depends(deps.get_enrollment_service),  # Shared service
     id: int,  # Enrollment ID
     current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
@@ -193,35 +213,47 @@ def read_enrollment(
     
     This endpoint returns a single enrollment with full details, including
     related student, course, and payment information.
+    Responses carry Last-Modified; a request whose If-Modified-Since is not
+    older gets 304 Not Modified without loading the relations.
     """
-    try:
-        # Get enrollment with all related data
-        enrollment = enrollment_service.get_with_relations(db, id)
-        
-        # Check permissions based on role
-        if current_user.role == "student" and enrollment.student_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this enrollment"
-            )
-        elif current_user.role == "instructor" and enrollment.course.instructor_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this enrollment"
+    role_mask = current_user.role_mask  # Role bits, computed once per request
+    
+    # Check permissions against the owners before loading the related data
+    # (NotFoundError is mapped to 404 by the app's handler)
+    student_id, instructor_id = enrollment_service.get_owner_tuple(db, id)
+    if role_mask & ROLE_MASK_STUDENT and student_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this enrollment",
+        )
+    elif role_mask & ROLE_MASK_INSTRUCTOR and instructor_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this enrollment",
+        )
+    
+    # Answer polling clients whose copy is current with a single timestamp query
+    last_modified = enrollment_service.get_last_modified(db, id)
+    if last_modified is not None:
+        last_modified_header = http_date(last_modified)
+        if not_modified_since(request, last_modified):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"Last-Modified": last_modified_header},
             )
-        
-        return enrollment
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
+        response.headers["Last-Modified"] = last_modified_header
+    
+    # Get enrollment with all related data
+    return enrollment_service.get_with_relations(db, id)
 
 @router.put("/{id}", response_model=Enrollment)
 def update_enrollment(
     *,
     db: Session = Depends(deps.get_db),
+    enrollment_service: EnrollmentService = Depends(deps.get_enrollment_service),  # Shared service
     id: int,  # Enrollment ID
     enrollment_in: EnrollmentUpdate,  # Update data
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+    current_user: User = Depends(deps.get_current_active_db_user),  # Authenticated user
 ) -> Any:
     """
     Update enrollment.
@@ -231,71 +263,41 @@ def update_enrollment(
     - Instructors can update status but not payment status
     - Admins can update any field
     """
-    try:
-        # Get the enrollment to check permissions
-        enrollment = enrollment_service.get(db, id)
-        if not enrollment:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found")
-        
-        # Check permissions based on role
-        if current_user.role == "student" and enrollment.student_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to update this enrollment"
-            )
-        elif current_user.role == "instructor" and enrollment.course.instructor_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to update this enrollment"
-            )
-        
-        # Students can only update notes
-        if current_user.role == "student":
-            if enrollment_in.status or enrollment_in.payment_status:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Students can only update notes"
-                )
-        
-        # Instructors can update status but not payment_status
-        if current_user.role == "instructor" and enrollment_in.payment_status:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Instructors cannot update payment status"
-            )
-        
-        # Update enrollment
-        updated_enrollment = enrollment_service.update(db, id=id, obj_in=enrollment_in)
-        
-        # If status changed, create notification
-        if enrollment_in.status and enrollment_in.status != enrollment.status:
-            notification_service.create_system_notification(
-                db,
-                user_id=enrollment.student_id,
-                title=f"Enrollment {enrollment_in.status.value.capitalize()}",
-                message=f"Your enrollment for {enrollment.course.title} has been {enrollment_in.status.value}.",
-                entity_id=enrollment.id,
-                entity_type="enrollment",
-                send_email=True  # Send email notification too
-            )
-        
-        return updated_enrollment
-    except Exception as e:
-        # Handle unexpected errors
+    role_mask = current_user.role_mask  # Role bits, computed once per request
+    
+    # Check permissions against the enrollment's current owners (the cache may be stale)
+    student_id, instructor_id = enrollment_service.get_owner_tuple(db, id, use_cache=False)
+    if role_mask & ROLE_MASK_STUDENT and student_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this enrollment",
+        )
+    elif role_mask & ROLE_MASK_INSTRUCTOR and instructor_id != current_user.id:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this enrollment",
         )
-
-@router.get("/stats", response_model=dict)
-def get_enrollment_stats(
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_admin),  # Admin only endpoint
-) -> Any:
-    """
-    Get enrollment statistics (admin only).
     
-    This endpoint returns aggregated statistics about enrollments,
-    such as counts by status, payment status, course, etc.
-    """
-    return enrollment_service.get_enrollment_stats(db)
\ No newline at end of file
+    # Reject fields the role may not change with a single mask test
+    allowed_fields, field_error = _UPDATE_FIELD_RULES[role_mask & _ROLE_BITS]
+    requested_fields = (
+        (_FIELD_NOTES if enrollment_in.notes is not None else 0)
+        | (_FIELD_STATUS if enrollment_in.status else 0)
+        | (_FIELD_PAYMENT_STATUS if enrollment_in.payment_status else 0)
+    )
+    if requested_fields & ~allowed_fields:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=field_error)
+    
+    # Update enrollment (the update mutates the loaded instance, so keep the old status)
+    enrollment = enrollment_service.get(db, id)
+    if enrollment is None:
+        raise NotFoundError(detail="Enrollment not found")
+    previous_status = enrollment.status
+    updated_enrollment = enrollment_service.update_enrollment(db, db_obj=enrollment, obj_in=enrollment_in)
+    
+    # If status changed, notify the student from the email queue (publish
+    # failures are logged, since the update is already committed)
+    if enrollment_in.status and enrollment_in.status != previous_status:
+        publish_notification(notify_enrollment_status_changed, enrollment.id, enrollment_in.status.value)
+    
+    return updated_enrollment
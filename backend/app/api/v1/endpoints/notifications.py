@@ -10,10 +10,12 @@ Key Endpoints:
 
 GET /: List user notifications with filtering
 GET /unread-count: Count unread notifications (for badges/indicators)
-POST /: Create new notifications (admin only)
+GET /export: Stream all notifications as a JSON array
+POST /: Create new notifications, singly or in batches (admin only)
 GET /{id}: Get a specific notification's details
 PUT /{id}/read: Mark a notification as read
 PUT /read-all: Mark all notifications as read
+PUT /read-by-type: Mark all notifications of one type as read
 DELETE /{id}: Delete a notification
 DELETE /: Delete all notifications
 
@@ -41,20 +43,16 @@ Optional email integration for important notifications
 Comprehensive filtering options
 
 
-Improvement Ideas:
-
-The delete_all_notifications endpoint could be optimized by using a bulk delete operation in the service layer rather than deleting each notification individually
-Consider adding a "mark-all-as-read-by-type" endpoint for more granular control
-
-
-
 This API provides a solid foundation for implementing a notification system that can be used for real-time updates, system alerts, and user-to-user communications within the application.
 
 """
 
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from typing import Any, AsyncIterator, List, Optional, Union
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps  # Authentication dependencies
 from app.domain.models.user import User
@@ -63,19 +61,42 @@ from app.domain.schemas.notification import (
     Notification, NotificationCreate, NotificationUpdate, NotificationWithUser  # Data models/schemas
 )
 from app.services.notification_service import NotificationService  # Notification business logic
-from app.core.exceptions import NotFoundError, ValidationError  # Custom exceptions
+from app.utils.etag import etag_matches, make_etag  # Conditional GET support
+
+# Create a router for notification endpoints; responses are encoded with orjson
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Create a router for notification endpoints
-router = APIRouter()
+# Badge and inbox polling may reuse a response for a few seconds before revalidating
+_NOTIFICATIONS_CACHE_CONTROL = "private, max-age=5"
 
-# Create a service instance for notification operations
-notification_service = NotificationService()
+# Notifications encoded per chunk of a streamed export
+_EXPORT_CHUNK_ROWS = 500
+
+
+async def _json_array(rows: AsyncIterator[RowMapping]) -> AsyncIterator[bytes]:
+    """Encode streamed rows as one JSON array, a chunk of rows at a time."""
+    yield b"["
+    chunk: List[bytes] = []
+    first = True
+    async for row in rows:
+        chunk.append(orjson.dumps(dict(row)))
+        if len(chunk) == _EXPORT_CHUNK_ROWS:
+            yield (b"" if first else b",") + b",".join(chunk)
+            chunk.clear()
+            first = False
+    if chunk:
+        yield (b"" if first else b",") + b",".join(chunk)
+    yield b"]"
 
 @router.get("/", response_model=List[Notification])
-def read_notifications(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,  # Pagination offset
-    limit: int = 100,  # Pagination limit
+async def read_notifications(
+    request: Request,  # Used for If-None-Match
+    response: Response,  # Used to set the next-page and caching headers
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
+    before_id: Optional[int] = Query(None),  # Return notifications older than this ID (keyset pagination)
+    skip: Optional[int] = Query(None, ge=0, le=10_000, deprecated=True),  # Pagination offset; use before_id instead
+    limit: int = Query(100, ge=1, le=200),  # Pagination limit, capped to keep pages small
     is_read: Optional[bool] = None,  # Filter by read status
     notification_type: Optional[NotificationType] = None,  # Filter by notification type
     current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
@@ -84,103 +105,146 @@ def read_notifications(
     Retrieve user's notifications with filtering.
     
     This endpoint returns the current user's notifications with optional
-    filtering by read status and notification type.
+    filtering by read status and notification type, newest first. When a
+    full page is returned, the X-Next-Before-Id header carries the before_id
+    for the next page. The skip parameter is deprecated. The page carries an
+    ETag, and a matching If-None-Match is answered with 304 Not Modified.
     """
-    # Build filters - always filter by current user's ID
-    filters = {
-        "user_id": current_user.id
-    }
-    
-    # Add optional filters
-    if is_read is not None:
-        filters["is_read"] = is_read
-    
-    if notification_type:
-        filters["notification_type"] = notification_type
+    headers = {"Cache-Control": _NOTIFICATIONS_CACHE_CONTROL}
+    if skip is not None:
+        # Deprecated offset pagination, kept for existing clients
+        notifications = await notification_service.get_filtered_notifications(
+            db,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            is_read=is_read,
+            notification_type=notification_type,
+        )
+    else:
+        notifications = await notification_service.get_notifications_keyset(
+            db,
+            user_id=current_user.id,
+            before_id=before_id,
+            limit=limit,
+            is_read=is_read,
+            notification_type=notification_type,
+        )
+        if notifications and len(notifications) == limit:
+            headers["X-Next-Before-Id"] = str(notifications[-1].id)
     
-    # Get filtered notifications
-    return notification_service.get_filtered_notifications(
-        db, skip=skip, limit=limit, **filters
+    # Read status is the only field that changes after creation, so the IDs
+    # and read flags on the page version it
+    headers["ETag"] = make_etag(
+        "notifications", current_user.id, *(f"{n.id}:{n.is_read:d}" for n in notifications)
     )
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return notifications
 
 @router.get("/unread-count", response_model=dict)
-def count_unread_notifications(
-    db: Session = Depends(deps.get_db),
+async def count_unread_notifications(
+    request: Request,  # Used for If-None-Match
+    response: Response,  # Used to set the caching headers
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
     current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Count unread notifications for the current user.
     
     This endpoint returns the number of unread notifications for the
-    authenticated user, typically used for notification badges.
+    authenticated user, typically used for notification badges. Polling
+    clients can send the ETag back in If-None-Match to get 304 Not Modified
+    while the count is unchanged.
     """
-    count = notification_service.count_unread(db, user_id=current_user.id)
+    count = await notification_service.count_unread(db, user_id=current_user.id)
+    
+    headers = {
+        "ETag": make_etag("unread-count", current_user.id, count),
+        "Cache-Control": _NOTIFICATIONS_CACHE_CONTROL,
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return {"count": count}
 
-@router.post("/", response_model=Notification)
-def create_notification(
+@router.post("/", response_model=Union[Notification, List[Notification]])
+async def create_notification(
     *,
-    db: Session = Depends(deps.get_db),
-    notification_in: NotificationCreate,  # Notification data
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
+    notification_in: Union[NotificationCreate, List[NotificationCreate]],  # One notification or a batch
+    background_tasks: BackgroundTasks,  # For emailing after the response
     send_email: bool = False,  # Optional email sending flag
-    current_user: User = Depends(deps.get_current_admin),  # Admin user only
+    current_user: User = Depends(deps.get_current_async_db_admin),  # Admin user only
 ) -> Any:
     """
     Create a new notification (admin only).
     
     This endpoint allows administrators to manually create notifications
     for users, with an option to send an email notification as well.
+    A list of notifications is inserted in a single statement. Emails are
+    sent in the background once the response has gone out.
     """
-    try:
-        # Create notification using service
-        return notification_service.create_notification(
-            db, obj_in=notification_in, send_email=send_email
-        )
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
+    if isinstance(notification_in, list):
+        # Fan-out: one INSERT for every recipient
+        notifications = await notification_service.create_many(db, notification_in)
+    else:
+        notifications = [await notification_service.create(db, obj_in=notification_in)]
+    
+    # Emails go out after the response, so latency is bounded by the insert
+    if send_email and notifications:
+        background_tasks.add_task(
+            notification_service.send_emails, [n.id for n in notifications]
         )
+    return notifications if isinstance(notification_in, list) else notifications[0]
+
+@router.get("/export")
+async def export_notifications(
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
+    is_read: Optional[bool] = None,  # Filter by read status
+    notification_type: Optional[NotificationType] = None,  # Filter by notification type
+    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+) -> Any:
+    """
+    Export all of the user's notifications as a JSON array.
+    
+    The array is streamed with chunked transfer encoding as rows arrive
+    from the database, so memory use does not grow with the number of
+    notifications. Items have the same fields as GET /.
+    """
+    rows = notification_service.stream_notifications(
+        db, user_id=current_user.id, is_read=is_read, notification_type=notification_type
+    )
+    return StreamingResponse(_json_array(rows), media_type="application/json")
 
 @router.get("/{id}", response_model=NotificationWithUser)
-def read_notification(
+async def read_notification(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
     id: int,  # Notification ID
     current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Get notification by ID with user details.
     
-    This endpoint returns a single notification with its associated user,
-    ensuring the requester has permission to view it.
+    This endpoint returns a single notification with its associated user.
+    Notifications the requester may not view are reported as not found.
     """
-    try:
-        # Get notification with user details
-        notification = notification_service.get_with_user(db, id)
-        
-        # Check permissions - only admins or the notification recipient can view
-        if current_user.role != "admin" and notification.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this notification"
-            )
-        
-        return notification
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
+    # NotFoundError is mapped to 404 by the app's handlers
+    return await notification_service.get_with_user(db, id, requester=current_user)
 
 @router.put("/{id}/read", response_model=Notification)
-def mark_notification_as_read(
+async def mark_notification_as_read(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
     id: int,  # Notification ID
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+    current_user: User = Depends(deps.get_current_active_async_db_user),  # Authenticated user
 ) -> Any:
     """
     Mark a notification as read.
@@ -188,33 +252,15 @@ def mark_notification_as_read(
     This endpoint marks a specific notification as read,
     ensuring the requester has permission to update it.
     """
-    try:
-        # Get notification to check permissions
-        notification = notification_service.get(db, id)
-        
-        # Check permissions - only admins or the notification recipient can update
-        if current_user.role != "admin" and notification.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to update this notification"
-            )
-        
-        # Mark notification as read
-        return notification_service.mark_as_read(db, id=id)
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Check permissions and mark as read in one conditional UPDATE
+    # (NotFoundError is mapped to 404 by the app's handlers)
+    return await notification_service.mark_as_read(db, id=id, requester=current_user)
 
 @router.put("/read-all", response_model=dict)
-def mark_all_notifications_as_read(
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+async def mark_all_notifications_as_read(
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
+    current_user: User = Depends(deps.get_current_active_async_db_user),  # Authenticated user
 ) -> Any:
     """
     Mark all notifications for the current user as read.
@@ -222,15 +268,34 @@ def mark_all_notifications_as_read(
     This endpoint marks all of the authenticated user's notifications as read
     and returns the count of updated notifications.
     """
-    count = notification_service.mark_all_as_read(db, user_id=current_user.id)
+    count = await notification_service.mark_all_as_read(db, user_id=current_user.id)
+    return {"count": count}
+
+@router.put("/read-by-type", response_model=dict)
+async def mark_notifications_as_read_by_type(
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
+    notification_type: NotificationType = Query(...),  # Type of notifications to mark
+    current_user: User = Depends(deps.get_current_active_async_db_user),  # Authenticated user
+) -> Any:
+    """
+    Mark all of the current user's notifications of one type as read.
+    
+    This endpoint clears the unread notifications of a single type with one
+    update and returns the count of updated notifications.
+    """
+    count = await notification_service.mark_as_read_by_type(
+        db, user_id=current_user.id, notification_type=notification_type
+    )
     return {"count": count}
 
 @router.delete("/{id}", response_model=Notification)
-def delete_notification(
+async def delete_notification(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
     id: int,  # Notification ID
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+    current_user: User = Depends(deps.get_current_active_async_db_user),  # Authenticated user
 ) -> Any:
     """
     Delete a notification.
@@ -238,33 +303,15 @@ def delete_notification(
     This endpoint deletes a specific notification,
     ensuring the requester has permission to delete it.
     """
-    try:
-        # Get notification to check permissions
-        notification = notification_service.get(db, id)
-        
-        # Check permissions - only admins or the notification recipient can delete
-        if current_user.role != "admin" and notification.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to delete this notification"
-            )
-        
-        # Delete notification
-        return notification_service.remove(db, id=id)
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Check permissions and delete in one conditional DELETE
+    # (NotFoundError is mapped to 404 by the app's handlers)
+    return await notification_service.remove(db, id=id, requester=current_user)
 
 @router.delete("/", response_model=dict)
-def delete_all_notifications(
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+async def delete_all_notifications(
+    db: AsyncSession = Depends(deps.get_async_db),
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
+    current_user: User = Depends(deps.get_current_active_async_db_user),  # Authenticated user
 ) -> Any:
     """
     Delete all notifications for the current user.
@@ -272,21 +319,5 @@ def delete_all_notifications(
     This endpoint deletes all of the authenticated user's notifications
     and returns the count of deleted notifications.
     """
-    try:
-        # Get all user's notifications
-        filters = {"user_id": current_user.id}
-        notifications = notification_service.get_filtered_notifications(db, **filters)
-        
-        # Delete each notification
-        count = 0
-        for notification in notifications:
-            notification_service.remove(db, id=notification.id)
-            count += 1
-        
-        return {"count": count}
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
\ No newline at end of file
+    count = await notification_service.delete_all_for_user(db, user_id=current_user.id)
+    return {"count": count}
@@ -10,6 +10,7 @@ Purpose: Provides a complete interface for payment management, including creatio
 Key Endpoints:
 
 GET /: List payments with complex role-based filtering
+GET /export: Stream all visible payments as newline-delimited JSON
 POST /: Create new payments and initialize payment intents
 GET /{id}: Get payment details with enrollment information
 POST /{id}/refund: Process refunds for payments
@@ -46,8 +47,6 @@ Integration with notification service for payment events
 
 Improvement Notes:
 
-There's a missing import for course_service which is used in the code
-The manual in-memory filtering and pagination in the read_payments endpoint could be optimized for larger datasets
 Currency is hardcoded as "usd" but could be made configurable
 
 
@@ -56,8 +55,14 @@ This API demonstrates a professional approach to payment processing with proper
 
 """
 
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, status
+import logging
+from typing import Any, AsyncIterator, List, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -67,25 +72,32 @@ from app.domain.models.payment import PaymentStatus, PaymentMethod  # Payment en
 from app.domain.schemas.payment import (
     Payment, PaymentCreate, PaymentUpdate, PaymentWithEnrollment  # Data models/schemas
 )
-from app.services.payment_service import PaymentService  # Payment business logic
+from app.services.payment_service import HANDLED_WEBHOOK_EVENTS, PaymentService  # Payment business logic
 from app.services.enrollment_service import EnrollmentService  # Enrollment business logic
 from app.services.notification_service import NotificationService  # Notification service for alerts
-from app.core.exceptions import NotFoundError, ValidationError  # Custom exceptions
+from app.core.cache import claim_webhook_event, release_webhook_event  # Webhook deduplication
+from app.tasks.notifications import queue_payment_succeeded_notification  # Batched payment notifications
+
+# Create a router for payment endpoints; responses are encoded with orjson
+router = APIRouter(default_response_class=ORJSONResponse)
+logger = logging.getLogger(__name__)
+
+
+async def _ndjson(rows: AsyncIterator[RowMapping]) -> AsyncIterator[bytes]:
+    """Encode streamed rows as newline-delimited JSON, one line per row."""
+    async for row in rows:
+        yield orjson.dumps(dict(row)) + b"\n"
 
-# Create a router for payment endpoints
-router = APIRouter()
 
-# Create service instances
-payment_service = PaymentService()
-enrollment_service = EnrollmentService()
-notification_service = NotificationService()
-# Note: course_service is used but not imported (minor issue to fix)
 
 @router.get("/", response_model=List[Payment])
-def read_payments(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,  # Pagination offset
-    limit: int = 100,  # Pagination limit
+async def read_payments(
+    response: Response,  # Used to set the next-page header
+    db: AsyncSession = Depends(deps.get_async_db),
+    payment_service: PaymentService = Depends(deps.get_payment_service),  # Shared service
+    after_id: Optional[int] = Query(None),  # Return payments after this ID (keyset pagination)
+    skip: int = Query(0, ge=0, le=10_000, deprecated=True),  # Pagination offset; use after_id instead
+    limit: int = Query(100, ge=1, le=200),  # Pagination limit, capped to keep pages small
     status: Optional[PaymentStatus] = None,  # Filter by payment status
     payment_method: Optional[PaymentMethod] = None,  # Filter by payment method
     enrollment_id: Optional[int] = None,  # Filter by enrollment
@@ -98,121 +110,40 @@ def read_payments(
     
     This endpoint returns a list of payments with complex filtering options
     based on user role, enrollment, status, payment method, and date range.
-    Access control ensures users only see payments they're authorized to view.
+    Access control ensures users only see payments they're authorized to view:
+    admins see all payments, instructors those for their courses' enrollments
+    and students those for their own enrollments. When more payments follow,
+    the X-Next-After-Id header carries the after_id for the next page. The
+    skip parameter is deprecated.
     """
-    # Handle enrollment-specific payments
-    if enrollment_id:
-        # First check if user has access to this enrollment
-        try:
-            enrollment = enrollment_service.get(db, enrollment_id)
-            if not enrollment:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found")
-            
-            # Check permissions based on role
-            if current_user.role == "student" and enrollment.student_id != current_user.id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not authorized to access this enrollment's payments"
-                )
-            elif current_user.role == "instructor" and enrollment.course.instructor_id != current_user.id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not authorized to access this enrollment's payments"
-                )
-            
-            # Get payments for this enrollment
-            payments = payment_service.repository.get_by_enrollment(db, enrollment_id=enrollment_id)
-            
-            # Apply filters in-memory
-            if status:
-                payments = [p for p in payments if p.status == status]
-            if payment_method:
-                payments = [p for p in payments if p.payment_method == payment_method]
-            
-            return payments
-        except Exception as e:
-            # Handle unexpected errors
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"An unexpected error occurred: {str(e)}"
-            )
-    
-    # For admins, allow fetching all payments with filters
-    if current_user.role == "admin":
-        # Build filters dictionary
-        filters = {}
-        if status:
-            filters["status"] = status
-        if payment_method:
-            filters["payment_method"] = payment_method
-        
-        # Date range filtering (handled in repository)
-        if start_date and end_date:
-            return payment_service.repository.get_payments_by_date_range(
-                db, start_date=start_date, end_date=end_date
-            )
-        
-        # Get paginated, filtered payments
-        return payment_service.get_multi(db, skip=skip, limit=limit, **filters)
-    
-    # For students, get payments for their enrollments
-    if current_user.role == "student":
-        # Get all student's enrollments
-        enrollments = enrollment_service.get_student_enrollments(db, student_id=current_user.id)
-        if not enrollments:
-            return []
-        
-        # Collect payments from all enrollments
-        enrollment_ids = [e.id for e in enrollments]
-        all_payments = []
-        
-        for e_id in enrollment_ids:
-            payments = payment_service.repository.get_by_enrollment(db, enrollment_id=e_id)
-            all_payments.extend(payments)
-        
-        # Apply filters in-memory
-        if status:
-            all_payments = [p for p in all_payments if p.status == status]
-        if payment_method:
-            all_payments = [p for p in all_payments if p.payment_method == payment_method]
-        
-        # Manual pagination (inefficient but works for small datasets)
-        return all_payments[skip:skip+limit]
-    
-    # For instructors, get payments for their courses' enrollments
-    if current_user.role == "instructor":
-        # Get all courses taught by this instructor
-        instructor_courses = course_service.get_instructor_courses(db, instructor_id=current_user.id)
-        if not instructor_courses:
-            return []
-        
-        # Collect payments from all enrollments in instructor's courses
-        course_ids = [course.id for course in instructor_courses]
-        all_payments = []
-        
-        # Get enrollments for these courses
-        for c_id in course_ids:
-            enrollments = enrollment_service.get_course_enrollments(db, course_id=c_id)
-            for enrollment in enrollments:
-                payments = payment_service.repository.get_by_enrollment(db, enrollment_id=enrollment.id)
-                all_payments.extend(payments)
-        
-        # Apply filters in-memory
-        if status:
-            all_payments = [p for p in all_payments if p.status == status]
-        if payment_method:
-            all_payments = [p for p in all_payments if p.payment_method == payment_method]
-        
-        # Manual pagination
-        return all_payments[skip:skip+limit]
+    # Role scope, filters and pagination all run in a single query; one extra
+    # row tells whether another page exists without a COUNT
+    payments = await payment_service.get_filtered_payments(
+        db,
+        viewer=current_user,
+        after_id=after_id,
+        skip=skip,
+        limit=limit + 1,
+        status=status,
+        payment_method=payment_method,
+        enrollment_id=enrollment_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    if len(payments) > limit:
+        payments = payments[:limit]
+        response.headers["X-Next-After-Id"] = str(payments[-1].id)
+    return payments
 
 @router.post("/", response_model=Payment)
 def create_payment(
     *,
     db: Session = Depends(deps.get_db),
+    payment_service: PaymentService = Depends(deps.get_payment_service),  # Shared service
+    enrollment_service: EnrollmentService = Depends(deps.get_enrollment_service),  # Shared service
     payment_in: PaymentCreate,  # Payment data
     background_tasks: BackgroundTasks,  # For async processing
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+    current_user: User = Depends(deps.get_current_active_db_user),  # Authenticated user
 ) -> Any:
     """
     Create new payment.
@@ -220,83 +151,104 @@ def create_payment(
     This endpoint creates a new payment record and initiates
     a payment intent with the payment gateway in the background.
     """
-    try:
-        # Check if enrollment exists and user has permission
-        enrollment = enrollment_service.get(db, payment_in.enrollment_id)
-        if not enrollment:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found")
-        
-        # Only students can pay for their own enrollments or admins can create payments
-        if current_user.role == "student" and enrollment.student_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to create payment for this enrollment"
-            )
-        
-        # Create payment record
-        payment = payment_service.create_payment(db, obj_in=payment_in)
-        
-        # Create payment intent in background (async operation)
-        background_tasks.add_task(
-            payment_service.create_payment_intent,
-            db=db,
-            payment_id=payment.id,
-            amount=payment.amount,
-            currency="usd"  # Hardcoded currency (could be configurable)
-        )
-        
-        return payment
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
+    # Check if enrollment exists and user has permission
+    enrollment = enrollment_service.get(db, payment_in.enrollment_id)
+    if not enrollment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found")
+    
+    # Only students can pay for their own enrollments or admins can create payments
+    if current_user.role == "student" and enrollment.student_id != current_user.id:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to create payment for this enrollment"
         )
+    
+    # Create payment record
+    payment = payment_service.create_payment(db, obj_in=payment_in)
+    
+    # Create payment intent in background (async operation, with its own session)
+    background_tasks.add_task(
+        payment_service.create_payment_intent_after_response,
+        payment_id=payment.id,
+        amount=payment.amount,
+        currency="usd"  # Hardcoded currency (could be configurable)
+    )
+    
+    return payment
+
+@router.get("/export")
+async def export_payments(
+    db: AsyncSession = Depends(deps.get_async_db),
+    payment_service: PaymentService = Depends(deps.get_payment_service),  # Shared service
+    status: Optional[PaymentStatus] = None,  # Filter by payment status
+    payment_method: Optional[PaymentMethod] = None,  # Filter by payment method
+    start_date: Optional[datetime] = None,  # Filter by date range start
+    end_date: Optional[datetime] = None,  # Filter by date range end
+    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+) -> Any:
+    """
+    Export all payments visible to the user as newline-delimited JSON.
+    
+    Rows are streamed from the database as they are read, so memory use
+    does not grow with the number of payments. Each line has the same
+    fields as an item of GET /.
+    """
+    rows = payment_service.stream_payments(
+        db,
+        viewer=current_user,
+        status=status,
+        payment_method=payment_method,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return StreamingResponse(_ndjson(rows), media_type="application/x-ndjson")
+
+@router.get("/stats", response_model=dict)
+def get_payment_stats(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(deps.get_db),
+    payment_service: PaymentService = Depends(deps.get_payment_service),  # Shared service
+    current_user: User = Depends(deps.get_current_admin),  # Admin user only
+) -> Any:
+    """
+    Get payment statistics (admin only).
+    
+    This endpoint returns aggregated statistics about payments,
+    such as total revenue, payment counts by status, etc.
+    Stale statistics are returned immediately and recomputed after the response.
+    """
+    stats, fresh = payment_service.get_payment_stats(db)
+    if not fresh:
+        background_tasks.add_task(payment_service.refresh_payment_stats)
+    return stats
 
 @router.get("/{id}", response_model=PaymentWithEnrollment)
-def read_payment(
+async def read_payment(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
+    payment_service: PaymentService = Depends(deps.get_payment_service),  # Shared service
     id: int,  # Payment ID
     current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
 ) -> Any:
     """
     Get payment by ID with enrollment details.
     
-    This endpoint returns a single payment with its associated enrollment details,
-    ensuring the requester has permission to view it.
+    This endpoint returns a single payment with its associated enrollment details.
+    Payments the requester may not view are reported as not found.
     """
-    try:
-        # Get payment with related enrollment data
-        payment = payment_service.get_with_relations(db, id)
-        
-        # Check permissions based on role
-        if current_user.role == "student" and payment.enrollment.student_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this payment"
-            )
-        elif current_user.role == "instructor" and payment.enrollment.course.instructor_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this payment"
-            )
-        
-        return payment
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
+    # Payments outside the user's scope are filtered out by the query itself
+    # (NotFoundError is mapped to 404 by the app's handlers)
+    return await payment_service.get_with_enrollment(db, id, viewer=current_user)
 
 @router.post("/{id}/refund", response_model=Payment)
 async def refund_payment(
     *,
     db: Session = Depends(deps.get_db),
+    payment_service: PaymentService = Depends(deps.get_payment_service),  # Shared service
+    notification_service: NotificationService = Depends(deps.get_notification_service),  # Shared service
     id: int,  # Payment ID
     background_tasks: BackgroundTasks,  # For async notification
-    current_user: User = Depends(deps.get_current_admin),  # Admin user only
+    current_user: User = Depends(deps.get_current_db_admin),  # Admin user only
 ) -> Any:
     """
     Refund a payment (admin only).
@@ -304,42 +256,29 @@ async def refund_payment(
     This endpoint processes a refund for a payment through the payment gateway
     and sends a notification to the student about the refund.
     """
-    try:
-        # Process refund through payment service
-        payment = await payment_service.refund_payment(db, payment_id=id)
-        
-        # Create notification for the student in background
-        background_tasks.add_task(
-            notification_service.create_system_notification,
-            db=db,
-            user_id=payment.enrollment.student_id,
-            title="Payment Refunded",
-            message=f"Your payment of ${payment.amount:.2f} for {payment.enrollment.course.title} has been refunded.",
-            entity_id=payment.id,
-            entity_type="payment",
-            send_email=True  # Send email notification too
-        )
-        
-        return payment
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Process refund through payment service
+    payment = await payment_service.refund_payment(db, payment_id=id)
+    
+    # Create notification for the student in background (with its own session)
+    background_tasks.add_task(
+        notification_service.create_system_notification_after_response,
+        user_id=payment.enrollment.student_id,
+        title="Payment Refunded",
+        message=f"Your payment of ${payment.amount:.2f} for {payment.enrollment.course.title} has been refunded.",
+        entity_id=payment.id,
+        entity_type="payment",
+        send_email=True  # Send email notification too
+    )
+    
+    return payment
 
 @router.post("/{id}/intent", response_model=dict)
 async def create_payment_intent(
     *,
     db: Session = Depends(deps.get_db),
+    payment_service: PaymentService = Depends(deps.get_payment_service),  # Shared service
     id: int,  # Payment ID
-    current_user: User = Depends(deps.get_current_active_user),  # Authenticated user
+    current_user: User = Depends(deps.get_current_active_db_user),  # Authenticated user
 ) -> Any:
     """
     Create a payment intent for an existing payment.
@@ -347,39 +286,20 @@ async def create_payment_intent(
     This endpoint creates a new payment intent with the payment gateway
     for an existing payment record, returning the client secret for checkout.
     """
-    try:
-        # Get payment with enrollment details
-        payment = payment_service.get_with_relations(db, id)
-        
-        # Check permissions - only the student who owns the enrollment can create an intent
-        if current_user.role == "student" and payment.enrollment.student_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to create intent for this payment"
-            )
-        
-        # Create payment intent through payment service
-        return await payment_service.create_payment_intent(
-            db, payment_id=id, amount=payment.amount, currency="usd"
-        )
-    except NotFoundError as e:
-        # Handle not found errors
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except ValidationError as e:
-        # Handle validation errors
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
-    except Exception as e:
-        # Handle unexpected errors
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    # Get the payment if it is in the user's scope (404 otherwise)
+    # (the session is synchronous, so the query runs in the threadpool)
+    payment = await run_in_threadpool(payment_service.get_for_viewer, db, id, viewer=current_user)
+    
+    # Create payment intent through payment service
+    return await payment_service.create_payment_intent(
+        db, payment_id=id, amount=payment.amount, currency="usd"
+    )
 
 @router.post("/webhook", status_code=status.HTTP_200_OK)
 async def webhook_received(
     *,
     db: Session = Depends(deps.get_db),
-    background_tasks: BackgroundTasks,  # For async notification
+    payment_service: PaymentService = Depends(deps.get_payment_service),  # Shared service
     payload: dict,  # Webhook payload from payment gateway
 ) -> Any:
     """
@@ -389,45 +309,36 @@ async def webhook_received(
     updating payment status and sending notifications based on event type.
     """
     # Extract event data from webhook payload
+    event_id = payload.get("id")
     event_type = payload.get("type")
     event_data = payload.get("data", {}).get("object", {})
     
+    # Most event types don't concern payments; acknowledge them without touching Redis or the database
+    if event_type not in HANDLED_WEBHOOK_EVENTS:
+        return {"status": "success"}
+    
+    # Stripe retries deliveries; only the first claim of an event processes it
+    if event_id and not await claim_webhook_event(event_id):
+        return {"status": "success"}
+    
     try:
         # Process the webhook through payment service
         payment = await payment_service.process_payment_webhook(
-            db, event_type=event_type, payment_intent=event_data
+            db, event_type=event_type, payment_intent=event_data, event_id=event_id
         )
         
-        # If payment successful, send notification to student
+        # If payment successful, queue the student's notification for a batched write
         if payment and payment.status == PaymentStatus.COMPLETED:
-            # Notify student about successful payment in background
-            background_tasks.add_task(
-                notification_service.create_system_notification,
-                db=db,
-                user_id=payment.enrollment.student_id,
-                title="Payment Successful",
-                message=f"Your payment of ${payment.amount:.2f} for {payment.enrollment.course.title} has been processed successfully.",
-                entity_id=payment.id,
-                entity_type="payment",
-                send_email=True  # Send email notification too
-            )
+            await queue_payment_succeeded_notification(payment.id)
         
         # Always return success to Stripe (even on error)
         return {"status": "success"}
-    except Exception as e:
+    except Exception:
+        # Let a later delivery of this event be processed again
+        if event_id:
+            await release_webhook_event(event_id)
         # Log error but return success to Stripe (webhook best practice)
-        print(f"Error processing webhook: {str(e)}")
+        logger.exception(
+            "webhook_failed", extra={"event_type": event_type, "event_id": event_id}
+        )
         return {"status": "success"}
-
-@router.get("/stats", response_model=dict)
-def get_payment_stats(
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_admin),  # Admin user only
-) -> Any:
-    """
-    Get payment statistics (admin only).
-    
-    This endpoint returns aggregated statistics about payments,
-    such as total revenue, payment counts by status, etc.
-    """
-    return payment_service.get_payment_stats(db)
\ No newline at end of file
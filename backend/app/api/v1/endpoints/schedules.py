@@ -139,7 +139,7 @@ def create_schedule(
     *,
     db: Session = Depends(deps.get_db),
     schedule_in: ScheduleCreate,  # Schedule data
-    current_user: User = Depends(deps.get_current_instructor_or_admin),  # Instructor or admin only
+    current_user: User = Depends(deps.get_current_db_instructor_or_admin),  # Instructor or admin only
 ) -> Any:
     """
     Create new schedule.
@@ -207,7 +207,7 @@ def update_schedule(
     db: Session = Depends(deps.get_db),
     id: int,  # Schedule ID
     schedule_in: ScheduleUpdate,  # Update data
-    current_user: User = Depends(deps.get_current_instructor_or_admin),  # Instructor or admin only
+    current_user: User = Depends(deps.get_current_db_instructor_or_admin),  # Instructor or admin only
 ) -> Any:
     """
     Update schedule.
@@ -246,7 +246,7 @@ def delete_schedule(
     *,
     db: Session = Depends(deps.get_db),
     id: int,  # Schedule ID
-    current_user: User = Depends(deps.get_current_instructor_or_admin),  # Instructor or admin only
+    current_user: User = Depends(deps.get_current_db_instructor_or_admin),  # Instructor or admin only
 ) -> Any:
     """
     Delete schedule.
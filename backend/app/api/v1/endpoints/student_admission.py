@@ -1,44 +1,3 @@
-from fastapi import APIRouter, Depends
-from typing import Any, List
+from app.api.router_factory import make_crud_router
 
-router = APIRouter()
-
-
-@router.get("/", response_model=List[Any])
-def read_applications() -> Any:
-    """
-    Retrieve student applications.
-    """
-    return []
-
-
-@router.post("/", response_model=Any)
-def create_application() -> Any:
-    """
-    Create new student application.
-    """
-    return {}
-
-
-@router.get("/{id}", response_model=Any)
-def read_application(id: int) -> Any:
-    """
-    Get student application by ID.
-    """
-    return {}
-
-
-@router.put("/{id}", response_model=Any)
-def update_application(id: int) -> Any:
-    """
-    Update a student application.
-    """
-    return {}
-
-
-@router.delete("/{id}", response_model=Any)
-def delete_application(id: int) -> Any:
-    """
-    Delete a student application.
-    """
-    return {}
+router = make_crud_router("application", "applications", label="student application")
@@ -66,7 +66,7 @@ async def create_course(
     db: Session = Depends(deps.get_db),
     course_in: CourseCreate,  # Course data
     image: Optional[UploadFile] = File(None),  # Optional course image
-    current_user: User = Depends(deps.get_current_instructor_or_admin),  # Instructor or admin only
+    current_user: User = Depends(deps.get_current_db_instructor_or_admin),  # Instructor or admin only
 ) -> Any:
     """
     Create new course.
@@ -140,7 +140,7 @@ async def update_course(
     id: int,  # Course ID
     course_in: CourseUpdate,  # Update data
     image: Optional[UploadFile] = File(None),  # Optional new image
-    current_user: User = Depends(deps.get_current_instructor_or_admin),  # Instructor or admin only
+    current_user: User = Depends(deps.get_current_db_instructor_or_admin),  # Instructor or admin only
 ) -> Any:
     """
     Update course.
@@ -191,7 +191,7 @@ def delete_course(
     *,
     db: Session = Depends(deps.get_db),
     id: int,  # Course ID
-    current_user: User = Depends(deps.get_current_admin),  # Admin user only
+    current_user: User = Depends(deps.get_current_db_admin),  # Admin user only
 ) -> Any:
     """
     Delete course.
@@ -0,0 +1,345 @@
+"""
+cache.py - Response cache configuration
+This file configures fastapi-cache2 for the Culinary Academy Student Registration
+system. Responses are stored in Redis when REDIS_URL is configured, otherwise in
+a size-bounded in-memory backend. It also provides the per-user profile cache
+and the invalidation helper that drops a user's entries when the underlying
+record changes, and the per-user
+unread notification counters and shared dashboard aggregates kept next to
+the response cache.
+"""
+
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+import orjson
+import redis
+from cachetools import LRUCache, TTLCache
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.coder import JsonCoder
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+# Maximum number of cached responses kept in memory per worker
+RESPONSE_CACHE_MAXSIZE = 10000
+
+
+class BoundedInMemoryBackend(InMemoryBackend):
+    """
+    In-memory cache backend with a maximum number of entries.
+
+    The stock backend keeps expired entries until they are read again; backing
+    the store with an LRU cache evicts the least recently used entries once
+    the limit is reached.
+    """
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_MAXSIZE):
+        self._store = LRUCache(maxsize=maxsize)
+
+
+class ORJsonCoder(JsonCoder):
+    """Cache coder that stores responses as orjson-encoded bytes."""
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        return orjson.dumps(value, default=jsonable_encoder)
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        return orjson.loads(value)
+
+
+def init_cache() -> None:
+    """Initialize the response cache. Called once at application startup."""
+    if settings.REDIS_URL:
+        backend = RedisBackend(aioredis.from_url(settings.REDIS_URL))
+    else:
+        backend = BoundedInMemoryBackend()
+    FastAPICache.init(backend, prefix="culinary-cache", coder=ORJsonCoder)
+
+
+def user_namespace(user_id: int) -> str:
+    """Cache namespace holding every cached view of a user."""
+    return f"user:{user_id}"
+
+
+# Seconds a user's serialized profile is served from the cache
+USER_PROFILE_TTL = 30
+
+
+def user_profile_key(user_id: int) -> str:
+    """Key of a user's cached profile, inside the user's namespace."""
+    return f"{FastAPICache.get_prefix()}:{user_namespace(user_id)}:profile"
+
+
+async def get_cached_user_profile(user_id: int) -> Optional[dict]:
+    """Cached profile of a user, or None if it isn't cached."""
+    value = await FastAPICache.get_backend().get(user_profile_key(user_id))
+    return None if value is None else ORJsonCoder.decode(value)
+
+
+async def cache_user_profile(user_id: int, profile: dict) -> None:
+    """Cache a user's serialized profile until it changes or expires."""
+    await FastAPICache.get_backend().set(
+        user_profile_key(user_id), ORJsonCoder.encode(profile), expire=USER_PROFILE_TTL
+    )
+
+
+async def invalidate_user(user_id: int) -> None:
+    """Drop every cached view of a user, including the profile, after it changes."""
+    await FastAPICache.clear(namespace=user_namespace(user_id))
+
+
+# Unread notification counts, kept for 5 minutes and adjusted as notifications change
+UNREAD_COUNT_TTL = 300
+_local_unread_counts: TTLCache = TTLCache(maxsize=100000, ttl=UNREAD_COUNT_TTL)
+
+# Adjusts a cached count only if one is cached, so a miss is never turned into a wrong value
+_ADJUST_IF_CACHED = (
+    "if redis.call('EXISTS', KEYS[1]) == 1 then "
+    "return redis.call('INCRBY', KEYS[1], ARGV[1]) end "
+    "return nil"
+)
+
+
+@lru_cache(maxsize=1)
+def _counter_client() -> Optional[aioredis.Redis]:
+    """Async Redis client for the counters, or None to keep them in process memory."""
+    if not settings.REDIS_URL:
+        return None
+    return aioredis.from_url(settings.REDIS_URL)
+
+
+@lru_cache(maxsize=1)
+def _sync_counter_client() -> Optional[redis.Redis]:
+    """Blocking Redis client for counters and aggregates used from sync code (tasks, sync endpoints)."""
+    if not settings.REDIS_URL:
+        return None
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+
+def unread_count_key(user_id: int) -> str:
+    """Key of a user's cached unread notification count."""
+    return f"notif:unread:{user_id}"
+
+
+def _adjust_local_unread_count(user_id: int, delta: int) -> None:
+    """Apply a counter adjustment to the in-process store."""
+    count = _local_unread_counts.get(user_id)
+    if count is not None:
+        _local_unread_counts[user_id] = max(count + delta, 0)
+
+
+async def get_cached_unread_count(user_id: int) -> Optional[int]:
+    """Return a user's cached unread count, or None on a miss."""
+    client = _counter_client()
+    if client is None:
+        return _local_unread_counts.get(user_id)
+    value = await client.get(unread_count_key(user_id))
+    return int(value) if value is not None else None
+
+
+async def cache_unread_count(user_id: int, count: int) -> None:
+    """Store a freshly counted unread total for a user."""
+    client = _counter_client()
+    if client is None:
+        _local_unread_counts[user_id] = count
+    else:
+        await client.set(unread_count_key(user_id), count, ex=UNREAD_COUNT_TTL)
+
+
+async def adjust_cached_unread_count(user_id: int, delta: int) -> None:
+    """Add delta to a user's cached unread count, if one is cached."""
+    client = _counter_client()
+    if client is None:
+        _adjust_local_unread_count(user_id, delta)
+    else:
+        await client.eval(_ADJUST_IF_CACHED, 1, unread_count_key(user_id), delta)
+
+
+def adjust_cached_unread_count_sync(user_id: int, delta: int) -> None:
+    """Blocking variant of adjust_cached_unread_count for sync callers."""
+    client = _sync_counter_client()
+    if client is None:
+        _adjust_local_unread_count(user_id, delta)
+    else:
+        client.eval(_ADJUST_IF_CACHED, 1, unread_count_key(user_id), delta)
+
+
+async def invalidate_unread_count(user_id: int) -> None:
+    """Drop a user's cached unread count so the next read recounts."""
+    client = _counter_client()
+    if client is None:
+        _local_unread_counts.pop(user_id, None)
+    else:
+        await client.delete(unread_count_key(user_id))
+
+
+# Payment statistics for the admin dashboard, served stale-while-revalidate: the
+# fresh copy lasts a minute and is dropped whenever a payment is written, while
+# the stale copy is kept for an hour and served while one worker recomputes
+PAYMENT_STATS_KEY = "payments:stats:fresh"
+PAYMENT_STATS_STALE_KEY = "payments:stats:stale"
+PAYMENT_STATS_LOCK_KEY = "payments:stats:lock"
+PAYMENT_STATS_TTL = 60
+PAYMENT_STATS_STALE_TTL = 3600
+PAYMENT_STATS_LOCK_TTL = 30
+_local_payment_stats: TTLCache = TTLCache(maxsize=1, ttl=PAYMENT_STATS_TTL)
+_local_stale_payment_stats: TTLCache = TTLCache(maxsize=1, ttl=PAYMENT_STATS_STALE_TTL)
+_local_payment_stats_lock: TTLCache = TTLCache(maxsize=1, ttl=PAYMENT_STATS_LOCK_TTL)
+
+
+def get_cached_payment_stats() -> Optional[Tuple[dict, bool]]:
+    """Return the cached payment statistics and whether they are fresh, or None on a miss."""
+    client = _sync_counter_client()
+    if client is None:
+        fresh = _local_payment_stats.get(PAYMENT_STATS_KEY)
+        stale = _local_stale_payment_stats.get(PAYMENT_STATS_KEY)
+    else:
+        fresh, stale = client.mget(PAYMENT_STATS_KEY, PAYMENT_STATS_STALE_KEY)
+        fresh = orjson.loads(fresh) if fresh is not None else None
+        stale = orjson.loads(stale) if stale is not None else None
+    if fresh is not None:
+        return fresh, True
+    if stale is not None:
+        return stale, False
+    return None
+
+
+def cache_payment_stats(stats: dict) -> None:
+    """Store freshly computed payment statistics as both the fresh and the stale copy."""
+    client = _sync_counter_client()
+    if client is None:
+        _local_payment_stats[PAYMENT_STATS_KEY] = stats
+        _local_stale_payment_stats[PAYMENT_STATS_KEY] = stats
+    else:
+        value = orjson.dumps(stats)
+        pipe = client.pipeline(transaction=False)
+        pipe.set(PAYMENT_STATS_KEY, value, ex=PAYMENT_STATS_TTL)
+        pipe.set(PAYMENT_STATS_STALE_KEY, value, ex=PAYMENT_STATS_STALE_TTL)
+        pipe.execute()
+
+
+def invalidate_payment_stats() -> None:
+    """Drop the fresh payment statistics after a payment changes; the stale copy stays servable."""
+    client = _sync_counter_client()
+    if client is None:
+        _local_payment_stats.pop(PAYMENT_STATS_KEY, None)
+    else:
+        client.delete(PAYMENT_STATS_KEY)
+
+
+def acquire_payment_stats_refresh() -> bool:
+    """Take the payment statistics refresh lock; False if another worker holds it."""
+    client = _sync_counter_client()
+    if client is None:
+        if PAYMENT_STATS_LOCK_KEY in _local_payment_stats_lock:
+            return False
+        _local_payment_stats_lock[PAYMENT_STATS_LOCK_KEY] = True
+        return True
+    return bool(client.set(PAYMENT_STATS_LOCK_KEY, 1, nx=True, ex=PAYMENT_STATS_LOCK_TTL))
+
+
+def release_payment_stats_refresh() -> None:
+    """Release the payment statistics refresh lock once the refresh is done."""
+    client = _sync_counter_client()
+    if client is None:
+        _local_payment_stats_lock.pop(PAYMENT_STATS_LOCK_KEY, None)
+    else:
+        client.delete(PAYMENT_STATS_LOCK_KEY)
+
+
+# Webhook event IDs claimed by a worker, so concurrent or retried deliveries
+# of the same event are handled once
+WEBHOOK_CLAIM_TTL = 3600
+_local_webhook_claims: TTLCache = TTLCache(maxsize=100000, ttl=WEBHOOK_CLAIM_TTL)
+
+
+def webhook_claim_key(event_id: str) -> str:
+    """Key claiming a Stripe webhook event."""
+    return f"webhook:stripe:{event_id}"
+
+
+async def claim_webhook_event(event_id: str) -> bool:
+    """Claim a webhook event for processing; False if it was already claimed."""
+    client = _counter_client()
+    if client is None:
+        if event_id in _local_webhook_claims:
+            return False
+        _local_webhook_claims[event_id] = True
+        return True
+    return bool(await client.set(webhook_claim_key(event_id), 1, nx=True, ex=WEBHOOK_CLAIM_TTL))
+
+
+async def release_webhook_event(event_id: str) -> None:
+    """Release a claim when processing failed, so the gateway's retry is handled."""
+    client = _counter_client()
+    if client is None:
+        _local_webhook_claims.pop(event_id, None)
+    else:
+        await client.delete(webhook_claim_key(event_id))
+
+
+# Write-behind buffers: IDs queued by request handlers and drained in batches by workers.
+# A worker moves each batch to a processing list of its own and deletes that list
+# only once the batch is committed, so a failed or crashed flush loses nothing.
+
+# Moves up to ARGV[1] IDs from the front of KEYS[1] to KEYS[2] atomically
+_CLAIM_PENDING = (
+    "local ids = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1) "
+    "if #ids > 0 then "
+    "redis.call('LTRIM', KEYS[1], #ids, -1) "
+    "redis.call('RPUSH', KEYS[2], unpack(ids)) end "
+    "return ids"
+)
+
+# Moves every ID in KEYS[1] back to the front of KEYS[2] atomically, keeping their order
+_REQUEUE_PENDING = (
+    "local ids = redis.call('LRANGE', KEYS[1], 0, -1) "
+    "for i = #ids, 1, -1 do redis.call('LPUSH', KEYS[2], ids[i]) end "
+    "redis.call('DEL', KEYS[1]) "
+    "return #ids"
+)
+
+
+async def push_pending_ids(key: str, *ids: int) -> bool:
+    """Append IDs to a write-behind buffer; False when there is no Redis to hold it."""
+    client = _counter_client()
+    if client is None:
+        return False
+    await client.rpush(key, *ids)
+    return True
+
+
+def claim_pending_ids(key: str, processing_key: str, count: int) -> List[int]:
+    """Move up to count IDs from the front of a buffer to a processing list and return them."""
+    client = _sync_counter_client()
+    if client is None:
+        return []
+    return [int(value) for value in client.eval(_CLAIM_PENDING, 2, key, processing_key, count)]
+
+
+def get_processing_ids(processing_key: str) -> List[int]:
+    """Return the IDs left in a processing list, e.g. by a flush that crashed."""
+    client = _sync_counter_client()
+    if client is None:
+        return []
+    return [int(value) for value in client.lrange(processing_key, 0, -1)]
+
+
+def ack_processing_ids(processing_key: str) -> None:
+    """Drop a processing list once its IDs have been handled."""
+    client = _sync_counter_client()
+    if client is not None:
+        client.delete(processing_key)
+
+
+def requeue_processing_ids(processing_key: str, key: str) -> None:
+    """Return the IDs of a processing list to the front of their buffer after a failure."""
+    client = _sync_counter_client()
+    if client is not None:
+        client.eval(_REQUEUE_PENDING, 2, processing_key, key)
@@ -0,0 +1,29 @@
+"""
+celery_app.py - Background task queue
+This file configures the Celery application used by the Culinary Academy Student
+Registration system for work that should not hold up a request, such as sending
+notification emails. Notification tasks are routed to a dedicated email_queue so
+their workers can be sized independently of the API, e.g.:
+
+    celery -A app.core.celery_app worker -Q email_queue -P gevent -c 100
+"""
+
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "culinary_academy",
+    broker=settings.CELERY_BROKER_URL,
+    include=["app.tasks.notifications"],
+)
+
+celery_app.conf.update(
+    task_routes={"app.tasks.notifications.*": {"queue": "email_queue"}},
+    task_acks_late=True,  # Acknowledge after the task ran so a crashed worker's task is redelivered
+    worker_prefetch_multiplier=1,  # With late acks, only reserve the task being worked on
+    broker_transport_options={"polling_interval": 0.5},  # Seconds between polls of an idle queue
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,  # Callers never wait on notification results
+)
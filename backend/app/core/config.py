@@ -0,0 +1,84 @@
+"""
+config.py - Application settings
+This file declares the configuration of the Culinary Academy Student
+Registration system. Values are read from the environment or a .env file
+(see .env.example), with defaults suitable for local development.
+"""
+
+import secrets
+from typing import List, Optional
+
+from pydantic import model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Application settings loaded from environment variables."""
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="ignore")
+
+    # API settings
+    API_V1_STR: str = "/api/v1"
+    PROJECT_NAME: str = "Culinary Academy"
+    ENVIRONMENT: str = "development"  # "production" disables the /docs page
+    BACKEND_CORS_ORIGINS: List[str] = []
+    FRONTEND_URL: str = "http://localhost:3000"
+
+    # Security
+    SECRET_KEY: str = secrets.token_urlsafe(32)
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
+
+    # Database
+    POSTGRES_SERVER: str = "localhost"
+    POSTGRES_USER: str = "postgres"
+    POSTGRES_PASSWORD: str = "postgres"
+    POSTGRES_DB: str = "culinary_academy"
+    SQLALCHEMY_DATABASE_URI: Optional[str] = None  # Built from POSTGRES_* when unset
+
+    # Connection pooling (see app/db/session.py)
+    DB_USE_PGBOUNCER: bool = False  # PgBouncer owns pooling; the app keeps no connections
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_PRE_PING: bool = True
+
+    # Email
+    SMTP_TLS: bool = True
+    SMTP_PORT: int = 587
+    SMTP_HOST: str = ""
+    SMTP_USER: str = ""
+    SMTP_PASSWORD: str = ""
+    EMAILS_FROM_EMAIL: str = ""
+    EMAILS_FROM_NAME: str = "Culinary Academy"
+
+    # Stripe
+    STRIPE_API_KEY: str = ""
+
+    # Redis response cache and counters; in-memory per worker when unset
+    REDIS_URL: Optional[str] = None
+
+    # Celery broker for background tasks
+    CELERY_BROKER_URL: str = "redis://localhost:6379/1"
+
+    # Uploads
+    UPLOAD_DIR: str = "uploads"
+    MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
+    DOWNLOAD_ACCEL_REDIRECT_PREFIX: Optional[str] = None  # Reverse-proxy location mapped to UPLOAD_DIR
+
+    # Admin account created on first start
+    FIRST_ADMIN_EMAIL: str = "admin@example.com"
+    FIRST_ADMIN_PASSWORD: str = "adminpassword"
+
+    @model_validator(mode="after")
+    def _assemble_database_uri(self) -> "Settings":
+        """Build the database URI from the POSTGRES_* settings when not given."""
+        if not self.SQLALCHEMY_DATABASE_URI:
+            self.SQLALCHEMY_DATABASE_URI = (
+                f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+                f"@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
+            )
+        return self
+
+
+settings = Settings()
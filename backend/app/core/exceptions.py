@@ -0,0 +1,42 @@
+"""
+exceptions.py - Service-layer exceptions
+This file defines the exceptions raised by the service layer of the Culinary
+Academy Student Registration system. Services raise these instead of HTTP
+errors; the exception handlers in main.py map them to HTTP responses.
+"""
+
+from typing import Optional
+
+
+class AppError(Exception):
+    """Base class for service-layer errors carrying a client-facing detail message."""
+
+    default_detail = "An error occurred"
+
+    def __init__(self, detail: Optional[str] = None):
+        self.detail = detail or self.default_detail  # Message returned to the client
+        super().__init__(self.detail)
+
+
+class NotFoundError(AppError):
+    """A requested resource does not exist (HTTP 404)."""
+
+    default_detail = "Resource not found"
+
+
+class ValidationError(AppError):
+    """Input was rejected by business rules (HTTP 400)."""
+
+    default_detail = "Invalid input"
+
+
+class AuthenticationError(AppError):
+    """Credentials are missing, invalid or belong to an inactive account (HTTP 401)."""
+
+    default_detail = "Could not authenticate"
+
+
+class PermissionDeniedError(AppError):
+    """The requester is not allowed to act on the resource (HTTP 403)."""
+
+    default_detail = "Not authorized to perform this action"
@@ -0,0 +1,39 @@
+"""
+logging.py - Non-blocking log output
+This file moves the root logger's handlers behind a queue for the Culinary
+Academy Student Registration system. Request handlers only enqueue log records;
+a background listener thread formats them and writes them to the real
+handlers, so slow stream writes never stall the event loop or a worker thread.
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def start_queued_logging() -> None:
+    """Route root log records through a queue drained by a background thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_queued_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
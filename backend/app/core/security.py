@@ -0,0 +1,65 @@
+"""
+security.py - Password hashing and access tokens
+This file provides the password hashing helpers and the JWT access token
+functions for the Culinary Academy Student Registration system. Tokens are
+signed with PyJWT; besides the subject and expiry they may carry extra claims,
+such as the user's role and active status, that requests authorize from
+without loading the user.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union
+
+import jwt
+from jwt import PyJWTError
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# Signing algorithm for access tokens
+ALGORITHM = "HS256"
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    extra_claims: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Create a signed JWT access token.
+
+    Args:
+        subject: Token subject, typically the user ID
+        expires_delta: Token lifetime (defaults to ACCESS_TOKEN_EXPIRE_MINUTES)
+        extra_claims: Additional claims stored in the token, e.g. role and active
+
+    Returns:
+        Encoded JWT
+    """
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload: Dict[str, Any] = dict(extra_claims or {})
+    payload["sub"] = str(subject)
+    payload["exp"] = datetime.now(timezone.utc) + expires_delta
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[int]:
+    """Return the user ID a valid token was issued for, or None."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        return int(payload["sub"])
+    except (PyJWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Check a plain password against its stored hash."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password for storage."""
+    return pwd_context.hash(password)
@@ -7,7 +7,7 @@ courses, including status management and filtering by various criteria.
 from typing import List, Optional
 from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
 
 from app.crud.base import CRUDBase
 from app.domain.models.enrollment import Enrollment, EnrollmentStatus, PaymentStatus
@@ -239,64 +239,22 @@ class CRUDEnrollment(CRUDBase[Enrollment, EnrollmentCreate, EnrollmentUpdate]):
         dict
             Enrollment statistics by status and payment status
         """
-        total = db.query(func.count(Enrollment.id)).scalar()
+        # One grouped scan returns a count per (status, payment_status) pair
+        rows = db.execute(
+            select(Enrollment.status, Enrollment.payment_status, func.count())
+            .group_by(Enrollment.status, Enrollment.payment_status)
+        ).all()
         
-        # Status counts
-        pending = (
-            db.query(func.count(Enrollment.id))
-            .filter(Enrollment.status == EnrollmentStatus.PENDING)
-            .scalar()
-        )
-        approved = (
-            db.query(func.count(Enrollment.id))
-            .filter(Enrollment.status == EnrollmentStatus.APPROVED)
-            .scalar()
-        )
-        rejected = (
-            db.query(func.count(Enrollment.id))
-            .filter(Enrollment.status == EnrollmentStatus.REJECTED)
-            .scalar()
-        )
-        completed = (
-            db.query(func.count(Enrollment.id))
-            .filter(Enrollment.status == EnrollmentStatus.COMPLETED)
-            .scalar()
-        )
-        
-        # Payment status counts
-        payment_pending = (
-            db.query(func.count(Enrollment.id))
-            .filter(Enrollment.payment_status == PaymentStatus.PENDING)
-            .scalar()
-        )
-        payment_paid = (
-            db.query(func.count(Enrollment.id))
-            .filter(Enrollment.payment_status == PaymentStatus.PAID)
-            .scalar()
-        )
-        payment_refunded = (
-            db.query(func.count(Enrollment.id))
-            .filter(Enrollment.payment_status == PaymentStatus.REFUNDED)
-            .scalar()
-        )
-        payment_failed = (
-            db.query(func.count(Enrollment.id))
-            .filter(Enrollment.payment_status == PaymentStatus.FAILED)
-            .scalar()
-        )
+        by_status = dict.fromkeys((s.value for s in EnrollmentStatus), 0)
+        by_payment_status = dict.fromkeys((s.value for s in PaymentStatus), 0)
+        total = 0
+        for enrollment_status, payment_status, count in rows:
+            by_status[enrollment_status.value] += count
+            by_payment_status[payment_status.value] += count
+            total += count
         
         return {
             "total": total,
-            "by_status": {
-                "pending": pending,
-                "approved": approved,
-                "rejected": rejected,
-                "completed": completed,
-            },
-            "by_payment_status": {
-                "pending": payment_pending,
-                "paid": payment_paid,
-                "refunded": payment_refunded,
-                "failed": payment_failed,
-            },
+            "by_status": by_status,
+            "by_payment_status": by_payment_status,
         }
\ No newline at end of file
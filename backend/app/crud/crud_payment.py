@@ -6,13 +6,17 @@ course enrollments, including payment processing, refunds, and financial reporti
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, desc
 
 from app.crud.base import CRUDBase
+from app.domain.models.enrollment import Enrollment
 from app.domain.models.payment import Payment, PaymentStatus, PaymentMethod
 from app.domain.schemas.payment import PaymentCreate, PaymentUpdate
 
+# Loads a payment's enrollment and course in the same query as the payment
+_WITH_ENROLLMENT_AND_COURSE = joinedload(Payment.enrollment).joinedload(Enrollment.course)
+
 
 class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
     """CRUD operations for Payment model with financial reporting capabilities."""
@@ -33,6 +37,7 @@ class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
         """
         return (
             db.query(Payment)
+            .options(_WITH_ENROLLMENT_AND_COURSE)
             .filter(Payment.id == id)
             .first()
         )
@@ -65,6 +70,9 @@ class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
         """
         Get payment by external transaction ID.
         
+        The enrollment and course are loaded with it, since webhook handling
+        updates the enrollment and names the course in the notification.
+        
         Parameters
         ----------
         db: SQLAlchemy session
@@ -73,10 +81,11 @@ class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
         Returns
         -------
         Optional[Payment]
-            Payment if found, None otherwise
+            Payment with enrollment and course if found, None otherwise
         """
         return (
             db.query(Payment)
+            .options(_WITH_ENROLLMENT_AND_COURSE)
             .filter(Payment.transaction_id == transaction_id)
             .first()
         )
@@ -0,0 +1,11 @@
+"""
+base_class.py - Declarative base for SQLAlchemy models
+This file defines the Base class every model of the Culinary Academy Student
+Registration system inherits from. Models declare their own __tablename__.
+"""
+
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(DeclarativeBase):
+    """Base class for all SQLAlchemy models."""
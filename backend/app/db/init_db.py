@@ -42,7 +42,7 @@ def init_db() -> None:
         # Create initial culinary courses if needed
         create_initial_courses(db)
     finally:
-        db.close()
+        SessionLocal.remove()  # Close the session and discard it from the registry
 
 
 def create_initial_users(db: Session) -> None:
@@ -0,0 +1,100 @@
+"""
+session.py - Database engine and session management
+This file creates the SQLAlchemy engine and the request-scoped session registry
+used throughout the Culinary Academy Student Registration system, along with the
+middleware that guarantees each request's session is released when the request ends.
+"""
+
+import threading
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.core.config import settings
+
+def _pool_options() -> Dict[str, Any]:
+    """
+    Connection pool options shared by the sync and async engines.
+
+    When the database is fronted by PgBouncer (DB_USE_PGBOUNCER), the bouncer
+    owns pooling, so SQLAlchemy holds no connections of its own (NullPool) and
+    avoids double pooling. Otherwise a QueuePool sized for worker concurrency
+    is used, with pre-ping to discard connections the server has dropped.
+    Every knob can be overridden via the DB_* environment variables.
+    """
+    if settings.DB_USE_PGBOUNCER:
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,  # Persistent connections per worker (default 20)
+        "max_overflow": settings.DB_MAX_OVERFLOW,  # Extra connections allowed under bursts (default 10)
+        "pool_timeout": settings.DB_POOL_TIMEOUT,  # Seconds to wait for a free connection (default 30)
+        "pool_recycle": settings.DB_POOL_RECYCLE,  # Seconds before a connection is replaced (default 3600)
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Liveness check on checkout (default True)
+        "pool_use_lifo": True,  # Reuse the most recent connection so idle ones can expire
+    }
+
+
+# Engine shared by the whole application
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **_pool_options())
+
+# Async engine for endpoints that await their queries, using the asyncpg driver
+# against the same database and with the same pooling as the sync engine
+async_engine = create_async_engine(
+    make_url(str(settings.SQLALCHEMY_DATABASE_URI)).set(drivername="postgresql+asyncpg"),
+    **_pool_options(),
+)
+
+# Factory for async sessions; objects stay usable after commit without a refresh round-trip
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Identifier of the request currently being processed (None outside of a request)
+_request_scope: ContextVar[Optional[str]] = ContextVar("db_request_scope", default=None)
+
+
+def _session_scope() -> str:
+    """
+    Scope function for the session registry.
+
+    Inside a request every dependency and threadpool call shares one session,
+    since the context variable is copied into worker threads. Outside of a
+    request (startup tasks, scripts) sessions fall back to being thread-local.
+    """
+    return _request_scope.get() or f"thread-{threading.get_ident()}"
+
+
+# Request-scoped session registry; SessionLocal() returns the session for the current scope.
+# Long-running work outside a request should use `with SessionLocal() as db:` and
+# call SessionLocal.remove() when done.
+SessionLocal = scoped_session(
+    sessionmaker(autocommit=False, autoflush=False, bind=engine),
+    scopefunc=_session_scope,
+)
+
+
+class DBSessionMiddleware(BaseHTTPMiddleware):
+    """
+    Bind a session scope to each request and release it afterwards.
+
+    SessionLocal.remove() runs in a finally block, so the connection goes back
+    to the pool as soon as the response is produced, even when FastAPI delays
+    closing generator dependencies. BackgroundTasks run after that, so they
+    must open their own session rather than receive the request's.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        token = _request_scope.set(uuid.uuid4().hex)
+        try:
+            return await call_next(request)
+        finally:
+            SessionLocal.remove()  # Close the session and return its connection to the pool
+            _request_scope.reset(token)
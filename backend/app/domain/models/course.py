@@ -6,7 +6,8 @@ enrollments, and schedules, and includes attributes for course details such as
 title, description, pricing, duration, and capacity.
 """
 
-from sqlalchemy import Boolean, Column, String, Integer, Float, ForeignKey, Date, Text  # Import SQLAlchemy column types
+from sqlalchemy import Boolean, Column, String, Integer, Float, ForeignKey, Date, DateTime, Text  # Import SQLAlchemy column types
+from sqlalchemy.sql import func  # Import SQL functions for default timestamps
 from sqlalchemy.orm import relationship  # Import SQLAlchemy relationship for defining model associations
 from app.db.base_class import Base  # Import Base class for SQLAlchemy models
 
@@ -23,7 +24,7 @@ class Course(Base):
     description = Column(Text, nullable=True)  # Course description, allowing for lengthy content
     
     # Instructor relationship
-    instructor_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Foreign key linking to instructor's user ID
+    instructor_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Foreign key linking to instructor's user ID (indexed for instructor scoping)
     
     # Course details
     duration = Column(Integer, nullable=False)  # Course duration in days
@@ -37,6 +38,7 @@ class Course(Base):
     # Status and display
     is_active = Column(Boolean, default=True)  # Flag indicating if course is currently active
     image_url = Column(String(255), nullable=True)  # URL to course image for UI display
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # Last modification timestamp, versions enrollment details
     
     # Relationships with other entities
     instructor = relationship("User", back_populates="courses", foreign_keys=[instructor_id])  # Bi-directional relationship with User model
@@ -6,7 +6,7 @@ and establishes relationships with the user model. The document system allows
 storing various types of files like ID proofs, certifications, and resumes.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, Enum  # Import SQLAlchemy column types
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, Enum, Index  # Import SQLAlchemy column types
 from sqlalchemy.orm import relationship  # Import SQLAlchemy relationship for model associations
 from sqlalchemy.sql import func  # Import SQL functions for default timestamps
 import enum  # Import Python's enum module for type definitions
@@ -39,9 +39,20 @@ class Document(Base):
     document_type = Column(Enum(DocumentType), nullable=False)  # Category of document from predefined types
     description = Column(Text, nullable=True)  # Optional description of the document
     file_size = Column(Integer, nullable=True)  # Size of the file in bytes, for storage management
+    sha256 = Column(String(64), nullable=True, index=True)  # Hex SHA-256 digest of the file, for integrity checks and deduplication
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # Last modification timestamp, used for ETags
+    
+    # Indexes matching the document list filters (trigram indexes need the pg_trgm extension)
+    __table_args__ = (
+        # Owner and type filters; also serves owner-only lookups
+        Index('ix_documents_user_type', 'user_id', 'document_type'),
+        # ILIKE search on file name and description
+        Index('ix_documents_trgm_file_name', 'file_name', postgresql_using='gin', postgresql_ops={'file_name': 'gin_trgm_ops'}),
+        Index('ix_documents_trgm_desc', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
     
     # Relationships
-    user = relationship("User", back_populates="documents")  # Bi-directional relationship with User model
+    user = relationship("User", back_populates="documents", lazy="raise")  # Bi-directional relationship with User model; must be eager-loaded
     
     class Config:
         """Pydantic configuration for ORM mode compatibility."""
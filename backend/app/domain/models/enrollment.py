@@ -7,7 +7,7 @@ system serves as the core connection between users and courses, tracking both
 the administrative approval process and payment lifecycle.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Enum  # Import SQLAlchemy column types
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Enum, Index  # Import SQLAlchemy column types
 from sqlalchemy.orm import relationship  # Import SQLAlchemy relationship for model associations
 from sqlalchemy.sql import func  # Import SQL functions for default timestamps
 import enum  # Import Python's enum module for status definitions
@@ -47,12 +47,21 @@ class Enrollment(Base):
     status = Column(Enum(EnrollmentStatus), default=EnrollmentStatus.PENDING, nullable=False)  # Administrative status of enrollment
     payment_status = Column(Enum(PaymentStatus), default=PaymentStatus.PENDING, nullable=False)  # Financial status of enrollment
     notes = Column(String(500), nullable=True)  # Optional administrative notes about the enrollment
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # Last modification timestamp, used for ETags
     
     # Relationships
     student = relationship("User", back_populates="enrollments", foreign_keys=[student_id])  # Bi-directional relationship with User model
     course = relationship("Course", back_populates="enrollments")  # Bi-directional relationship with Course model
     payments = relationship("Payment", back_populates="enrollment", cascade="all, delete-orphan")  # Related payments with cascade delete
     
+    __table_args__ = (
+        # Enrollment versions are looked up per student
+        Index('ix_enrollments_student_updated', 'student_id', 'updated_at'),
+        # List filters: student or course, optionally narrowed by status
+        Index('ix_enrollments_student_status', 'student_id', 'status'),
+        Index('ix_enrollments_course_status', 'course_id', 'status'),
+    )
+    
     class Config:
         """Pydantic configuration for ORM mode compatibility."""
         orm_mode = True  # Enables ORM mode for Pydantic schema integration
\ No newline at end of file
@@ -7,11 +7,13 @@ with users. The notification system enables communication with users about
 important events like enrollment changes, payments, and system announcements.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, Boolean, Enum  # Import SQLAlchemy column types
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, Boolean, Enum, Index  # Import SQLAlchemy column types
 from sqlalchemy.orm import relationship  # Import SQLAlchemy relationship for model associations
-from sqlalchemy.sql import func  # Import SQL functions for default timestamps
+from sqlalchemy.sql import func, text, true  # Import SQL functions for default timestamps and predicates
+from sqlalchemy.sql.elements import ColumnElement  # Import type hint for WHERE predicates
 import enum  # Import Python's enum module for type definitions
 from app.db.base_class import Base  # Import Base class for SQLAlchemy models
+from app.domain.models.user import ROLE_MASK_ADMIN  # Import admin permission bit
 
 class NotificationType(str, enum.Enum):
     """
@@ -49,6 +51,27 @@ class Notification(Base):
     # Relationships
     user = relationship("User", back_populates="notifications")  # Bi-directional relationship with User model
     
+    __table_args__ = (
+        # Newest-first keyset pages of a user's notifications, optionally by read status
+        Index('ix_notifications_user_id_desc', 'user_id', id.desc()),
+        Index('ix_notifications_user_read_id_desc', 'user_id', 'is_read', id.desc()),
+        Index('ix_notifications_user_type_id_desc', 'user_id', 'notification_type', id.desc()),
+        # Unread counts and mark-all-read only touch unread rows
+        Index('ix_notifications_user_unread', 'user_id', postgresql_where=text('NOT is_read')),
+    )
+    
+    @classmethod
+    def accessible_by(cls, user) -> ColumnElement[bool]:
+        """
+        WHERE predicate for the notifications a user may read or change.
+
+        Admins may access every notification, so no condition is added for
+        them; everyone else is limited to their own.
+        """
+        if user.role_mask & ROLE_MASK_ADMIN:
+            return true()
+        return cls.user_id == user.id
+    
     class Config:
         """Pydantic configuration for ORM mode compatibility."""
         orm_mode = True  # Enables ORM mode for Pydantic schema integration
\ No newline at end of file
@@ -7,7 +7,7 @@ with enrollments. The payment system enables financial transactions for course
 registrations and maintains an audit trail of payment activities.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Float, Enum  # Import SQLAlchemy column types
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Float, Enum, Index, UniqueConstraint  # Import SQLAlchemy column types
 from sqlalchemy.orm import relationship  # Import SQLAlchemy relationship for model associations
 from sqlalchemy.sql import func  # Import SQL functions for default timestamps
 import enum  # Import Python's enum module for type definitions
@@ -49,10 +49,30 @@ class Payment(Base):
     transaction_id = Column(String(255), nullable=True, unique=True)  # External payment processor's transaction reference
     status = Column(Enum(PaymentStatus), default=PaymentStatus.PENDING, nullable=False)  # Current state of the payment
     notes = Column(String(500), nullable=True)  # Optional administrative notes about the payment
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # Last modification timestamp, versions enrollment details
     
     # Relationships
     enrollment = relationship("Enrollment", back_populates="payments")  # Bi-directional relationship with Enrollment model
     
+    __table_args__ = (
+        # Payment list filters: equality columns first, payment_date range last
+        Index('ix_payments_enrollment_date', 'enrollment_id', 'payment_date'),
+        Index('ix_payments_status_date', 'status', 'payment_date'),
+        Index('ix_payments_payment_date', 'payment_date'),
+    )
+    
     class Config:
         """Pydantic configuration for ORM mode compatibility."""
-        orm_mode = True  # Enables ORM mode for Pydantic schema integration
\ No newline at end of file
+        orm_mode = True  # Enables ORM mode for Pydantic schema integration
+
+class ProcessedWebhookEvent(Base):
+    """Payment gateway webhook events that have already been handled, for idempotent retries."""
+    __tablename__ = "processed_webhook_events"  # Database table name for handled webhook events
+    
+    id = Column(Integer, primary_key=True)  # Primary key
+    stripe_event_id = Column(String(255), nullable=False)  # Stripe event ID; a retry of the same event conflicts
+    processed_at = Column(DateTime(timezone=True), server_default=func.now())  # When the event was handled
+    
+    __table_args__ = (
+        UniqueConstraint('stripe_event_id', name='uq_processed_webhook_events_stripe_event_id'),
+    )
@@ -7,8 +7,9 @@ enrollments, documents, and notifications. The user model serves as the central
 identity and access control mechanism for the system.
 """
 
-from sqlalchemy import Boolean, Column, String, Integer, Enum, Text  # Import SQLAlchemy column types
+from sqlalchemy import Boolean, Column, String, Integer, Enum, Text, DateTime, Index, text  # Import SQLAlchemy column types
 from sqlalchemy.orm import relationship  # Import SQLAlchemy relationship for model associations
+from sqlalchemy.sql import func  # Import SQL functions for default timestamps
 import enum  # Import Python's enum module for role definitions
 from app.db.base_class import Base  # Import Base class for SQLAlchemy models
 
@@ -21,6 +22,22 @@ class UserRole(str, enum.Enum):
     INSTRUCTOR = "instructor" # Teachers who can create and manage courses
     ADMIN = "admin"           # System administrators with full access
 
+# Permission bits packed into User.role_mask for single-operation authorization checks
+ROLE_MASK_ADMIN = 1       # User has the admin role
+ROLE_MASK_INSTRUCTOR = 2  # User has the instructor role
+ROLE_MASK_ACTIVE = 4      # User account is active
+ROLE_MASK_STUDENT = 8     # User has the student role
+
+_ROLE_BITS = {
+    UserRole.ADMIN: ROLE_MASK_ADMIN,
+    UserRole.INSTRUCTOR: ROLE_MASK_INSTRUCTOR,
+    UserRole.STUDENT: ROLE_MASK_STUDENT,
+}
+
+def role_mask_for(role: UserRole, is_active: bool) -> int:
+    """Bitmask for a role and active status (see ROLE_MASK_* constants)."""
+    return _ROLE_BITS.get(role, 0) | (ROLE_MASK_ACTIVE if is_active else 0)
+
 class User(Base):
     """User accounts for authentication and profile management."""
     __tablename__ = "users"  # Database table name for users
@@ -37,13 +54,28 @@ class User(Base):
     address = Column(Text, nullable=True)  # Physical address (optional)
     is_active = Column(Boolean, default=True)  # Account status flag (inactive accounts cannot login)
     profile_picture = Column(String(255), nullable=True)  # Path or URL to profile image (optional)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # Last modification timestamp, used for ETags
+    
+    # Indexes matching the user list filters (trigram indexes need the pg_trgm extension)
+    __table_args__ = (
+        # Role filter over active accounts
+        Index('ix_users_role_active', 'role', 'is_active', postgresql_where=text('is_active')),
+        # ILIKE search on email and full name
+        Index('ix_users_trgm_email', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+        Index('ix_users_trgm_full_name', 'full_name', postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'}),
+    )
     
     # Relationships with other entities
     courses = relationship("Course", back_populates="instructor", foreign_keys="Course.instructor_id")  # Courses taught by user (if instructor)
-    enrollments = relationship("Enrollment", back_populates="student", foreign_keys="Enrollment.student_id")  # Course enrollments (if student)
+    enrollments = relationship("Enrollment", back_populates="student", foreign_keys="Enrollment.student_id", lazy="raise")  # Course enrollments (if student); must be eager-loaded
     documents = relationship("Document", back_populates="user")  # User's uploaded documents
     notifications = relationship("Notification", back_populates="user")  # Notifications sent to user
     
+    @property
+    def role_mask(self) -> int:
+        """Bitmask of the user's role and active status (see ROLE_MASK_* constants)."""
+        return role_mask_for(self.role, self.is_active)
+    
     class Config:
         """Pydantic configuration for ORM mode compatibility."""
         orm_mode = True  # Enables ORM mode for Pydantic schema integration
\ No newline at end of file
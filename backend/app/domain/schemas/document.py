@@ -75,7 +75,8 @@ class DocumentInDB(DocumentBase):
     file_type: Optional[str] = None  # File MIME type
     upload_date: datetime  # When the document was uploaded
     file_size: Optional[int] = None  # File size in bytes
-    created_at: datetime  # Record creation timestamp
+    sha256: Optional[str] = None  # Hex SHA-256 digest of the file
+    created_at: datetime = Field(validation_alias="upload_date")  # Record creation timestamp (the upload time)
     updated_at: datetime  # Record last update timestamp
     
     class Config:
@@ -5,7 +5,7 @@ in requests and responses, ensuring type safety and data integrity.
 """
 
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from app.domain.models.enrollment import EnrollmentStatus, PaymentStatus  # Import enums from SQLAlchemy model
 
@@ -55,8 +55,8 @@ class EnrollmentInDB(EnrollmentBase):
     created_at: datetime  # Record creation timestamp
     updated_at: datetime  # Record last update timestamp
     
-    class Config:
-        orm_mode = True  # Enable ORM mode for SQLAlchemy integration
+    # Read from ORM objects; response instances are immutable
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 class Enrollment(EnrollmentInDB):
     """
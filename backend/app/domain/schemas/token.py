@@ -5,6 +5,7 @@ and their payloads, ensuring consistency in token handling throughout the applic
 """
 
 from typing import Optional
+import msgspec  # C-level struct decoding for the per-request token claims
 from pydantic import BaseModel
 
 class Token(BaseModel):
@@ -17,12 +18,16 @@ class Token(BaseModel):
     access_token: str  # The actual JWT token string
     token_type: str  # Token type, typically "bearer"
 
-class TokenPayload(BaseModel):
+class TokenPayload(msgspec.Struct):
     """
     Schema for token payload (JWT claims).
     
     Represents the data structure inside the JWT token,
     containing standard JWT claims like subject and expiration.
+    Decoded on every authenticated request, so it is a msgspec Struct
+    rather than a Pydantic model; unknown claims are ignored.
     """
     sub: Optional[int] = None  # Subject (typically user ID)
-    exp: Optional[int] = None  # Expiration timestamp
\ No newline at end of file
+    exp: Optional[int] = None  # Expiration timestamp
+    role: Optional[str] = None  # User role at the time the token was issued
+    active: Optional[bool] = None  # Whether the account was active when the token was issued
\ No newline at end of file
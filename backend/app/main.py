@@ -12,10 +12,15 @@ from fastapi.middleware.cors import CORSMiddleware  # Import CORS middleware
 from fastapi.responses import JSONResponse  # Import JSON response helper
 from fastapi.openapi.docs import get_swagger_ui_html  # Import Swagger UI generator
 from fastapi.staticfiles import StaticFiles  # Import static file handler
+from sqlalchemy.exc import SQLAlchemyError  # Import base class of database errors
 import os  # Import OS module for file system operations
 from app.api.api_v1.api import api_router  # Import API router with all endpoints
 from app.core.config import settings  # Import application settings
 from app.db.init_db import init_db  # Import database initialization function
+from app.core.cache import init_cache  # Import response cache setup
+from app.db.session import DBSessionMiddleware  # Import request-scoped session cleanup middleware
+from app.core.exceptions import NotFoundError, PermissionDeniedError, ValidationError  # Import service-layer exceptions
+from app.core.logging import start_queued_logging, stop_queued_logging  # Import non-blocking log output
 
 # Set up logging configuration
 logging.basicConfig(
@@ -29,8 +34,12 @@ app = FastAPI(
     title=settings.PROJECT_NAME,  # Application name from settings
     openapi_url=f"{settings.API_V1_STR}/openapi.json",  # Path to OpenAPI schema
     docs_url=None,  # Disable default Swagger UI to use custom implementation
+    redoc_url=None,  # ReDoc is not used; Swagger UI below is the only docs page
 )
 
+# Interactive documentation is only served outside production
+docs_enabled = settings.ENVIRONMENT != "production"
+
 # Set up Cross-Origin Resource Sharing (CORS) middleware
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -41,6 +50,9 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],  # Allow all HTTP headers
     )
 
+# Release the request-scoped database session once each request completes
+app.add_middleware(DBSessionMiddleware)
+
 # Create and mount uploads directory for file storage
 uploads_dir = os.path.join(os.getcwd(), settings.UPLOAD_DIR)  # Get full path to uploads directory
 os.makedirs(uploads_dir, exist_ok=True)  # Create directory if it doesn't exist
@@ -49,6 +61,45 @@ app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")  # Mou
 # Register API router with versioned prefix
 app.include_router(api_router, prefix=settings.API_V1_STR)  # Include all API routes under /api/v1
 
+# Service-layer errors propagate out of the endpoints and are mapped to responses here
+@app.exception_handler(NotFoundError)
+async def not_found_exception_handler(request: Request, exc: NotFoundError):
+    """Return 404 Not Found for resources the service layer could not find."""
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={"detail": exc.detail},
+    )
+
+@app.exception_handler(ValidationError)
+async def validation_exception_handler(request: Request, exc: ValidationError):
+    """Return 400 Bad Request for input the service layer rejected."""
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": exc.detail},
+    )
+
+@app.exception_handler(PermissionDeniedError)
+async def permission_denied_exception_handler(request: Request, exc: PermissionDeniedError):
+    """Return 403 Forbidden when the requester may not act on a resource."""
+    return JSONResponse(
+        status_code=status.HTTP_403_FORBIDDEN,
+        content={"detail": exc.detail},
+    )
+
+@app.exception_handler(SQLAlchemyError)
+async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+    """
+    Return 500 for database errors without echoing the driver's message.
+    
+    Only the exception type is logged, since SQLAlchemy messages include the
+    full statement and parameters.
+    """
+    logger.error("Database error on %s %s: %s", request.method, request.url.path, type(exc).__name__)
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "database error"},
+    )
+
 # Global exception handler for unhandled exceptions
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -69,8 +120,20 @@ async def startup_event():
     Startup event handler triggered when the application starts.
     Initializes the database and performs other startup tasks.
     """
+    start_queued_logging()  # Write log records from a background thread instead of the request path
     logger.info("Starting up application")  # Log startup event
     init_db()  # Initialize database (create tables, seed data if needed)
+    init_cache()  # Initialize the in-memory response cache
+    app.openapi()  # Build and cache the OpenAPI schema now rather than on the first request
+
+# Application shutdown event handler
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Shutdown event handler triggered when the application stops.
+    Flushes log records still waiting in the queue.
+    """
+    stop_queued_logging()
 
 # Root endpoint for basic API health check
 @app.get("/", include_in_schema=False)
@@ -81,8 +144,7 @@ async def root():
     """
     return {"message": f"Welcome to {settings.PROJECT_NAME} API"}  # Welcome message with project name
 
-# Custom Swagger UI endpoint
-@app.get("/docs", include_in_schema=False)
+# Custom Swagger UI endpoint (disabled in production)
 async def custom_swagger_ui():
     """
     Custom Swagger UI endpoint for API documentation.
@@ -93,4 +155,7 @@ async def custom_swagger_ui():
         title=f"{settings.PROJECT_NAME} - API Documentation",  # Documentation page title
         swagger_js_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@3/swagger-ui-bundle.js",  # Swagger UI JavaScript
         swagger_css_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@3/swagger-ui.css",  # Swagger UI CSS
-    )
\ No newline at end of file
+    )
+
+if docs_enabled:
+    app.add_api_route("/docs", custom_swagger_ui, methods=["GET"], include_in_schema=False)
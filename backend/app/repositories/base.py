@@ -77,6 +77,9 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Get a single record by ID.
         
+        Uses the session's identity map and primary-key lookup path,
+        avoiding a new SELECT when the record is already loaded.
+        
         Args:
             db: SQLAlchemy database session
             id: Primary key value to look up
@@ -84,7 +87,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             The found record or None if not found
         """
-        return db.query(self.model).filter(self.model.id == id).first()
+        return db.get(self.model, id)
     
     def get_by(self, db: Session, **kwargs) -> Optional[ModelType]:
         """
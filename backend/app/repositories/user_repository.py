@@ -53,13 +53,47 @@ The methods in this repository are particularly important for the authentication
 
 """
 
-from typing import Optional
+from typing import Any, Optional
 from sqlalchemy.orm import Session
 from app.domain.models.user import User
 from app.domain.schemas.user import UserCreate, UserUpdate
 from app.repositories.base import BaseRepository
 from app.core.security import get_password_hash, verify_password  # Password utility functions
 
+# Stateless helpers used on the authentication hot path.
+# They are plain module functions so callers skip the bound-method lookup
+# of a repository instance; UserRepository exposes the role checks as well.
+
+def get(db: Session, id: Any) -> Optional[User]:
+    """
+    Get a user by ID.
+    
+    Uses the session's identity map first, so a user already loaded in
+    this session is returned without emitting SQL.
+    
+    Args:
+        db: SQLAlchemy database session
+        id: User primary key
+        
+    Returns:
+        Matching user or None if not found
+    """
+    if id is None:
+        return None
+    return db.get(User, id)
+
+def is_active(user: User) -> bool:
+    """Check if the user account is active."""
+    return user.is_active
+
+def is_admin(user: User) -> bool:
+    """Check if the user has administrator privileges."""
+    return user.role == "admin"
+
+def is_instructor(user: User) -> bool:
+    """Check if the user has instructor privileges."""
+    return user.role == "instructor"
+
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
     """
     Repository for user operations.
@@ -144,50 +178,10 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         
         return user  # Authentication successful
     
-    def is_active(self, user: User) -> bool:
-        """
-        Check if user is active.
-        
-        Determines if a user account is currently active,
-        used for access control.
-        
-        Args:
-            user: User object to check
-            
-        Returns:
-            True if user is active, False otherwise
-        """
-        return user.is_active
-    
-    def is_admin(self, user: User) -> bool:
-        """
-        Check if user is admin.
-        
-        Determines if a user has administrator privileges,
-        used for permission checks.
-        
-        Args:
-            user: User object to check
-            
-        Returns:
-            True if user is an admin, False otherwise
-        """
-        return user.role == "admin"
-    
-    def is_instructor(self, user: User) -> bool:
-        """
-        Check if user is instructor.
-        
-        Determines if a user has instructor privileges,
-        used for permission checks.
-        
-        Args:
-            user: User object to check
-            
-        Returns:
-            True if user is an instructor, False otherwise
-        """
-        return user.role == "instructor"
+    # Role and status checks are stateless, so share the module-level functions
+    is_active = staticmethod(is_active)
+    is_admin = staticmethod(is_admin)
+    is_instructor = staticmethod(is_instructor)
     
     def update_password(self, db: Session, *, user: User, new_password: str) -> User:
         """
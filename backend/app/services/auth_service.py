@@ -58,7 +58,9 @@ class AuthService:
         # Generate access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            subject=user.id, expires_delta=access_token_expires
+            subject=user.id,
+            expires_delta=access_token_expires,
+            extra_claims={"role": user.role, "active": user.is_active},  # Lets requests authorize without a lookup
         )
         
         # Return user with token
@@ -327,7 +329,9 @@ class AuthService:
         # Generate new access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            subject=user.id, expires_delta=access_token_expires
+            subject=user.id,
+            expires_delta=access_token_expires,
+            extra_claims={"role": user.role, "active": user.is_active},  # Lets requests authorize without a lookup
         )
         
         return UserWithToken(
@@ -80,219 +80,517 @@ upload processing, validation, and retrieval operations. It manages
 the document lifecycle and provides file storage integration.
 """
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+import hashlib
+import logging
+import os
+import uuid
+from typing import List, Optional, Dict, Any, Tuple
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql import Select
 
 from app.domain.models.document import Document, DocumentType
+from app.domain.models.user import User
 from app.domain.schemas.document import DocumentCreate, DocumentUpdate
 from app.crud import document as crud_document
 from app.crud import user as crud_user
-from app.core.exceptions import NotFoundError, ValidationError
+from app.core.config import settings
+from app.core.exceptions import NotFoundError, PermissionDeniedError, ValidationError
 from app.utils.file_storage import FileStorageManager
 
+logger = logging.getLogger(__name__)
 
-class DocumentService:
-    """Service for document operations using CRUD abstractions."""
+# Size of each chunk copied from the upload to its final location
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+
+
+# Storage backend for document files
+_file_storage = FileStorageManager()
+
+# Document operations are stateless module-level functions, so endpoints call
+# them without creating a service instance or binding methods.
+
+
+async def get(db: AsyncSession, id: int) -> Optional[Document]:
+    """
+    Get a document by ID.
     
-    def __init__(self):
-        # Initialize file storage manager for file operations
-        self.file_storage = FileStorageManager()
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    id: Document ID
     
-    def get(self, db: Session, id: int) -> Optional[Document]:
-        """
-        Get a document by ID.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        id: Document ID
-        
-        Returns
-        -------
-        Optional[Document]
-            Document if found, None otherwise
-        """
-        return crud_document.get(db, id)
-    
-    def get_with_user(self, db: Session, id: int) -> Optional[Document]:
-        """
-        Get a document with user data.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        id: Document ID
-        
-        Returns
-        -------
-        Optional[Document]
-            Document with user data if found
-            
-        Raises
-        ------
-        NotFoundError
-            If document not found
-        """
-        document = crud_document.get_with_user(db, id)
-        if not document:
-            raise NotFoundError(detail="Document not found")
-        return document
-    
-    def create_document(
-        self, db: Session, *, obj_in: DocumentCreate, file_content: bytes = None
-    ) -> Document:
-        """
-        Create a new document with file upload.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        obj_in: Document creation data
-        file_content: File content bytes (optional)
-        
-        Returns
-        -------
-        Document
-            Created document instance
-            
-        Raises
-        ------
-        NotFoundError
-            If user not found
-        ValidationError
-            If file validation fails
-        """
-        # Check if user exists
-        user = crud_user.get(db, obj_in.user_id)
-        if not user:
-            raise NotFoundError(detail="User not found")
-        
-        # Validate file if provided
-        if file_content:
-            # Check file size
-            if obj_in.file_size and obj_in.file_size > 10 * 1024 * 1024:  # 10MB limit
-                raise ValidationError(detail="File size exceeds 10MB limit")
-            
-            # Store file and get path
-            file_path = self.file_storage.store_file(
-                file_content=file_content,
-                filename=obj_in.file_name,
-                user_id=obj_in.user_id
-            )
-            obj_in.file_path = file_path
-        
-        # Create document
-        return crud_document.create(db, obj_in=obj_in)
-    
-    def update_document(
-        self, db: Session, *, id: int, obj_in: DocumentUpdate
-    ) -> Document:
-        """
-        Update a document.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        id: Document ID
-        obj_in: Update data
-        
-        Returns
-        -------
-        Document
-            Updated document instance
-            
-        Raises
-        ------
-        NotFoundError
-            If document not found
-        """
-        document = crud_document.get(db, id)
-        if not document:
-            raise NotFoundError(detail="Document not found")
-        
-        return crud_document.update(db, db_obj=document, obj_in=obj_in)
+    Returns
+    -------
+    Optional[Document]
+        Document if found, None otherwise
+    """
+    return await db.get(Document, id)
+
+
+async def get_with_user(db: AsyncSession, id: int) -> Optional[Document]:
+    """
+    Get a document with user data.
     
-    def delete_document(self, db: Session, *, id: int) -> Document:
-        """
-        Delete a document and its file.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        id: Document ID
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    id: Document ID
+    
+    Returns
+    -------
+    Optional[Document]
+        Document with user data if found
         
-        Returns
-        -------
-        Document
-            Deleted document instance
-            
-        Raises
-        ------
-        NotFoundError
-            If document not found
-        """
-        document = crud_document.get(db, id)
-        if not document:
-            raise NotFoundError(detail="Document not found")
+    Raises
+    ------
+    NotFoundError
+        If document not found
+    """
+    # The owner is loaded in the same query; async sessions cannot lazy-load
+    result = await db.execute(
+        select(Document).options(joinedload(Document.user)).where(Document.id == id)
+    )
+    document = result.scalar_one_or_none()
+    if not document:
+        raise NotFoundError(detail="Document not found")
+    return document
+
+
+async def get_version(db: AsyncSession, id: int) -> Optional[Tuple[Any, ...]]:
+    """
+    Get the owner and the values that version a document with its user.
+    
+    Cheap enough to run before get_with_user, so permission checks and
+    304 Not Modified answers don't need the full document.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    id: Document ID
+    
+    Returns
+    -------
+    Optional[Tuple[Any, ...]]
+        Owner ID, document update time and owner update time,
+        or None if the document does not exist
+    """
+    query = (
+        select(Document.user_id, Document.updated_at, User.updated_at)
+        .join(User, Document.user_id == User.id)
+        .where(Document.id == id)
+    )
+    row = (await db.execute(query)).first()
+    return tuple(row) if row is not None else None
+
+
+async def get_filtered_documents(
+    db: AsyncSession, *, skip: int = 0, limit: int = 100, **filters
+) -> List[Document]:
+    """
+    Get documents matching the given filters with pagination.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    skip: Number of records to skip (for pagination)
+    limit: Maximum number of records to return
+    **filters: Field name/value pairs to filter by (e.g. user_id, document_type),
+        plus an optional "search" term matched against file name and description
+    
+    Returns
+    -------
+    List[Document]
+        List of matching documents
+    """
+    query = _filtered_query(**filters)
+    result = await db.execute(query.order_by(Document.id).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+
+async def count_filtered_documents(db: AsyncSession, **filters) -> int:
+    """
+    Count documents matching the given filters.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    **filters: Same filters accepted by get_filtered_documents
+    
+    Returns
+    -------
+    int
+        Total number of matching documents, ignoring pagination
+    """
+    query = select(func.count()).select_from(_filtered_query(**filters).subquery())
+    return (await db.execute(query)).scalar_one()
+
+
+def _filtered_query(*, search: Optional[str] = None, **filters) -> Select:
+    """Build the SELECT for a set of document filters so the database does the filtering."""
+    query = select(Document)
+    for key, value in filters.items():
+        if hasattr(Document, key):
+            query = query.where(getattr(Document, key) == value)
+    if search:
+        pattern = f"%{search}%"
+        query = query.where(or_(Document.file_name.ilike(pattern), Document.description.ilike(pattern)))
+    return query
+
+
+async def get_for_requester(
+    db: AsyncSession, id: int, *, requester: Any, action: str = "access", for_update: bool = False
+) -> Document:
+    """
+    Fetch a document and check the requester may act on it, in one query.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    id: Document ID
+    requester: Authenticated user (admins may act on any document)
+    action: Verb used in the permission error (e.g. "update")
+    for_update: Lock the row (SELECT ... FOR UPDATE) until the transaction ends
+    
+    Returns
+    -------
+    Document
+        Document the requester may act on
         
-        # Delete physical file if it exists
-        if document.file_path:
-            self.file_storage.delete_file(document.file_path)
+    Raises
+    ------
+    NotFoundError
+        If document not found
+    PermissionDeniedError
+        If the requester is neither an admin nor the document owner
+    """
+    query = select(Document).where(Document.id == id)
+    if for_update:
+        query = query.with_for_update()
+    document = (await db.execute(query)).scalar_one_or_none()
+    if not document:
+        raise NotFoundError(detail="Document not found")
+    if requester.role != "admin" and document.user_id != requester.id:
+        raise PermissionDeniedError(detail=f"Not authorized to {action} this document")
+    return document
+
+
+async def get_document_file(db: AsyncSession, *, id: int, requester: Any) -> Dict[str, Any]:
+    """
+    Get the stored file information for a document.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    id: Document ID
+    requester: Authenticated user downloading the file
+    
+    Returns
+    -------
+    Dict[str, Any]
+        File path, original file name and file type
         
-        # Delete document record
-        return crud_document.remove(db, id=id)
-    
-    def get_user_documents(
-        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
-    ) -> List[Document]:
-        """
-        Get all documents for a user.
+    Raises
+    ------
+    NotFoundError
+        If document or its file is not found
+    PermissionDeniedError
+        If the requester may not download the document
+    """
+    document = await get_for_requester(db, id, requester=requester, action="download")
+    if not await aiofiles.os.path.exists(document.file_path):
+        raise NotFoundError(detail="Document file not found")
+    
+    return {
+        "file_path": document.file_path,
+        "file_name": document.file_name,
+        "file_type": document.file_type,
+    }
+
+
+async def upload_document(
+    db: AsyncSession,
+    *,
+    file: UploadFile,
+    document_type: DocumentType,
+    user_id: int,
+    description: Optional[str] = None,
+) -> Document:
+    """
+    Store an uploaded file and create its document record.
+    
+    The upload is copied to its final location in chunks while its size
+    and SHA-256 digest are computed, so the file is written once and
+    never held in memory as a whole.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    file: Uploaded file
+    document_type: Document classification
+    user_id: Owner of the document
+    description: Optional document description
+    
+    Returns
+    -------
+    Document
+        Created document instance
         
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        user_id: User ID
-        skip: Number of records to skip (for pagination)
-        limit: Maximum number of records to return
+    Raises
+    ------
+    ValidationError
+        If the file exceeds the maximum upload size
+    """
+    user_dir = os.path.join(settings.UPLOAD_DIR, str(user_id))
+    await aiofiles.os.makedirs(user_dir, exist_ok=True)
+    extension = os.path.splitext(file.filename or "")[1]
+    file_path = os.path.join(user_dir, f"{uuid.uuid4().hex}{extension}")
+    
+    digest = hashlib.sha256()
+    file_size = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > settings.MAX_UPLOAD_SIZE:
+                    raise ValidationError(
+                        detail=f"File size exceeds {settings.MAX_UPLOAD_SIZE} byte limit"
+                    )
+                digest.update(chunk)
+                await out.write(chunk)
         
-        Returns
-        -------
-        List[Document]
-            List of user documents
-        """
-        return crud_document.get_by_user(db, user_id=user_id, skip=skip, limit=limit)
-    
-    def get_documents_by_type(
-        self, db: Session, *, document_type: DocumentType, skip: int = 0, limit: int = 100
-    ) -> List[Document]:
-        """
-        Get documents by type.
+        document = Document(
+            user_id=user_id,
+            document_type=document_type,
+            description=description,
+            file_name=file.filename,
+            file_path=file_path,
+            file_type=extension.lstrip(".") or None,
+            file_size=file_size,
+            sha256=digest.hexdigest(),
+        )
+        db.add(document)
+        await db.commit()
+    except BaseException:
+        # Don't leave partial files, or files no record points to, behind
+        if await aiofiles.os.path.exists(file_path):
+            await aiofiles.os.remove(file_path)
+        raise
+    
+    await db.refresh(document)
+    return document
+
+
+def create_document(
+    db: Session, *, obj_in: DocumentCreate, file_content: bytes = None
+) -> Document:
+    """
+    Create a new document with file upload.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    obj_in: Document creation data
+    file_content: File content bytes (optional)
+    
+    Returns
+    -------
+    Document
+        Created document instance
         
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        document_type: Document type to filter by
-        skip: Number of records to skip (for pagination)
-        limit: Maximum number of records to return
+    Raises
+    ------
+    NotFoundError
+        If user not found
+    ValidationError
+        If file validation fails
+    """
+    # Check if user exists
+    user = crud_user.get(db, obj_in.user_id)
+    if not user:
+        raise NotFoundError(detail="User not found")
+    
+    # Validate file if provided
+    if file_content:
+        # Check file size
+        if obj_in.file_size and obj_in.file_size > 10 * 1024 * 1024:  # 10MB limit
+            raise ValidationError(detail="File size exceeds 10MB limit")
         
-        Returns
-        -------
-        List[Document]
-            List of documents of the specified type
-        """
-        return crud_document.get_by_type(db, document_type=document_type, skip=skip, limit=limit)
-    
-    def get_document_stats(self, db: Session) -> Dict[str, Any]:
-        """
-        Get document statistics.
+        # Store file and get path
+        file_path = _file_storage.store_file(
+            file_content=file_content,
+            filename=obj_in.file_name,
+            user_id=obj_in.user_id
+        )
+        obj_in.file_path = file_path
+    
+    # Create document
+    return crud_document.create(db, obj_in=obj_in)
+
+
+async def update_document(
+    db: AsyncSession, *, id: int, obj_in: DocumentUpdate, requester: Any
+) -> Document:
+    """
+    Update a document.
+    
+    The row is locked from the permission check until the commit.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    id: Document ID
+    obj_in: Update data
+    requester: Authenticated user making the change
+    
+    Returns
+    -------
+    Document
+        Updated document instance
         
-        Parameters
-        ----------
-        db: SQLAlchemy session
+    Raises
+    ------
+    NotFoundError
+        If document not found
+    PermissionDeniedError
+        If the requester may not update the document
+    """
+    document = await get_for_requester(
+        db, id, requester=requester, action="update", for_update=True
+    )
+    
+    # Apply only the fields that were provided
+    for field, value in obj_in.dict(exclude_unset=True).items():
+        setattr(document, field, value)
+    await db.commit()
+    # Load the updated_at set by the database; async sessions cannot lazy-load it later
+    await db.refresh(document)
+    return document
+
+
+async def delete_document(db: AsyncSession, *, id: int, requester: Any) -> Document:
+    """
+    Delete a document and its file.
+    
+    The row is locked from the permission check until the commit. The file
+    is removed after the commit, so a failed commit leaves both in place.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    id: Document ID
+    requester: Authenticated user deleting the document
+    
+    Returns
+    -------
+    Document
+        Deleted document instance
         
-        Returns
-        -------
-        Dict[str, Any]
-            Document statistics by type and user
-        """
-        return crud_document.get_document_stats(db)
\ No newline at end of file
+    Raises
+    ------
+    NotFoundError
+        If document not found
+    PermissionDeniedError
+        If the requester may not delete the document
+    """
+    document = await get_for_requester(
+        db, id, requester=requester, action="delete", for_update=True
+    )
+    
+    # Delete document record; the row was fully loaded by the locking SELECT and
+    # isn't expired on commit, so the returned instance serializes without IO
+    await db.delete(document)
+    await db.commit()
+    
+    # Delete the physical file only once no record points at it; a file left
+    # behind is logged rather than failing a delete that already committed
+    if document.file_path:
+        try:
+            await aiofiles.os.remove(document.file_path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.exception("document_file_delete_failed", extra={"document_id": document.id})
+    return document
+
+
+def get_user_documents(
+    db: Session, *, user_id: int, skip: int = 0, limit: int = 100
+) -> List[Document]:
+    """
+    Get all documents for a user.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    user_id: User ID
+    skip: Number of records to skip (for pagination)
+    limit: Maximum number of records to return
+    
+    Returns
+    -------
+    List[Document]
+        List of user documents
+    """
+    return crud_document.get_by_user(db, user_id=user_id, skip=skip, limit=limit)
+
+
+def get_documents_by_type(
+    db: Session, *, document_type: DocumentType, skip: int = 0, limit: int = 100
+) -> List[Document]:
+    """
+    Get documents by type.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    document_type: Document type to filter by
+    skip: Number of records to skip (for pagination)
+    limit: Maximum number of records to return
+    
+    Returns
+    -------
+    List[Document]
+        List of documents of the specified type
+    """
+    return crud_document.get_by_type(db, document_type=document_type, skip=skip, limit=limit)
+
+
+def get_document_stats(db: Session) -> Dict[str, Any]:
+    """
+    Get document statistics.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    
+    Returns
+    -------
+    Dict[str, Any]
+        Document statistics by type and user
+    """
+    return crud_document.get_document_stats(db)
+
+
+class DocumentService:
+    """Service for document operations; kept for callers that use an instance."""
+    
+    get = staticmethod(get)
+    get_with_user = staticmethod(get_with_user)
+    get_version = staticmethod(get_version)
+    get_filtered_documents = staticmethod(get_filtered_documents)
+    count_filtered_documents = staticmethod(count_filtered_documents)
+    get_for_requester = staticmethod(get_for_requester)
+    get_document_file = staticmethod(get_document_file)
+    upload_document = staticmethod(upload_document)
+    create_document = staticmethod(create_document)
+    update_document = staticmethod(update_document)
+    delete_document = staticmethod(delete_document)
+    get_user_documents = staticmethod(get_user_documents)
+    get_documents_by_type = staticmethod(get_documents_by_type)
+    get_document_stats = staticmethod(get_document_stats)
@@ -70,10 +70,18 @@ This file handles business logic related to student enrollments in culinary
 courses, including enrollment processing, status management, and capacity tracking.
 """
 
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+from cachetools import TTLCache
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.sql.base import ExecutableOption
 
+from app.domain.models.course import Course
+from app.domain.models.user import User
 from app.domain.models.enrollment import Enrollment, EnrollmentStatus, PaymentStatus
+from app.domain.models.payment import Payment
 from app.domain.schemas.enrollment import EnrollmentCreate, EnrollmentUpdate
 from app.crud import enrollment as crud_enrollment
 from app.crud import course as crud_course
@@ -81,9 +89,20 @@ from app.crud import user as crud_user
 from app.core.exceptions import NotFoundError, ValidationError
 
 
+# Owners of recently checked enrollments: enrollment ID -> (student_id, instructor_id).
+# The owners of an enrollment rarely change, so repeated permission checks on
+# the same enrollment skip the query for up to a minute.
+_owner_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
+# Last computed enrollment statistics; dashboards polling within 30 seconds reuse them
+_stats_cache: TTLCache = TTLCache(maxsize=1, ttl=30)
+
+
 class EnrollmentService:
     """Service for enrollment operations using CRUD abstractions."""
     
+    __slots__ = ()
+    
     def get(self, db: Session, id: int) -> Optional[Enrollment]:
         """
         Get an enrollment by ID.
@@ -124,6 +143,186 @@ class EnrollmentService:
             raise NotFoundError(detail="Enrollment not found")
         return enrollment
     
+    def get_owner_tuple(
+        self, db: Session, id: int, *, use_cache: bool = True
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Get the owners of an enrollment without loading it.
+        
+        Selects only the student ID and the course's instructor ID, so
+        permission checks can run before the full enrollment is loaded.
+        Results are cached briefly per enrollment. The cache is per worker
+        and isn't cleared when a course changes instructor, so write paths
+        pass use_cache=False.
+        
+        Parameters
+        ----------
+        db: SQLAlchemy session
+        id: Enrollment ID
+        use_cache: Answer from (and refresh) the owner cache
+        
+        Returns
+        -------
+        Tuple[int, Optional[int]]
+            (student_id, instructor_id) of the enrollment
+            
+        Raises
+        ------
+        NotFoundError
+            If enrollment not found
+        """
+        if use_cache:
+            cached = _owner_cache.get(id)
+            if cached is not None:
+                return cached
+        
+        owners = db.execute(
+            select(Enrollment.student_id, Course.instructor_id)
+            .join(Course, Course.id == Enrollment.course_id)
+            .where(Enrollment.id == id)
+        ).first()
+        if owners is None:
+            raise NotFoundError(detail="Enrollment not found")
+        _owner_cache[id] = cached = (owners.student_id, owners.instructor_id)
+        return cached
+    
+    def get_last_modified(self, db: Session, id: int) -> Optional[datetime]:
+        """
+        Get when an enrollment or any record in its details last changed.
+        
+        Covers everything EnrollmentWithDetails serializes: the enrollment,
+        its student, its course and its payments. Selects only timestamps,
+        so conditional requests can be answered without loading the
+        enrollment and its relations.
+        
+        Parameters
+        ----------
+        db: SQLAlchemy session
+        id: Enrollment ID
+        
+        Returns
+        -------
+        Optional[datetime]
+            Latest modification time, or None if the enrollment doesn't exist
+            or has no timestamp yet
+        """
+        payments_modified = (
+            select(func.max(Payment.updated_at))
+            .where(Payment.enrollment_id == Enrollment.id)
+            .scalar_subquery()
+        )
+        row = db.execute(
+            select(Enrollment.updated_at, User.updated_at, Course.updated_at, payments_modified)
+            .join(User, User.id == Enrollment.student_id)
+            .join(Course, Course.id == Enrollment.course_id)
+            .where(Enrollment.id == id)
+        ).first()
+        if row is None:
+            return None
+        timestamps = [ts for ts in row if ts is not None]
+        return max(timestamps) if timestamps else None
+    
+    def invalidate_owner_cache(self, id: int) -> None:
+        """Drop the cached owners of an enrollment after it is modified."""
+        _owner_cache.pop(id, None)
+    
+    def get_filtered_enrollments(
+        self,
+        db: Session,
+        *,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        load_options: Sequence[ExecutableOption] = (),
+        **filters,
+    ) -> List[Enrollment]:
+        """
+        Get enrollments matching the given filters with keyset pagination.
+        
+        Results are ordered by ID; passing the last ID of a page as after_id
+        returns the next page through the primary key index, so deep pages
+        cost the same as the first.
+        
+        Parameters
+        ----------
+        db: SQLAlchemy session
+        after_id: Return only enrollments with a greater ID (None for the first page)
+        limit: Maximum number of records to return
+        load_options: Loader options (e.g. selectinload) for relationships the
+            caller will touch, so they are fetched in bulk rather than per row
+        **filters: Field name/value pairs to filter by (e.g. status, student_id).
+            A SQL expression value (e.g. a SELECT of course IDs) is applied as
+            field IN (subquery); other values are compared for equality
+        
+        Returns
+        -------
+        List[Enrollment]
+            List of matching enrollments
+        """
+        return self._paginate(db, select(Enrollment), after_id, limit, load_options, filters)
+    
+    def get_filtered_enrollments_for_instructor(
+        self,
+        db: Session,
+        *,
+        instructor_id: int,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        load_options: Sequence[ExecutableOption] = (),
+        **filters,
+    ) -> List[Enrollment]:
+        """
+        Get enrollments in an instructor's courses matching the given filters.
+        
+        The instructor scope is applied with a JOIN on courses in the same
+        statement, so the courses(instructor_id) index drives the lookup.
+        
+        Parameters
+        ----------
+        db: SQLAlchemy session
+        instructor_id: Instructor whose courses' enrollments are returned
+        after_id: Return only enrollments with a greater ID (None for the first page)
+        limit: Maximum number of records to return
+        load_options: Loader options for relationships the caller will touch
+        **filters: Field name/value pairs to filter by, as in get_filtered_enrollments
+        
+        Returns
+        -------
+        List[Enrollment]
+            List of matching enrollments
+        """
+        query = (
+            select(Enrollment)
+            .join(Course, Course.id == Enrollment.course_id)
+            .where(Course.instructor_id == instructor_id)
+        )
+        return self._paginate(db, query, after_id, limit, load_options, filters)
+    
+    def _paginate(
+        self,
+        db: Session,
+        query: Select,
+        after_id: Optional[int],
+        limit: int,
+        load_options: Sequence[ExecutableOption],
+        filters: Dict[str, Any],
+    ) -> List[Enrollment]:
+        """Apply filters and keyset pagination to an enrollment query and run it."""
+        for key, value in filters.items():
+            if not hasattr(Enrollment, key):
+                continue
+            column = getattr(Enrollment, key)
+            if isinstance(value, ClauseElement):
+                # Subqueries stay in SQL, so the statement text doesn't vary with the number of IDs
+                query = query.where(column.in_(value))
+            else:
+                query = query.where(column == value)
+        if after_id is not None:
+            query = query.where(Enrollment.id > after_id)
+        if load_options:
+            query = query.options(*load_options)
+        query = query.order_by(Enrollment.id).limit(limit)
+        return list(db.execute(query).scalars().all())
+    
     def create_enrollment(self, db: Session, *, obj_in: EnrollmentCreate) -> Enrollment:
         """
         Create a new enrollment with validation.
@@ -183,7 +382,7 @@ class EnrollmentService:
         return enrollment
     
     def update_enrollment(
-        self, db: Session, *, id: int, obj_in: EnrollmentUpdate
+        self, db: Session, *, db_obj: Enrollment, obj_in: EnrollmentUpdate
     ) -> Enrollment:
         """
         Update an enrollment.
@@ -191,24 +390,17 @@ class EnrollmentService:
         Parameters
         ----------
         db: SQLAlchemy session
-        id: Enrollment ID
+        db_obj: Enrollment instance already loaded by the caller
         obj_in: Update data
         
         Returns
         -------
         Enrollment
             Updated enrollment instance
-            
-        Raises
-        ------
-        NotFoundError
-            If enrollment not found
         """
-        enrollment = crud_enrollment.get(db, id)
-        if not enrollment:
-            raise NotFoundError(detail="Enrollment not found")
-        
-        return crud_enrollment.update(db, db_obj=enrollment, obj_in=obj_in)
+        enrollment = crud_enrollment.update(db, db_obj=db_obj, obj_in=obj_in)
+        self.invalidate_owner_cache(enrollment.id)
+        return enrollment
     
     def approve_enrollment(self, db: Session, *, id: int) -> Enrollment:
         """
@@ -439,5 +631,9 @@ class EnrollmentService:
         -------
         Dict[str, Any]
             Enrollment statistics by status and payment status
+            (computed at most every 30 seconds)
         """
-        return crud_enrollment.get_enrollment_stats(db)
\ No newline at end of file
+        stats = _stats_cache.get("stats")
+        if stats is None:
+            stats = _stats_cache["stats"] = crud_enrollment.get_enrollment_stats(db)
+        return stats
\ No newline at end of file
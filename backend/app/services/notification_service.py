@@ -8,36 +8,82 @@ the email service.
 """
 notification_service.py - Service layer for notification management
 This file handles business logic related to user notifications, including
-sending, updating, filtering, and email dispatch features. It provides 
-an abstraction over the notification CRUD and integrates with 
+sending, updating, filtering, and email dispatch features. Request handlers
+use the async methods with an AsyncSession; background tasks and other sync
+callers create notifications through the blocking ones. It integrates with
 the email service.
 """
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from collections import Counter
+from typing import AsyncIterator, List, Optional, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import Session, joinedload
 
 from app.domain.models.notification import Notification, NotificationType
+from app.domain.models.user import User
 from app.domain.schemas.notification import NotificationCreate, NotificationUpdate
-from app.crud import notification as crud_notification
-from app.crud import user as crud_user
+from app.core.cache import (
+    adjust_cached_unread_count, adjust_cached_unread_count_sync, cache_unread_count,
+    get_cached_unread_count, invalidate_unread_count,
+)
 from app.core.exceptions import NotFoundError
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.services.email_service import EmailService
 
 
+# Rows fetched per round-trip when streaming notifications
+_STREAM_BATCH_SIZE = 500
+
+
+def _user_notifications_query(
+    query: Select,
+    user_id: int,
+    *,
+    is_read: Optional[bool] = None,
+    notification_type: Optional[NotificationType] = None,
+) -> Select:
+    """
+    Restrict a notification SELECT to one user and the optional list filters.
+
+    Filter values are always bound parameters, and the few filter
+    combinations each compile to one fixed statement. SQLAlchemy's compiled
+    cache and asyncpg's prepared statement cache are reused across requests,
+    and each shape keeps a plan that can use the matching index.
+    """
+    query = query.where(Notification.user_id == user_id)
+    if is_read is not None:
+        query = query.where(Notification.is_read == is_read)
+    if notification_type is not None:
+        query = query.where(Notification.notification_type == notification_type)
+    return query
+
+
 class NotificationService:
-    """Service for notification operations using CRUD abstractions."""
+    """
+    Service for notification operations.
+    
+    Counts never come from loading rows: totals are a SELECT COUNT(*) on an
+    indexed predicate, and bulk UPDATE/DELETE methods report the statement's
+    rowcount.
+    """
+    
+    __slots__ = ("email_service",)
     
     def __init__(self):
         # Create an instance of email service for sending notification emails
         self.email_service = EmailService()
     
-    def get(self, db: Session, id: int) -> Optional[Notification]:
+    async def get(self, db: AsyncSession, id: int) -> Optional[Notification]:
         """
         Get a notification by ID.
         
         Parameters
         ----------
-        db: SQLAlchemy session
+        db: Async SQLAlchemy session
         id: Notification ID
         
         Returns
@@ -45,38 +91,127 @@ class NotificationService:
         Optional[Notification]
             Notification if found, None otherwise
         """
-        return crud_notification.get(db, id)
+        return await db.get(Notification, id)
     
-    def get_with_user(self, db: Session, id: int) -> Optional[Notification]:
+    async def get_with_user(self, db: AsyncSession, id: int, *, requester: Any) -> Notification:
         """
         Get a notification with user data.
         
         Parameters
         ----------
-        db: SQLAlchemy session
+        db: Async SQLAlchemy session
         id: Notification ID
+        requester: Authenticated user (admins may read any notification)
         
         Returns
         -------
-        Optional[Notification]
-            Notification with user data if found
+        Notification
+            Notification with its user loaded
             
         Raises
         ------
         NotFoundError
-            If notification not found
+            If notification not found or not accessible to the requester
         """
-        notification = crud_notification.get_with_user(db, id)
+        # Many-to-one, so a JOIN returns the notification and its user in one query
+        notification = (await db.execute(
+            select(Notification)
+            .options(joinedload(Notification.user))
+            .where(Notification.id == id, Notification.accessible_by(requester))
+        )).scalar_one_or_none()
         if not notification:
             raise NotFoundError(detail="Notification not found")
         return notification
     
+    async def create(self, db: AsyncSession, *, obj_in: NotificationCreate) -> Notification:
+        """
+        Create a new notification.
+        
+        Emailing is left to the caller, which schedules send_emails() so the
+        request does not wait on SMTP.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        obj_in: Notification creation data
+        
+        Returns
+        -------
+        Notification
+            Created notification instance
+        """
+        notification = Notification(**obj_in.dict())
+        db.add(notification)
+        await db.commit()
+        if not notification.is_read:
+            await adjust_cached_unread_count(notification.user_id, 1)
+        return notification
+    
+    async def create_many(
+        self, db: AsyncSession, objs_in: List[NotificationCreate]
+    ) -> List[Notification]:
+        """
+        Create several notifications with a single multi-row INSERT.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        objs_in: Notification creation data, one entry per notification
+        
+        Returns
+        -------
+        List[Notification]
+            Created notifications, in input order
+        """
+        if not objs_in:
+            return []
+        notifications = list(await db.scalars(
+            insert(Notification).returning(Notification, sort_by_parameter_order=True),
+            [obj_in.dict() for obj_in in objs_in],
+        ))
+        await db.commit()
+        
+        unread_per_user = Counter(n.user_id for n in notifications if not n.is_read)
+        for user_id, count in unread_per_user.items():
+            await adjust_cached_unread_count(user_id, count)
+        return notifications
+    
+    async def send_emails(self, notification_ids: List[int]) -> None:
+        """
+        Email notifications to their recipients.
+        
+        Runs after the response has been sent, so it opens its own session
+        instead of using the request's.
+        
+        Parameters
+        ----------
+        notification_ids: IDs of the notifications to email
+        """
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(User.email, Notification.title, Notification.message)
+                .join(User, User.id == Notification.user_id)
+                .where(Notification.id.in_(notification_ids))
+            )).all()
+        
+        for email, title, message in rows:
+            if email:
+                await run_in_threadpool(
+                    self.email_service.send_notification_email,
+                    email_to=email,
+                    subject=title,
+                    body=message,
+                )
+    
     def create_notification(
         self, db: Session, *, obj_in: NotificationCreate, send_email: bool = False
     ) -> Notification:
         """
         Create a new notification with optional email.
         
+        Blocking variant used by background tasks and sync endpoints; request
+        handlers on an async session use create().
+        
         Parameters
         ----------
         db: SQLAlchemy session
@@ -88,27 +223,41 @@ class NotificationService:
         Notification
             Created notification instance
         """
-        # Create notification in database using CRUD
-        notification = crud_notification.create(db, obj_in=obj_in)
+        # Single INSERT ... RETURNING; the input is used afterwards so the
+        # instance expired by the commit is not reloaded
+        notification = db.scalar(
+            insert(Notification).values(**obj_in.dict()).returning(Notification)
+        )
+        db.commit()
+        if not obj_in.is_read:
+            adjust_cached_unread_count_sync(obj_in.user_id, 1)
         
         # Send email if requested and user has email
-        if send_email and notification.user.email:
-            self.email_service.send_notification_email(
-                email_to=notification.user.email,
-                subject=notification.title,
-                body=notification.message
-            )
+        if send_email:
+            email = db.scalar(select(User.email).where(User.id == obj_in.user_id))
+            if email:
+                self.email_service.send_notification_email(
+                    email_to=email,
+                    subject=obj_in.title,
+                    body=obj_in.message
+                )
         
         return notification
     
-    def mark_as_read(self, db: Session, *, id: int) -> Notification:
+    async def mark_as_read(self, db: AsyncSession, *, id: int, requester: Any) -> Notification:
         """
-        Mark a notification as read.
+        Mark a notification as read if the requester may update it.
+        
+        The access check is part of the UPDATE's WHERE clause, so the common
+        case (an unread notification of the requester) is a single
+        statement. Only when no row changes is the notification looked up
+        to tell an already-read notification from a 404.
         
         Parameters
         ----------
-        db: SQLAlchemy session
+        db: Async SQLAlchemy session
         id: Notification ID
+        requester: Authenticated user (admins may update any notification)
         
         Returns
         -------
@@ -118,20 +267,33 @@ class NotificationService:
         Raises
         ------
         NotFoundError
-            If notification not found
+            If notification not found or not accessible to the requester
         """
-        notification = crud_notification.get(db, id)
-        if not notification:
+        accessible = (Notification.id == id, Notification.accessible_by(requester))
+        notification = (await db.execute(
+            update(Notification)
+            .where(*accessible, Notification.is_read.is_(False))
+            .values(is_read=True)
+            .returning(Notification)
+        )).scalar_one_or_none()
+        await db.commit()
+        if notification is not None:
+            await adjust_cached_unread_count(notification.user_id, -1)
+            return notification
+        
+        # Nothing changed: already read, or missing / not the requester's
+        notification = await db.scalar(select(Notification).where(*accessible))
+        if notification is None:
             raise NotFoundError(detail="Notification not found")
-        return crud_notification.mark_as_read(db, db_obj=notification)
+        return notification
     
-    def mark_all_as_read(self, db: Session, *, user_id: int) -> int:
+    async def mark_all_as_read(self, db: AsyncSession, *, user_id: int) -> int:
         """
         Mark all notifications for a user as read.
         
         Parameters
         ----------
-        db: SQLAlchemy session
+        db: Async SQLAlchemy session
         user_id: User ID
         
         Returns
@@ -139,7 +301,99 @@ class NotificationService:
         int
             Number of notifications marked as read
         """
-        return crud_notification.mark_all_as_read(db, user_id=user_id)
+        result = await db.execute(
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+            .values(is_read=True)
+        )
+        await db.commit()
+        await invalidate_unread_count(user_id)
+        return result.rowcount
+    
+    async def mark_as_read_by_type(
+        self, db: AsyncSession, *, user_id: int, notification_type: NotificationType
+    ) -> int:
+        """
+        Mark all of a user's notifications of one type as read.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        user_id: User ID
+        notification_type: Type of the notifications to mark
+        
+        Returns
+        -------
+        int
+            Number of notifications marked as read
+        """
+        result = await db.execute(
+            update(Notification)
+            .where(
+                Notification.user_id == user_id,
+                Notification.notification_type == notification_type,
+                Notification.is_read.is_(False),
+            )
+            .values(is_read=True)
+        )
+        await db.commit()
+        if result.rowcount:
+            await adjust_cached_unread_count(user_id, -result.rowcount)
+        return result.rowcount
+    
+    async def remove(self, db: AsyncSession, *, id: int, requester: Any) -> Notification:
+        """
+        Delete a notification if the requester may delete it.
+        
+        The access check is part of the DELETE's WHERE clause, so every
+        call is a single statement.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        id: Notification ID
+        requester: Authenticated user (admins may delete any notification)
+        
+        Returns
+        -------
+        Notification
+            The deleted notification
+            
+        Raises
+        ------
+        NotFoundError
+            If notification not found or not accessible to the requester
+        """
+        notification = (await db.execute(
+            delete(Notification)
+            .where(Notification.id == id, Notification.accessible_by(requester))
+            .returning(Notification)
+        )).scalar_one_or_none()
+        await db.commit()
+        if notification is None:
+            raise NotFoundError(detail="Notification not found")
+        if not notification.is_read:
+            await adjust_cached_unread_count(notification.user_id, -1)
+        return notification
+    
+    async def delete_all_for_user(self, db: AsyncSession, *, user_id: int) -> int:
+        """
+        Delete all notifications for a user with a single DELETE.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        user_id: User ID
+        
+        Returns
+        -------
+        int
+            Number of notifications deleted
+        """
+        result = await db.execute(delete(Notification).where(Notification.user_id == user_id))
+        await db.commit()
+        await invalidate_unread_count(user_id)
+        return result.rowcount
     
     def get_user_notifications(
         self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100, unread_only: bool = False
@@ -160,17 +414,22 @@ class NotificationService:
         List[Notification]
             List of user notifications
         """
+        query = db.query(Notification).filter(Notification.user_id == user_id)
         if unread_only:
-            return crud_notification.get_unread_by_user(db, user_id=user_id, skip=skip, limit=limit)
-        return crud_notification.get_by_user(db, user_id=user_id, skip=skip, limit=limit)
+            query = query.filter(Notification.is_read.is_(False))
+        return query.order_by(Notification.id.desc()).offset(skip).limit(limit).all()
     
-    def count_unread(self, db: Session, *, user_id: int) -> int:
+    async def count_unread(self, db: AsyncSession, *, user_id: int) -> int:
         """
         Count unread notifications for a user.
         
+        The count is cached per user and kept current by the methods that
+        create, read or delete notifications, so repeated calls (e.g. badge
+        polling) don't run a COUNT query.
+        
         Parameters
         ----------
-        db: SQLAlchemy session
+        db: Async SQLAlchemy session
         user_id: User ID
         
         Returns
@@ -178,27 +437,122 @@ class NotificationService:
         int
             Number of unread notifications
         """
-        return crud_notification.count_unread_by_user(db, user_id=user_id)
+        count = await get_cached_unread_count(user_id)
+        if count is None:
+            count = await db.scalar(
+                select(func.count())
+                .select_from(Notification)
+                .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+            )
+            await cache_unread_count(user_id, count)
+        return count
     
-    def get_filtered_notifications(
-        self, db: Session, *, skip: int = 0, limit: int = 100, **filters
+    async def get_filtered_notifications(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        is_read: Optional[bool] = None,
+        notification_type: Optional[NotificationType] = None,
     ) -> List[Notification]:
         """
-        Get notifications with filtering.
+        Get a user's notifications with filtering, by offset.
         
         Parameters
         ----------
-        db: SQLAlchemy session
+        db: Async SQLAlchemy session
+        user_id: User ID
         skip: Number of records to skip (for pagination)
         limit: Maximum number of records to return
-        **filters: Additional filters to apply
+        is_read: Filter by read status
+        notification_type: Filter by notification type
+        
+        Returns
+        -------
+        List[Notification]
+            List of filtered notifications, newest first
+        """
+        query = _user_notifications_query(
+            select(Notification), user_id, is_read=is_read, notification_type=notification_type
+        )
+        query = query.order_by(Notification.id.desc()).offset(skip).limit(limit)
+        return list((await db.execute(query)).scalars().all())
+    
+    async def get_notifications_keyset(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        before_id: Optional[int] = None,
+        limit: int = 100,
+        is_read: Optional[bool] = None,
+        notification_type: Optional[NotificationType] = None,
+    ) -> List[Notification]:
+        """
+        Get a page of a user's notifications, newest first.
+        
+        Pages are delimited by ID rather than offset: passing the last ID of
+        a page as before_id returns the next one as an index range scan, so
+        deep pages cost the same as the first.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        user_id: User ID
+        before_id: Return only notifications with a smaller ID (None for the first page)
+        limit: Maximum number of records to return
+        is_read: Filter by read status
+        notification_type: Filter by notification type
         
         Returns
         -------
         List[Notification]
-            List of filtered notifications
+            Notifications ordered by descending ID
+        """
+        query = _user_notifications_query(
+            select(Notification), user_id, is_read=is_read, notification_type=notification_type
+        )
+        if before_id is not None:
+            query = query.where(Notification.id < before_id)
+        query = query.order_by(Notification.id.desc()).limit(limit)
+        return list((await db.execute(query)).scalars().all())
+    
+    async def stream_notifications(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        is_read: Optional[bool] = None,
+        notification_type: Optional[NotificationType] = None,
+    ) -> AsyncIterator[RowMapping]:
+        """
+        Stream all of a user's notifications, newest first.
+        
+        Rows are read from a server-side cursor in batches and yielded as
+        column mappings without building ORM objects, so memory stays flat
+        however many notifications the user has.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        user_id: User ID
+        is_read: Filter by read status
+        notification_type: Filter by notification type
+        
+        Returns
+        -------
+        AsyncIterator[RowMapping]
+            Notification columns keyed by name
         """
-        return crud_notification.get_multi_by_filters(db, skip=skip, limit=limit, **filters)
+        query = _user_notifications_query(
+            select(*Notification.__table__.columns), user_id,
+            is_read=is_read, notification_type=notification_type,
+        ).order_by(Notification.id.desc())
+        result = await db.stream(query.execution_options(yield_per=_STREAM_BATCH_SIZE))
+        async for row in result.mappings():
+            yield row
     
     def create_system_notification(
         self, db: Session, *, user_id: int, title: str, message: str,
@@ -232,4 +586,57 @@ class NotificationService:
             entity_type=entity_type,
             is_read=False
         )
-        return self.create_notification(db, obj_in=notification_data, send_email=send_email)
\ No newline at end of file
+        return self.create_notification(db, obj_in=notification_data, send_email=send_email)
+    
+    def create_system_notification_after_response(
+        self, *, user_id: int, title: str, message: str,
+        send_email: bool = False, entity_id: Optional[int] = None,
+        entity_type: Optional[str] = None
+    ) -> None:
+        """
+        Create a system notification from a background task.
+        
+        Runs after the response has been sent, when the request's session has
+        already been released, so it opens its own session.
+        
+        Parameters
+        ----------
+        user_id: User ID to notify
+        title: Notification title
+        message: Notification message
+        send_email: Whether to send email notification
+        entity_id: Related entity ID
+        entity_type: Related entity type
+        """
+        with SessionLocal.session_factory() as db:
+            self.create_system_notification(
+                db, user_id=user_id, title=title, message=message,
+                send_email=send_email, entity_id=entity_id, entity_type=entity_type
+            )
+    
+    def create_system_notifications_bulk(
+        self, db: Session, notifications: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Create several system notifications with a single INSERT.
+        
+        No emails are sent; callers that need one send it after the insert.
+        
+        Parameters
+        ----------
+        db: SQLAlchemy session
+        notifications: Dicts with user_id, title, message and optionally
+            entity_id and entity_type
+        """
+        if not notifications:
+            return
+        db.bulk_insert_mappings(
+            Notification,
+            [
+                {"notification_type": NotificationType.SYSTEM, "is_read": False, **notification}
+                for notification in notifications
+            ],
+        )
+        db.commit()
+        for user_id, added in Counter(n["user_id"] for n in notifications).items():
+            adjust_cached_unread_count_sync(user_id, added)
@@ -13,25 +13,73 @@ It provides an abstraction over the payment CRUD and manages the payment
 lifecycle while coordinating with the enrollment system.
 """
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql import Select
 from datetime import datetime
 import stripe
 
-from app.domain.models.payment import Payment, PaymentStatus
+from app.domain.models.course import Course
+from app.domain.models.enrollment import Enrollment
+from app.domain.models.payment import Payment, PaymentMethod, PaymentStatus, ProcessedWebhookEvent
+from app.domain.models.user import ROLE_MASK_ADMIN, ROLE_MASK_INSTRUCTOR
 from app.domain.schemas.payment import PaymentCreate, PaymentUpdate
 from app.crud import payment as crud_payment
 from app.crud import enrollment as crud_enrollment
+from app.core.cache import (
+    acquire_payment_stats_refresh,
+    cache_payment_stats,
+    get_cached_payment_stats,
+    invalidate_payment_stats,
+    release_payment_stats_refresh,
+)
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.config import settings
+from app.db.session import SessionLocal
 
 # Initialize Stripe API with the API key from settings
 stripe.api_key = settings.STRIPE_API_KEY
 
+# One HTTP client shared by every Stripe call in the worker, so connections to
+# the API are kept alive and reused instead of paying a TLS handshake per call
+stripe.default_http_client = stripe.http_client.RequestsClient()
+
+
+# Stripe webhook event types that change payment state; every other type is acknowledged and ignored
+HANDLED_WEBHOOK_EVENTS = frozenset({"payment_intent.succeeded"})
+
+# Rows fetched per round-trip when streaming payments
+_STREAM_BATCH_SIZE = 1000
+
+
+def _scope_to_viewer(query: Select, viewer: Any) -> Select:
+    """
+    Limit a payment SELECT to the payments a user may see.
+
+    Admins see every payment, instructors the payments for enrollments in
+    their courses and everyone else the payments for their own enrollments.
+    """
+    role_mask = viewer.role_mask
+    if role_mask & ROLE_MASK_ADMIN:
+        return query
+    query = query.join(Enrollment, Enrollment.id == Payment.enrollment_id)
+    if role_mask & ROLE_MASK_INSTRUCTOR:
+        return query.join(Course, Course.id == Enrollment.course_id).where(
+            Course.instructor_id == viewer.id
+        )
+    return query.where(Enrollment.student_id == viewer.id)
+
 
 class PaymentService:
     """Service for payment operations using CRUD abstractions."""
     
+    __slots__ = ()
+    
     def get(self, db: Session, id: int) -> Optional[Payment]:
         """
         Get a payment by ID.
@@ -72,6 +120,171 @@ class PaymentService:
             raise NotFoundError(detail="Payment not found")
         return payment
     
+    def get_for_viewer(self, db: Session, id: int, *, viewer: Any) -> Payment:
+        """
+        Get a payment if the user may see it.
+        
+        The access check is part of the query, so a payment outside the
+        user's scope is reported exactly like a missing one.
+        
+        Parameters
+        ----------
+        db: SQLAlchemy session
+        id: Payment ID
+        viewer: Authenticated user
+        
+        Returns
+        -------
+        Payment
+            Payment instance
+            
+        Raises
+        ------
+        NotFoundError
+            If payment not found or not visible to the user
+        """
+        payment = db.execute(
+            _scope_to_viewer(select(Payment), viewer).where(Payment.id == id)
+        ).scalar_one_or_none()
+        if not payment:
+            raise NotFoundError(detail="Payment not found")
+        return payment
+    
+    async def get_with_enrollment(self, db: AsyncSession, id: int, *, viewer: Any) -> Payment:
+        """
+        Get a payment with its enrollment and course if the user may see it.
+        
+        The access check is part of the query, so a payment outside the
+        user's scope is reported exactly like a missing one.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        id: Payment ID
+        viewer: Authenticated user
+        
+        Returns
+        -------
+        Payment
+            Payment with enrollment and course loaded
+            
+        Raises
+        ------
+        NotFoundError
+            If payment not found or not visible to the user
+        """
+        payment = (await db.execute(
+            _scope_to_viewer(select(Payment), viewer)
+            .options(joinedload(Payment.enrollment).joinedload(Enrollment.course))
+            .where(Payment.id == id)
+        )).scalar_one_or_none()
+        if not payment:
+            raise NotFoundError(detail="Payment not found")
+        return payment
+    
+    async def get_filtered_payments(
+        self,
+        db: AsyncSession,
+        *,
+        viewer: Any,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[PaymentStatus] = None,
+        payment_method: Optional[PaymentMethod] = None,
+        enrollment_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Payment]:
+        """
+        Get the payments a user may see, filtered and paginated in SQL.
+        
+        The role scope, filters and pagination are all part of one statement. Results are ordered by ID; passing the last ID of a
+        page as after_id returns the next page without an OFFSET scan.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        viewer: Authenticated user the results are scoped to
+        after_id: Return only payments with a greater ID (None for the first page)
+        skip: Number of records to skip (deprecated offset pagination)
+        limit: Maximum number of records to return
+        status: Filter by payment status
+        payment_method: Filter by payment method
+        enrollment_id: Filter by enrollment
+        start_date: Only payments made at or after this time
+        end_date: Only payments made at or before this time
+        
+        Returns
+        -------
+        List[Payment]
+            Matching payments ordered by ID
+        """
+        query = _scope_to_viewer(select(Payment), viewer)
+        if status is not None:
+            query = query.where(Payment.status == status)
+        if payment_method is not None:
+            query = query.where(Payment.payment_method == payment_method)
+        if enrollment_id is not None:
+            query = query.where(Payment.enrollment_id == enrollment_id)
+        if start_date is not None:
+            query = query.where(Payment.payment_date >= start_date)
+        if end_date is not None:
+            query = query.where(Payment.payment_date <= end_date)
+        
+        if after_id is not None:
+            query = query.where(Payment.id > after_id)
+        if skip:
+            query = query.offset(skip)
+        query = query.order_by(Payment.id).limit(limit)
+        return list((await db.execute(query)).scalars().all())
+    
+    async def stream_payments(
+        self,
+        db: AsyncSession,
+        *,
+        viewer: Any,
+        status: Optional[PaymentStatus] = None,
+        payment_method: Optional[PaymentMethod] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> AsyncIterator[RowMapping]:
+        """
+        Stream every payment a user may see, ordered by ID.
+        
+        Rows are read from a server-side cursor in batches and yielded as
+        column mappings without building ORM objects, so memory stays flat
+        however many payments match.
+        
+        Parameters
+        ----------
+        db: Async SQLAlchemy session
+        viewer: Authenticated user the results are scoped to
+        status: Filter by payment status
+        payment_method: Filter by payment method
+        start_date: Only payments made at or after this time
+        end_date: Only payments made at or before this time
+        
+        Returns
+        -------
+        AsyncIterator[RowMapping]
+            Payment columns keyed by name
+        """
+        query = _scope_to_viewer(select(*Payment.__table__.columns), viewer)
+        if status is not None:
+            query = query.where(Payment.status == status)
+        if payment_method is not None:
+            query = query.where(Payment.payment_method == payment_method)
+        if start_date is not None:
+            query = query.where(Payment.payment_date >= start_date)
+        if end_date is not None:
+            query = query.where(Payment.payment_date <= end_date)
+        query = query.order_by(Payment.id).execution_options(yield_per=_STREAM_BATCH_SIZE)
+        
+        result = await db.stream(query)
+        async for row in result.mappings():
+            yield row
+    
     def create_payment(self, db: Session, *, obj_in: PaymentCreate) -> Payment:
         """
         Create a new payment.
@@ -97,7 +310,9 @@ class PaymentService:
             raise NotFoundError(detail="Enrollment not found")
         
         # Create payment
-        return crud_payment.create(db, obj_in=obj_in)
+        payment = crud_payment.create(db, obj_in=obj_in)
+        invalidate_payment_stats()
+        return payment
     
     async def create_payment_intent(
         self, db: Session, *, payment_id: int, amount: float, currency: str = "usd"
@@ -124,7 +339,8 @@ class PaymentService:
         ValidationError
             If Stripe operation fails
         """
-        payment = crud_payment.get(db, payment_id)
+        # The session is synchronous, so its queries run in the threadpool like the Stripe call
+        payment = await run_in_threadpool(crud_payment.get, db, payment_id)
         if not payment:
             raise NotFoundError(detail="Payment not found")
         
@@ -133,7 +349,9 @@ class PaymentService:
             amount_cents = int(amount * 100)
             
             # Create a PaymentIntent with the order amount and currency
-            intent = await stripe.PaymentIntent.create(
+            # (the Stripe SDK blocks, so it runs in the threadpool)
+            intent = await run_in_threadpool(
+                stripe.PaymentIntent.create,
                 amount=amount_cents,
                 currency=currency,
                 metadata={
@@ -143,10 +361,8 @@ class PaymentService:
             )
             
             # Update payment with Stripe transaction ID for future reference
-            crud_payment.update(
-                db, 
-                db_obj=payment, 
-                obj_in={"transaction_id": intent.id}
+            await run_in_threadpool(
+                crud_payment.update, db, db_obj=payment, obj_in={"transaction_id": intent.id}
             )
             
             return {
@@ -155,30 +371,61 @@ class PaymentService:
             }
         except Exception as e:
             # Update payment status to failed if Stripe operation fails
-            crud_payment.update_status(
-                db, db_obj=payment, status=PaymentStatus.FAILED
+            await run_in_threadpool(
+                crud_payment.update_status, db, db_obj=payment, status=PaymentStatus.FAILED
             )
+            await run_in_threadpool(invalidate_payment_stats)
             raise ValidationError(detail=str(e))
     
+    async def create_payment_intent_after_response(
+        self, *, payment_id: int, amount: float, currency: str = "usd"
+    ) -> None:
+        """
+        Create a Stripe payment intent from a background task.
+        
+        Runs after the response has been sent, when the request's session has
+        already been released, so it opens its own session.
+        
+        Parameters
+        ----------
+        payment_id: Payment ID
+        amount: Payment amount
+        currency: Payment currency (default: usd)
+        """
+        with SessionLocal.session_factory() as db:
+            await self.create_payment_intent(
+                db, payment_id=payment_id, amount=amount, currency=currency
+            )
+    
     async def process_payment_webhook(
-        self, db: Session, *, event_type: str, payment_intent: Dict[str, Any]
+        self,
+        db: Session,
+        *,
+        event_type: str,
+        payment_intent: Dict[str, Any],
+        event_id: Optional[str] = None,
     ) -> Optional[Payment]:
         """
         Process a Stripe webhook event.
         
+        With an event_id, the event is recorded in processed_webhook_events
+        in the same transaction as the payment update; a redelivery of an
+        event that was already recorded changes nothing.
+        
         Parameters
         ----------
         db: SQLAlchemy session
         event_type: Webhook event type
         payment_intent: Payment intent data from webhook
+        event_id: Stripe event ID, used to ignore redeliveries
         
         Returns
         -------
         Optional[Payment]
-            Updated payment if successful, None otherwise
+            Updated payment if successful, None otherwise (including duplicates)
         """
         # Only process successful payment events
-        if event_type != "payment_intent.succeeded":
+        if event_type not in HANDLED_WEBHOOK_EVENTS:
             return None
         
         transaction_id = payment_intent.get("id")
@@ -190,13 +437,24 @@ class PaymentService:
         if not payment:
             return None
         
-        # Update payment status to completed
+        # Record the event; a conflict means an earlier delivery already handled it
+        if event_id and db.execute(
+            pg_insert(ProcessedWebhookEvent)
+            .values(stripe_event_id=event_id)
+            .on_conflict_do_nothing(index_elements=[ProcessedWebhookEvent.stripe_event_id])
+            .returning(ProcessedWebhookEvent.id)
+        ).scalar_one_or_none() is None:
+            db.rollback()
+            return None
+        
+        # Update payment status to completed (this also commits the event record)
         payment = crud_payment.update_status(
             db, db_obj=payment, status=PaymentStatus.COMPLETED
         )
+        await run_in_threadpool(invalidate_payment_stats)
         
         # Update enrollment payment status to reflect completed payment
-        enrollment = crud_enrollment.get(db, id=payment.enrollment_id)
+        enrollment = payment.enrollment
         if enrollment:
             crud_enrollment.update_payment_status(
                 db, db_obj=enrollment, payment_status=PaymentStatus.PAID
@@ -225,7 +483,8 @@ class PaymentService:
         ValidationError
             If refund conditions not met or Stripe operation fails
         """
-        payment = crud_payment.get(db, payment_id)
+        # Enrollment and course are loaded up front for the status update and notification
+        payment = crud_payment.get_with_relations(db, payment_id)
         if not payment:
             raise NotFoundError(detail="Payment not found")
         
@@ -237,17 +496,18 @@ class PaymentService:
         
         try:
             # Create Stripe refund for the payment intent
-            refund = await stripe.Refund.create(
-                payment_intent=payment.transaction_id
+            refund = await run_in_threadpool(
+                stripe.Refund.create, payment_intent=payment.transaction_id
             )
             
             # Update payment status to refunded
             payment = crud_payment.update_status(
                 db, db_obj=payment, status=PaymentStatus.REFUNDED
             )
+            await run_in_threadpool(invalidate_payment_stats)
             
             # Update enrollment payment status to reflect refund
-            enrollment = crud_enrollment.get(db, id=payment.enrollment_id)
+            enrollment = payment.enrollment
             if enrollment:
                 crud_enrollment.update_payment_status(
                     db, db_obj=enrollment, payment_status=PaymentStatus.REFUNDED
@@ -257,17 +517,45 @@ class PaymentService:
         except Exception as e:
             raise ValidationError(detail=f"Refund failed: {str(e)}")
     
-    def get_payment_stats(self, db: Session) -> Dict[str, Any]:
+    def get_payment_stats(self, db: Session) -> Tuple[Dict[str, Any], bool]:
         """
         Get payment statistics.
         
+        Statistics are served stale-while-revalidate. A fresh copy is cached
+        for up to a minute and dropped whenever a payment is created or
+        changes status; after that, the last computed copy is still returned
+        (for up to an hour) and flagged as stale so the caller can schedule
+        refresh_payment_stats. Only a complete miss runs the aggregates
+        inside the request.
+        
         Parameters
         ----------
         db: SQLAlchemy session
         
         Returns
         -------
-        Dict[str, Any]
-            Payment statistics and financial metrics
+        Tuple[Dict[str, Any], bool]
+            Payment statistics and financial metrics, and whether they are fresh
         """
-        return crud_payment.get_payment_stats(db)
\ No newline at end of file
+        cached = get_cached_payment_stats()
+        if cached is not None:
+            return cached
+        stats = crud_payment.get_payment_stats(db)
+        cache_payment_stats(stats)
+        return stats, True
+
+    def refresh_payment_stats(self) -> None:
+        """
+        Recompute the cached payment statistics.
+        
+        Runs after the response has been sent, so it opens its own session.
+        A short-lived lock lets only one worker recompute when many requests
+        see stale statistics at once; the others return immediately.
+        """
+        if not acquire_payment_stats_refresh():
+            return
+        try:
+            with SessionLocal.session_factory() as db:
+                cache_payment_stats(crud_payment.get_payment_stats(db))
+        finally:
+            release_payment_stats_refresh()
\ No newline at end of file
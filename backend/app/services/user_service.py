@@ -11,11 +11,15 @@ Student Registration system, including authentication, registration, and profile
 management functionality.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.sql import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.domain.models.user import User
+from app.domain.models.enrollment import Enrollment
+from app.domain.models.user import User, UserRole
 from app.domain.schemas.user import UserCreate, UserUpdate, UserWithToken
 from app.crud import user as crud_user
 from app.core.security import create_access_token
@@ -23,233 +27,444 @@ from app.core.config import settings
 from app.core.exceptions import AuthenticationError, NotFoundError, ValidationError
 
 
-class UserService:
-    """Service for user operations using CRUD abstractions."""
+# User operations are stateless module-level functions, so endpoints call them
+# without creating a service instance or binding methods.
+
+
+def get(db: Session, id: int) -> Optional[User]:
+    """
+    Get a user by ID.
     
-    def get(self, db: Session, id: int) -> Optional[User]:
-        """
-        Get a user by ID.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        id: User ID to retrieve
-        
-        Returns
-        -------
-        Optional[User]
-            User if found, None otherwise
-        """
-        return crud_user.get(db, id)
-    
-    def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
-        """
-        Get a user by email.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        email: Email address to search for
-        
-        Returns
-        -------
-        Optional[User]
-            User if found, None otherwise
-        """
-        return crud_user.get_by_email(db, email=email)
-    
-    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
-        """
-        Get multiple users with pagination.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        skip: Number of records to skip (for pagination)
-        limit: Maximum number of records to return
-        
-        Returns
-        -------
-        List[User]
-            List of users
-        """
-        return crud_user.get_multi(db, skip=skip, limit=limit)
-    
-    def create_user(self, db: Session, *, obj_in: UserCreate) -> User:
-        """
-        Create a new user with duplicate email check.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        obj_in: User creation data
-        
-        Returns
-        -------
-        User
-            Created user instance
-            
-        Raises
-        ------
-        ValidationError
-            If a user with the same email already exists
-        """
-        user = self.get_by_email(db, email=obj_in.email)
-        if user:
-            raise ValidationError(detail="User with this email already exists")
-        return crud_user.create(db, obj_in=obj_in)
-    
-    def authenticate(self, db: Session, *, email: str, password: str) -> UserWithToken:
-        """
-        Authenticate a user and return user with access token.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        email: User's email
-        password: Plaintext password
-        
-        Returns
-        -------
-        UserWithToken
-            Authenticated user data with JWT token
-            
-        Raises
-        ------
-        AuthenticationError
-            If authentication fails or user is inactive
-        """
-        user = crud_user.authenticate(db, email=email, password=password)
-        if not user:
-            raise AuthenticationError(detail="Incorrect email or password")
-        
-        if not crud_user.is_active(user):
-            raise AuthenticationError(detail="Inactive user")
-        
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            subject=user.id, expires_delta=access_token_expires
-        )
-        
-        return UserWithToken(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            role=user.role,
-            is_active=user.is_active,
-            access_token=access_token,
-            token_type="bearer"
-        )
-    
-    def update_user(self, db: Session, *, id: int, obj_in: UserUpdate) -> User:
-        """
-        Update user with existence check.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        id: User ID to update
-        obj_in: Update data
-        
-        Returns
-        -------
-        User
-            Updated user instance
-            
-        Raises
-        ------
-        NotFoundError
-            If user doesn't exist
-        """
-        user = crud_user.get(db, id)
-        if not user:
-            raise NotFoundError(detail="User not found")
-        return crud_user.update(db, db_obj=user, obj_in=obj_in)
-    
-    def update_password(self, db: Session, *, user_id: int, new_password: str) -> User:
-        """
-        Update user password.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        user_id: User ID
-        new_password: New plaintext password
-        
-        Returns
-        -------
-        User
-            Updated user instance
-            
-        Raises
-        ------
-        NotFoundError
-            If user doesn't exist
-        """
-        user = crud_user.get(db, user_id)
-        if not user:
-            raise NotFoundError(detail="User not found")
-        
-        update_data = {"password": new_password}
-        return crud_user.update(db, db_obj=user, obj_in=update_data)
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    id: User ID to retrieve
     
-    def get_user_stats(self, db: Session) -> Dict[str, Any]:
-        """
-        Get user statistics.
-        
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        
-        Returns
-        -------
-        Dict[str, Any]
-            User statistics by role
-        """
-        from app.domain.models.user import UserRole, User
+    Returns
+    -------
+    Optional[User]
+        User if found, None otherwise
+    """
+    return crud_user.get(db, id)
+
+
+def get_with_enrollments(db: Session, id: int) -> Optional[User]:
+    """
+    Get a user by ID with enrollments loaded.
+    
+    Enrollments are fetched with one extra SELECT ... IN query rather than
+    lazily, so serializing the user costs a fixed number of queries.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    id: User ID to retrieve
+    
+    Returns
+    -------
+    Optional[User]
+        User with enrollments if found, None otherwise
+    """
+    return db.execute(
+        select(User).options(selectinload(User.enrollments)).where(User.id == id)
+    ).scalar_one_or_none()
+
+
+def get_version(db: Session, id: int) -> Optional[Tuple[Any, ...]]:
+    """
+    Get the values that version a user and their enrollments.
+    
+    Cheap enough to run before get_with_enrollments, so unchanged users can
+    be answered with 304 Not Modified without loading them.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    id: User ID
+    
+    Returns
+    -------
+    Optional[Tuple[Any, ...]]
+        User update time, enrollment count and latest enrollment update time,
+        or None if the user does not exist
+    """
+    enrollments = Enrollment.student_id == User.id
+    query = select(
+        User.updated_at,
+        select(func.count(Enrollment.id)).where(enrollments).scalar_subquery(),
+        select(func.max(Enrollment.updated_at)).where(enrollments).scalar_subquery(),
+    ).where(User.id == id)
+    row = db.execute(query).first()
+    return tuple(row) if row is not None else None
+
+
+def get_by_email(db: Session, *, email: str) -> Optional[User]:
+    """
+    Get a user by email.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    email: Email address to search for
+    
+    Returns
+    -------
+    Optional[User]
+        User if found, None otherwise
+    """
+    return crud_user.get_by_email(db, email=email)
+
+
+def get_multi(db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
+    """
+    Get multiple users with pagination.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    skip: Number of records to skip (for pagination)
+    limit: Maximum number of records to return
+    
+    Returns
+    -------
+    List[User]
+        List of users
+    """
+    return crud_user.get_multi(db, skip=skip, limit=limit)
+
+
+async def get_filtered_users(
+    db: AsyncSession, *, skip: int = 0, limit: int = 100, **filters
+) -> List[User]:
+    """
+    Get users matching the given filters with pagination.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    skip: Number of records to skip (for pagination)
+    limit: Maximum number of records to return
+    **filters: Field name/value pairs to filter by (e.g. role, is_active),
+        plus an optional "search" term matched against email and full name
+    
+    Returns
+    -------
+    List[User]
+        List of matching users
+    """
+    query = _filtered_query(**filters)
+    result = await db.execute(query.order_by(User.id).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+
+async def count_filtered_users(db: AsyncSession, **filters) -> int:
+    """
+    Count users matching the given filters.
+    
+    Parameters
+    ----------
+    db: Async SQLAlchemy session
+    **filters: Same filters accepted by get_filtered_users
+    
+    Returns
+    -------
+    int
+        Total number of matching users, ignoring pagination
+    """
+    query = select(func.count()).select_from(_filtered_query(**filters).subquery())
+    return (await db.execute(query)).scalar_one()
+
+
+def _filtered_query(*, search: Optional[str] = None, **filters) -> Select:
+    """Build the SELECT for a set of user filters so the database does the filtering."""
+    query = select(User)
+    for key, value in filters.items():
+        if hasattr(User, key):
+            query = query.where(getattr(User, key) == value)
+    if search:
+        pattern = f"%{search}%"
+        query = query.where(or_(User.email.ilike(pattern), User.full_name.ilike(pattern)))
+    return query
+
+
+def has_other_admin(db: Session, excluding_id: int) -> bool:
+    """
+    Check whether an active admin other than the given user exists.
+    
+    Stops at the first match (SELECT 1 ... LIMIT 1) instead of counting
+    every admin, and is answered from the ix_users_role_active index.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    excluding_id: ID of the user to leave out of the check
+    
+    Returns
+    -------
+    bool
+        True if another active admin exists
+    """
+    query = (
+        select(literal(1))
+        .where(User.role == UserRole.ADMIN, User.is_active.is_(True), User.id != excluding_id)
+        .limit(1)
+    )
+    return db.execute(query).first() is not None
+
+
+def create_user(db: Session, *, obj_in: UserCreate) -> User:
+    """
+    Create a new user with duplicate email check.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    obj_in: User creation data
+    
+    Returns
+    -------
+    User
+        Created user instance
         
-        total = db.query(User).count()
-        students = db.query(User).filter(User.role == UserRole.STUDENT).count()
-        instructors = db.query(User).filter(User.role == UserRole.INSTRUCTOR).count()
-        admins = db.query(User).filter(User.role == UserRole.ADMIN).count()
+    Raises
+    ------
+    ValidationError
+        If a user with the same email already exists
+    """
+    user = get_by_email(db, email=obj_in.email)
+    if user:
+        raise ValidationError(detail="User with this email already exists")
+    return crud_user.create(db, obj_in=obj_in)
+
+
+def authenticate(db: Session, *, email: str, password: str) -> UserWithToken:
+    """
+    Authenticate a user and return user with access token.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    email: User's email
+    password: Plaintext password
+    
+    Returns
+    -------
+    UserWithToken
+        Authenticated user data with JWT token
         
-        return {
-            "total": total,
-            "students": students,
-            "instructors": instructors,
-            "admins": admins
-        }
-    
-    def get_students(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
-        """
-        Get all student users.
+    Raises
+    ------
+    AuthenticationError
+        If authentication fails or user is inactive
+    """
+    user = crud_user.authenticate(db, email=email, password=password)
+    if not user:
+        raise AuthenticationError(detail="Incorrect email or password")
+    
+    if not crud_user.is_active(user):
+        raise AuthenticationError(detail="Inactive user")
+    
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        subject=user.id,
+        expires_delta=access_token_expires,
+        extra_claims={"role": user.role, "active": user.is_active},  # Lets requests authorize without a lookup
+    )
+    
+    return UserWithToken(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        role=user.role,
+        is_active=user.is_active,
+        access_token=access_token,
+        token_type="bearer"
+    )
+
+
+def update_user(db: Session, *, id: int, obj_in: UserUpdate) -> User:
+    """
+    Update user with existence check.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    id: User ID to update
+    obj_in: Update data
+    
+    Returns
+    -------
+    User
+        Updated user instance
         
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        skip: Number of records to skip (for pagination)
-        limit: Maximum number of records to return
+    Raises
+    ------
+    NotFoundError
+        If user doesn't exist
+    """
+    user = crud_user.get(db, id)
+    if not user:
+        raise NotFoundError(detail="User not found")
+    return crud_user.update(db, db_obj=user, obj_in=obj_in)
+
+
+def update_password(db: Session, *, user_id: int, new_password: str) -> User:
+    """
+    Update user password.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    user_id: User ID
+    new_password: New plaintext password
+    
+    Returns
+    -------
+    User
+        Updated user instance
         
-        Returns
-        -------
-        List[User]
-            List of student users
-        """
-        return crud_user.get_students(db, skip=skip, limit=limit)
-    
-    def get_instructors(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
-        """
-        Get all instructor users.
+    Raises
+    ------
+    NotFoundError
+        If user doesn't exist
+    """
+    user = crud_user.get(db, user_id)
+    if not user:
+        raise NotFoundError(detail="User not found")
+    
+    update_data = {"password": new_password}
+    return crud_user.update(db, db_obj=user, obj_in=update_data)
+
+
+def deactivate_user(db: Session, *, id: int) -> User:
+    """
+    Deactivate a user (soft delete).
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    id: User ID to deactivate
+    
+    Returns
+    -------
+    User
+        Deactivated user instance
         
-        Parameters
-        ----------
-        db: SQLAlchemy session
-        skip: Number of records to skip (for pagination)
-        limit: Maximum number of records to return
+    Raises
+    ------
+    NotFoundError
+        If user doesn't exist
+    """
+    return _set_active(db, id=id, is_active=False)
+
+
+def activate_user(db: Session, *, id: int) -> User:
+    """
+    Reactivate a deactivated user.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    id: User ID to activate
+    
+    Returns
+    -------
+    User
+        Activated user instance
         
-        Returns
-        -------
-        List[User]
-            List of instructor users
-        """
-        return crud_user.get_instructors(db, skip=skip, limit=limit)
\ No newline at end of file
+    Raises
+    ------
+    NotFoundError
+        If user doesn't exist
+    """
+    return _set_active(db, id=id, is_active=True)
+
+
+def _set_active(db: Session, *, id: int, is_active: bool) -> User:
+    """Set a user's active flag, raising NotFoundError if the user doesn't exist."""
+    user = crud_user.get(db, id)
+    if not user:
+        raise NotFoundError(detail="User not found")
+    return crud_user.update(db, db_obj=user, obj_in={"is_active": is_active})
+
+
+def get_user_stats(db: Session) -> Dict[str, Any]:
+    """
+    Get user statistics.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    
+    Returns
+    -------
+    Dict[str, Any]
+        User statistics by role
+    """
+    # One grouped COUNT instead of a separate scan per role
+    by_role = dict(db.execute(
+        select(User.role, func.count()).group_by(User.role)
+    ).all())
+    
+    return {
+        "total": sum(by_role.values()),
+        "students": by_role.get(UserRole.STUDENT, 0),
+        "instructors": by_role.get(UserRole.INSTRUCTOR, 0),
+        "admins": by_role.get(UserRole.ADMIN, 0),
+    }
+
+
+def get_students(db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
+    """
+    Get all student users.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    skip: Number of records to skip (for pagination)
+    limit: Maximum number of records to return
+    
+    Returns
+    -------
+    List[User]
+        List of student users
+    """
+    return crud_user.get_students(db, skip=skip, limit=limit)
+
+
+def get_instructors(db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
+    """
+    Get all instructor users.
+    
+    Parameters
+    ----------
+    db: SQLAlchemy session
+    skip: Number of records to skip (for pagination)
+    limit: Maximum number of records to return
+    
+    Returns
+    -------
+    List[User]
+        List of instructor users
+    """
+    return crud_user.get_instructors(db, skip=skip, limit=limit)
+
+
+class UserService:
+    """Service for user operations; kept for callers that use an instance."""
+    
+    get = staticmethod(get)
+    get_with_enrollments = staticmethod(get_with_enrollments)
+    get_version = staticmethod(get_version)
+    get_by_email = staticmethod(get_by_email)
+    get_multi = staticmethod(get_multi)
+    get_filtered_users = staticmethod(get_filtered_users)
+    count_filtered_users = staticmethod(count_filtered_users)
+    has_other_admin = staticmethod(has_other_admin)
+    create_user = staticmethod(create_user)
+    authenticate = staticmethod(authenticate)
+    update_user = staticmethod(update_user)
+    update_password = staticmethod(update_password)
+    get_user_stats = staticmethod(get_user_stats)
+    get_students = staticmethod(get_students)
+    get_instructors = staticmethod(get_instructors)
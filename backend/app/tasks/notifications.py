@@ -0,0 +1,242 @@
+"""
+notifications.py - Enrollment and payment notification tasks
+This file defines the Celery tasks that notify students and instructors about
+enrollment and payment events. Endpoints enqueue them after the change is
+committed, so creating the in-app notifications and sending the emails
+happens on the email_queue workers instead of in the request. Payment
+notifications are buffered in Redis and written in batches.
+"""
+
+import logging
+from typing import Any, List, Optional, Tuple
+
+from celery import Task
+from celery.exceptions import CeleryError
+from fastapi.concurrency import run_in_threadpool
+from kombu.exceptions import KombuError
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.cache import (
+    ack_processing_ids,
+    claim_pending_ids,
+    get_processing_ids,
+    push_pending_ids,
+    requeue_processing_ids,
+)
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.domain.models.enrollment import Enrollment, EnrollmentStatus
+from app.domain.models.payment import Payment
+from app.services.notification_service import NotificationService
+
+notification_service = NotificationService()
+
+logger = logging.getLogger(__name__)
+
+# Notification titles and message templates, bound once at import
+_SUBMITTED_TITLE = "Enrollment Submitted"
+_NEW_ENROLLMENT_TITLE = "New Enrollment"
+_SUBMITTED_MESSAGE = "Your enrollment for {title} has been submitted and is pending approval.".format_map
+_NEW_ENROLLMENT_MESSAGE = "A new student has enrolled in your course {title}.".format_map
+_STATUS_CHANGED_MESSAGE = "Your enrollment for {title} has been {status}.".format_map
+
+_PAYMENT_SUCCEEDED_TITLE = "Payment Successful"
+_PAYMENT_SUCCEEDED_MESSAGE = "Your payment of ${amount:.2f} for {title} has been processed successfully.".format_map
+
+# Payments whose success notification is waiting to be written, and how many are written per INSERT
+PENDING_PAYMENT_SUCCEEDED_KEY = "notifications:pending:payment_succeeded"
+PAYMENT_NOTIFICATION_BATCH_SIZE = 100
+
+# Seconds before requeued payments are flushed again after a failed batch
+PAYMENT_NOTIFICATION_RETRY_DELAY = 30
+
+# Notification titles for each status value
+_STATUS_CHANGED_TITLES = {
+    status.value: f"Enrollment {status.value.capitalize()}" for status in EnrollmentStatus
+}
+
+
+def _get_enrollment(db, enrollment_id: int, *options):
+    """Load an enrollment together with its course, or None if it was deleted."""
+    return db.scalars(
+        select(Enrollment)
+        .options(selectinload(Enrollment.course), *options)
+        .where(Enrollment.id == enrollment_id)
+    ).first()
+
+
+@celery_app.task
+def notify_enrollment_submitted(enrollment_id: int) -> None:
+    """
+    Notify the student (with email) and the course instructor of a new enrollment.
+
+    Both in-app notifications are written with one INSERT; the student's
+    email is sent once they are committed.
+    """
+    db = SessionLocal()
+    try:
+        enrollment = _get_enrollment(db, enrollment_id, selectinload(Enrollment.student))
+        if enrollment is None:
+            return
+
+        course = enrollment.course
+        notifications = [{
+            "user_id": enrollment.student_id,
+            "title": _SUBMITTED_TITLE,
+            "message": _SUBMITTED_MESSAGE({"title": course.title}),
+            "entity_id": enrollment.id,
+            "entity_type": "enrollment",
+        }]
+        # If course has instructor, notify them too
+        if course.instructor_id:
+            notifications.append({
+                "user_id": course.instructor_id,
+                "title": _NEW_ENROLLMENT_TITLE,
+                "message": _NEW_ENROLLMENT_MESSAGE({"title": course.title}),
+                "entity_id": enrollment.id,
+                "entity_type": "enrollment",
+            })
+        notification_service.create_system_notifications_bulk(db, notifications)
+
+        if enrollment.student.email:
+            notification_service.email_service.send_notification_email(
+                email_to=enrollment.student.email,
+                subject=_SUBMITTED_TITLE,
+                body=notifications[0]["message"]
+            )
+    finally:
+        SessionLocal.remove()
+
+
+@celery_app.task
+def notify_enrollment_status_changed(enrollment_id: int, new_status: str) -> None:
+    """Notify the student (with email) that their enrollment status changed."""
+    db = SessionLocal()
+    try:
+        enrollment = _get_enrollment(db, enrollment_id)
+        if enrollment is None:
+            return
+
+        notification_service.create_system_notification(
+            db,
+            user_id=enrollment.student_id,
+            title=_STATUS_CHANGED_TITLES[new_status],
+            message=_STATUS_CHANGED_MESSAGE({"title": enrollment.course.title, "status": new_status}),
+            entity_id=enrollment.id,
+            entity_type="enrollment",
+            send_email=True  # Send email notification too
+        )
+    finally:
+        SessionLocal.remove()
+
+
+
+def publish_notification(task: Task, *args: Any) -> bool:
+    """
+    Enqueue a notification task for a change that is already committed.
+
+    A broker that can't be reached is logged instead of raised, so the
+    request still reports the committed change. Returns whether the task
+    was published.
+    """
+    try:
+        task.delay(*args)
+    except (KombuError, CeleryError):
+        logger.exception("notification_publish_failed", extra={"task": task.name, "task_args": args})
+        return False
+    return True
+
+async def queue_payment_succeeded_notification(payment_id: int) -> None:
+    """
+    Queue the student's notification for a completed payment.
+
+    The payment ID is buffered in Redis and a flush is scheduled shortly
+    after, so a burst of webhook deliveries is written with a few batched
+    INSERTs. Without Redis the payment is handed to the task directly.
+    Publishing to the broker blocks, so it runs in the threadpool.
+    """
+    if await push_pending_ids(PENDING_PAYMENT_SUCCEEDED_KEY, payment_id):
+        await run_in_threadpool(flush_payment_succeeded_notifications.apply_async, countdown=1)
+    else:
+        await run_in_threadpool(flush_payment_succeeded_notifications.delay, [payment_id])
+
+
+@celery_app.task(bind=True, reject_on_worker_lost=True)
+def flush_payment_succeeded_notifications(self, payment_ids: Optional[List[int]] = None) -> None:
+    """
+    Write queued payment success notifications and email the students.
+
+    Drains the Redis buffer in batches (or handles the given payment IDs):
+    each batch loads its payments with one query and inserts all of their
+    notifications with one INSERT. A flush that finds the buffer empty,
+    because an earlier one drained it, does nothing.
+
+    Each batch is moved to a processing list named after this task and
+    deleted only after its INSERT is committed. If the write fails, the batch
+    goes back to the buffer and a retry is scheduled. If the worker dies, the
+    redelivered task (late acks) finds the batch under the same name and
+    writes it first.
+    """
+    db = SessionLocal()
+    try:
+        if payment_ids:
+            _send_payment_succeeded_emails(_write_payment_succeeded_notifications(db, payment_ids))
+            return
+
+        processing_key = f"{PENDING_PAYMENT_SUCCEEDED_KEY}:processing:{self.request.id}"
+        while True:
+            batch = get_processing_ids(processing_key) or claim_pending_ids(
+                PENDING_PAYMENT_SUCCEEDED_KEY, processing_key, PAYMENT_NOTIFICATION_BATCH_SIZE
+            )
+            if not batch:
+                return
+            try:
+                emails = _write_payment_succeeded_notifications(db, batch)
+            except Exception:
+                requeue_processing_ids(processing_key, PENDING_PAYMENT_SUCCEEDED_KEY)
+                flush_payment_succeeded_notifications.apply_async(
+                    countdown=PAYMENT_NOTIFICATION_RETRY_DELAY
+                )
+                raise
+            ack_processing_ids(processing_key)
+            _send_payment_succeeded_emails(emails)
+    finally:
+        SessionLocal.remove()
+
+
+def _write_payment_succeeded_notifications(db, payment_ids: List[int]) -> List[Tuple[str, str]]:
+    """Create and commit the notifications for one batch of payments; returns the emails to send."""
+    payments = db.scalars(
+        select(Payment)
+        .options(
+            selectinload(Payment.enrollment).selectinload(Enrollment.course),
+            selectinload(Payment.enrollment).selectinload(Enrollment.student),
+        )
+        .where(Payment.id.in_(payment_ids))
+    ).all()
+
+    notifications = []
+    emails = []
+    for payment in payments:
+        enrollment = payment.enrollment
+        message = _PAYMENT_SUCCEEDED_MESSAGE({"amount": payment.amount, "title": enrollment.course.title})
+        notifications.append({
+            "user_id": enrollment.student_id,
+            "title": _PAYMENT_SUCCEEDED_TITLE,
+            "message": message,
+            "entity_id": payment.id,
+            "entity_type": "payment",
+        })
+        if enrollment.student.email:
+            emails.append((enrollment.student.email, message))
+    notification_service.create_system_notifications_bulk(db, notifications)
+    return emails
+
+
+def _send_payment_succeeded_emails(emails: List[Tuple[str, str]]) -> None:
+    """Email the students of a committed batch."""
+    for email_to, body in emails:
+        notification_service.email_service.send_notification_email(
+            email_to=email_to, subject=_PAYMENT_SUCCEEDED_TITLE, body=body
+        )
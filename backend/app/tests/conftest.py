@@ -7,8 +7,9 @@ from typing import Dict, Generator, List
 from datetime import date, timedelta
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.core.config import settings
 from app.core.security import get_password_hash
@@ -17,7 +18,7 @@ from app.domain.models.user import User, UserRole
 from app.domain.models.course import Course
 from app.domain.models.enrollment import Enrollment, EnrollmentStatus, PaymentStatus
 from app.main import app
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
 
 
 # Create test database engine with in-memory SQLite
@@ -29,21 +30,24 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-
-@pytest.fixture(scope="session")
-def db_engine():
-    """Create test database engine."""
-    Base.metadata.create_all(bind=engine)  # Create tables
-    yield engine
-    Base.metadata.drop_all(bind=engine)  # Drop tables after tests
+# Async endpoints get aiosqlite sessions on the same database file, configured
+# like the application's AsyncSessionLocal
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(scope="function")
-def db(db_engine):
-    """Get test database session."""
-    connection = db_engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+def db():
+    """
+    Get test database session.
+    
+    Test data is committed so the async sessions used by async endpoints see
+    it; the tables are recreated for every test instead of rolling back.
+    """
+    Base.metadata.create_all(bind=engine)  # Create tables
+    session = TestingSessionLocal()
     
     # Create test data
     _create_test_data(session)
@@ -51,8 +55,7 @@ def db(db_engine):
     yield session
     
     session.close()
-    transaction.rollback()
-    connection.close()
+    Base.metadata.drop_all(bind=engine)  # Drop tables after the test
 
 
 def _create_test_data(db: Session):
@@ -140,34 +143,37 @@ def client(db):
         finally:
             pass
     
+    async def _get_test_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+    
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_async_db] = _get_test_async_db
     with TestClient(app) as client:
         yield client
     app.dependency_overrides = {}
 
 
-@pytest.fixture(scope="module")
-def user_authentication_headers(client: TestClient):
-    """Get authentication headers for test user."""
-    data = {"email": "student@test.com", "password": "studentpass"}
-    response = client.post("/api/v1/auth/login", json=data)
+def auth_headers(client: TestClient, email: str, password: str) -> Dict[str, str]:
+    """Log in through the OAuth2 password form and return the bearer header."""
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": password})
     auth_data = response.json()
     return {"Authorization": f"Bearer {auth_data['access_token']}"}
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="function")
+def user_authentication_headers(client: TestClient):
+    """Get authentication headers for test user."""
+    return auth_headers(client, "student@test.com", "studentpass")
+
+
+@pytest.fixture(scope="function")
 def admin_authentication_headers(client: TestClient):
     """Get authentication headers for admin user."""
-    data = {"email": "admin@test.com", "password": "adminpass"}
-    response = client.post("/api/v1/auth/login", json=data)
-    auth_data = response.json()
-    return {"Authorization": f"Bearer {auth_data['access_token']}"}
+    return auth_headers(client, "admin@test.com", "adminpass")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="function")
 def instructor_authentication_headers(client: TestClient):
     """Get authentication headers for instructor user."""
-    data = {"email": "chef@test.com", "password": "chefpass"}
-    response = client.post("/api/v1/auth/login", json=data)
-    auth_data = response.json()
-    return {"Authorization": f"Bearer {auth_data['access_token']}"}
\ No newline at end of file
+    return auth_headers(client, "chef@test.com", "chefpass")
@@ -2,9 +2,16 @@
 Test cases for authentication API endpoints.
 """
 
+import time
+
+import jwt
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.config import settings
+from app.core.security import ALGORITHM
+from app.domain.models.user import User, UserRole
+
 
 @pytest.mark.api
 def test_login(client: TestClient):
@@ -64,4 +71,111 @@ def test_current_user_unauthorized(client: TestClient):
     response = client.get("/api/v1/auth/me")
     
     # Assert
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+def _notification_payload() -> dict:
+    """Notification created by the admin-only write endpoint."""
+    return {
+        "user_id": 3,  # Student's ID
+        "title": "Kitchen closed",
+        "message": "The kitchen is closed on Friday.",
+        "notification_type": "system",
+    }
+
+
+@pytest.mark.api
+def test_deactivated_admin_refused_on_write(client: TestClient, db, admin_authentication_headers):
+    """Test an admin deactivated after login can no longer write with their token."""
+    # Arrange
+    admin = db.query(User).filter(User.email == "admin@test.com").one()
+    admin.is_active = False
+    db.commit()
+    
+    # Act
+    response = client.post(
+        "/api/v1/notifications/", json=_notification_payload(), headers=admin_authentication_headers
+    )
+    
+    # Assert
+    assert response.status_code == 400
+
+
+@pytest.mark.api
+def test_demoted_admin_refused_on_write(client: TestClient, db, admin_authentication_headers):
+    """Test an admin demoted after login loses admin write access with their token."""
+    # Arrange
+    admin = db.query(User).filter(User.email == "admin@test.com").one()
+    admin.role = UserRole.STUDENT
+    db.commit()
+    
+    # Act
+    response = client.post(
+        "/api/v1/notifications/", json=_notification_payload(), headers=admin_authentication_headers
+    )
+    
+    # Assert
+    assert response.status_code == 403
+
+
+def _token_headers(**claims) -> dict:
+    """Sign a bearer token for the test student with the given extra claims."""
+    payload = {"sub": "3", "exp": int(time.time()) + 300, **claims}
+    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.api
+def test_read_authorized_from_token_claims(client: TestClient, db, user_authentication_headers):
+    """Test reads authorize from the role and active claims without loading the user."""
+    # Arrange: the row changes, but the token's claims are trusted until it is reissued
+    student = db.query(User).filter(User.email == "student@test.com").one()
+    student.is_active = False
+    db.commit()
+    
+    # Act
+    read_response = client.get("/api/v1/notifications/", headers=user_authentication_headers)
+    write_response = client.put("/api/v1/notifications/read-all", headers=user_authentication_headers)
+    
+    # Assert
+    assert read_response.status_code == 200
+    assert write_response.status_code == 400
+
+
+@pytest.mark.api
+def test_read_refused_for_inactive_claim(client: TestClient):
+    """Test a token issued to an inactive account is refused on reads."""
+    # Act
+    response = client.get(
+        "/api/v1/notifications/", headers=_token_headers(role="student", active=False)
+    )
+    
+    # Assert
+    assert response.status_code == 400
+
+
+@pytest.mark.api
+def test_token_with_unknown_role_rejected(client: TestClient):
+    """Test a token whose role claim is not a known role is rejected as invalid."""
+    # Act
+    response = client.get(
+        "/api/v1/notifications/", headers=_token_headers(role="superuser", active=True)
+    )
+    
+    # Assert
+    assert response.status_code == 401
+
+
+@pytest.mark.api
+def test_token_with_bad_signature_rejected(client: TestClient):
+    """Test a token signed with another key is rejected."""
+    # Arrange
+    payload = {"sub": "3", "exp": int(time.time()) + 300, "role": "admin", "active": True}
+    token = jwt.encode(payload, "not-the-secret-key", algorithm=ALGORITHM)
+    
+    # Act
+    response = client.get(
+        "/api/v1/notifications/", headers={"Authorization": f"Bearer {token}"}
+    )
+    
+    # Assert
+    assert response.status_code == 401
@@ -0,0 +1,165 @@
+"""
+Test cases for document API endpoints.
+"""
+
+import hashlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.models.document import Document, DocumentType
+from app.domain.models.user import User
+
+
+def _create_document(db: Session, file_path: str) -> Document:
+    """Store a document owned by the test student."""
+    document = Document(
+        user_id=3,  # Student's ID
+        file_name="resume.pdf",
+        file_path=file_path,
+        file_type="pdf",
+        file_size=4,
+        document_type=DocumentType.RESUME,
+    )
+    db.add(document)
+    db.commit()
+    db.refresh(document)
+    return document
+
+
+@pytest.mark.api
+def test_update_document(client: TestClient, db: Session, tmp_path, user_authentication_headers):
+    """Test updating a document returns the updated record with its timestamps."""
+    # Arrange
+    document = _create_document(db, str(tmp_path / "resume.pdf"))
+
+    # Act
+    response = client.put(
+        f"/api/v1/documents/{document.id}",
+        json={"description": "Updated resume"},
+        headers=user_authentication_headers,
+    )
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == document.id
+    assert data["description"] == "Updated resume"
+    assert data["updated_at"] is not None
+    assert data["created_at"] is not None
+
+
+@pytest.mark.api
+def test_delete_document(client: TestClient, db: Session, tmp_path, user_authentication_headers):
+    """Test deleting a document returns the deleted record."""
+    # Arrange
+    file_path = tmp_path / "resume.pdf"
+    file_path.write_bytes(b"%PDF")
+    document = _create_document(db, str(file_path))
+
+    # Act
+    response = client.delete(
+        f"/api/v1/documents/{document.id}", headers=user_authentication_headers
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["id"] == document.id
+    assert client.get(
+        f"/api/v1/documents/{document.id}", headers=user_authentication_headers
+    ).status_code == 404
+
+
+@pytest.mark.api
+def test_update_document_deactivated_owner(
+    client: TestClient, db: Session, tmp_path, user_authentication_headers
+):
+    """Test a user deactivated after login can no longer update their documents."""
+    # Arrange
+    document = _create_document(db, str(tmp_path / "resume.pdf"))
+    student = db.get(User, 3)
+    student.is_active = False
+    db.commit()
+
+    # Act
+    response = client.put(
+        f"/api/v1/documents/{document.id}",
+        json={"description": "Updated resume"},
+        headers=user_authentication_headers,
+    )
+
+    # Assert
+    assert response.status_code == 400
+
+
+@pytest.mark.api
+def test_upload_document(client: TestClient, monkeypatch, tmp_path, user_authentication_headers):
+    """Test an uploaded file is stored with its size and SHA-256 digest."""
+    # Arrange
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    content = b"%PDF-1.4 test resume" * 1000
+
+    # Act
+    response = client.post(
+        "/api/v1/documents/",
+        params={"document_type": "resume"},
+        files={"file": ("resume.pdf", content, "application/pdf")},
+        headers=user_authentication_headers,
+    )
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert data["file_size"] == len(content)
+    assert data["sha256"] == hashlib.sha256(content).hexdigest()
+    assert data["file_type"] == "pdf"
+    stored = list((tmp_path / "3").iterdir())
+    assert [path.read_bytes() for path in stored] == [content]
+
+
+@pytest.mark.api
+def test_upload_document_failed_commit_removes_file(
+    client: TestClient, monkeypatch, tmp_path, user_authentication_headers
+):
+    """Test the stored file is removed when the document record cannot be committed."""
+    # Arrange
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+
+    async def _failing_commit(self):
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(AsyncSession, "commit", _failing_commit)
+
+    # Act
+    with pytest.raises(RuntimeError):
+        client.post(
+            "/api/v1/documents/",
+            params={"document_type": "resume"},
+            files={"file": ("resume.pdf", b"%PDF", "application/pdf")},
+            headers=user_authentication_headers,
+        )
+
+    # Assert
+    assert list((tmp_path / "3").iterdir()) == []
+
+
+@pytest.mark.api
+def test_read_document_etag(client: TestClient, db: Session, tmp_path, user_authentication_headers):
+    """Test an unchanged document answers If-None-Match with 304."""
+    # Arrange
+    document = _create_document(db, str(tmp_path / "resume.pdf"))
+    response = client.get(f"/api/v1/documents/{document.id}", headers=user_authentication_headers)
+    etag = response.headers["ETag"]
+
+    # Act
+    response = client.get(
+        f"/api/v1/documents/{document.id}",
+        headers={**user_authentication_headers, "If-None-Match": etag},
+    )
+
+    # Assert
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
@@ -0,0 +1,158 @@
+"""
+Test cases for enrollment API endpoints.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from kombu.exceptions import OperationalError
+from sqlalchemy.orm import Session
+
+from app.domain.models.course import Course
+from app.domain.models.enrollment import Enrollment, EnrollmentStatus
+from app.domain.models.enrollment import PaymentStatus as EnrollmentPaymentStatus
+from app.domain.models.payment import Payment, PaymentStatus
+from app.tasks.notifications import notify_enrollment_submitted
+
+
+@pytest.mark.api
+def test_read_enrollment_not_modified(client: TestClient, user_authentication_headers):
+    """Test an unchanged enrollment answers If-Modified-Since with 304."""
+    # Arrange
+    response = client.get("/api/v1/enrollments/1", headers=user_authentication_headers)
+    last_modified = response.headers["Last-Modified"]
+
+    # Act
+    response = client.get(
+        "/api/v1/enrollments/1",
+        headers={**user_authentication_headers, "If-Modified-Since": last_modified},
+    )
+
+    # Assert
+    assert response.status_code == 304
+
+
+@pytest.mark.api
+def test_read_enrollment_modified_by_new_payment(
+    client: TestClient, db: Session, user_authentication_headers
+):
+    """Test a payment added after the client's copy makes the enrollment modified."""
+    # Arrange
+    response = client.get("/api/v1/enrollments/1", headers=user_authentication_headers)
+    last_modified = response.headers["Last-Modified"]
+
+    # Later than Last-Modified even at HTTP dates' one-second resolution
+    paid_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=5)
+    db.add(Payment(
+        enrollment_id=1,
+        amount=1000.00,
+        status=PaymentStatus.COMPLETED,
+        payment_date=paid_at,
+        updated_at=paid_at,
+    ))
+    db.commit()
+
+    # Act
+    response = client.get(
+        "/api/v1/enrollments/1",
+        headers={**user_authentication_headers, "If-Modified-Since": last_modified},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["Last-Modified"] != last_modified
+    assert len(response.json()["payments"]) == 1
+
+
+@pytest.mark.api
+def test_update_enrollment_after_instructor_reassigned(
+    client: TestClient, db: Session, instructor_authentication_headers
+):
+    """Test an instructor removed from the course can no longer update its enrollments."""
+    # Arrange: a read caches the enrollment's owners, then the course changes hands
+    response = client.get("/api/v1/enrollments/1", headers=instructor_authentication_headers)
+    assert response.status_code == 200
+    course = db.get(Course, 1)
+    course.instructor_id = None
+    db.commit()
+
+    # Act
+    response = client.put(
+        "/api/v1/enrollments/1",
+        json={"status": "completed"},
+        headers=instructor_authentication_headers,
+    )
+
+    # Assert
+    assert response.status_code == 403
+
+
+@pytest.mark.api
+def test_read_enrollments_keyset_pages(
+    client: TestClient, db: Session, admin_authentication_headers
+):
+    """Test enrollment pages are ordered by ID and chained by X-Next-After-Id."""
+    # Arrange
+    db.add(Enrollment(
+        student_id=3,
+        course_id=2,
+        status=EnrollmentStatus.PENDING,
+        payment_status=EnrollmentPaymentStatus.PENDING,
+    ))
+    db.commit()
+
+    # Act
+    first = client.get(
+        "/api/v1/enrollments/", params={"limit": 1}, headers=admin_authentication_headers
+    )
+    second = client.get(
+        "/api/v1/enrollments/",
+        params={"limit": 1, "after_id": first.headers["X-Next-After-Id"]},
+        headers=admin_authentication_headers,
+    )
+
+    # Assert
+    assert first.status_code == 200
+    assert [e["id"] for e in first.json()] == [1]
+    assert second.status_code == 200
+    assert [e["course_id"] for e in second.json()] == [2]
+
+
+@pytest.mark.api
+@pytest.mark.enrollment
+def test_create_enrollment_broker_unreachable(
+    client: TestClient, db: Session, monkeypatch, user_authentication_headers
+):
+    """Test a committed enrollment is returned even if its notification can't be queued."""
+    # Arrange
+    def _unreachable(*args, **kwargs):
+        raise OperationalError("broker unreachable")
+
+    monkeypatch.setattr(notify_enrollment_submitted, "delay", _unreachable)
+
+    # Act
+    response = client.post(
+        "/api/v1/enrollments/",
+        json={"student_id": 3, "course_id": 2},
+        headers=user_authentication_headers,
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert db.get(Enrollment, response.json()["id"]) is not None
+
+
+@pytest.mark.api
+@pytest.mark.parametrize("params", [
+    {"limit": 0},
+    {"limit": 201},
+    {"after_id": -1},
+])
+def test_read_enrollments_pagination_bounds(client: TestClient, admin_authentication_headers, params):
+    """Test out-of-range pagination parameters are rejected."""
+    # Act
+    response = client.get("/api/v1/enrollments/", params=params, headers=admin_authentication_headers)
+
+    # Assert
+    assert response.status_code == 422
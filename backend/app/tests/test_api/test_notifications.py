@@ -0,0 +1,169 @@
+"""
+Test cases for notification API endpoints.
+"""
+
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.domain.models.notification import Notification, NotificationType
+
+
+def _create_notifications(
+    db: Session, count: int, notification_type: NotificationType = NotificationType.SYSTEM
+) -> List[Notification]:
+    """Store unread notifications for the test student."""
+    notifications = [
+        Notification(
+            user_id=3,  # Student's ID
+            title=f"Notice {i}",
+            message="Test notification",
+            notification_type=notification_type,
+        )
+        for i in range(count)
+    ]
+    db.add_all(notifications)
+    db.commit()
+    return notifications
+
+
+@pytest.mark.api
+def test_read_notifications_keyset_pages(
+    client: TestClient, db: Session, user_authentication_headers
+):
+    """Test notification pages are newest first and chained by X-Next-Before-Id."""
+    # Arrange
+    _create_notifications(db, 3)
+
+    # Act
+    first = client.get(
+        "/api/v1/notifications/", params={"limit": 2}, headers=user_authentication_headers
+    )
+    second = client.get(
+        "/api/v1/notifications/",
+        params={"limit": 2, "before_id": first.headers["X-Next-Before-Id"]},
+        headers=user_authentication_headers,
+    )
+
+    # Assert
+    assert first.status_code == 200
+    first_ids = [n["id"] for n in first.json()]
+    assert first_ids == sorted(first_ids, reverse=True)
+    assert len(first_ids) == 2
+    assert second.status_code == 200
+    assert [n["id"] for n in second.json()] == [min(first_ids) - 1]
+    assert "X-Next-Before-Id" not in second.headers
+
+
+@pytest.mark.api
+def test_read_notifications_etag(client: TestClient, db: Session, user_authentication_headers):
+    """Test an unchanged page answers If-None-Match with 304 until a notification is read."""
+    # Arrange
+    notification = _create_notifications(db, 1)[0]
+    response = client.get("/api/v1/notifications/", headers=user_authentication_headers)
+    etag = response.headers["ETag"]
+    conditional_headers = {**user_authentication_headers, "If-None-Match": etag}
+
+    # Act
+    unchanged = client.get("/api/v1/notifications/", headers=conditional_headers)
+    client.put(f"/api/v1/notifications/{notification.id}/read", headers=user_authentication_headers)
+    changed = client.get("/api/v1/notifications/", headers=conditional_headers)
+
+    # Assert
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()[0]["is_read"] is True
+
+
+@pytest.mark.api
+def test_unread_count_etag(client: TestClient, db: Session, user_authentication_headers):
+    """Test the unread count answers If-None-Match with 304 while the count is unchanged."""
+    # Arrange
+    _create_notifications(db, 2)
+    response = client.get("/api/v1/notifications/unread-count", headers=user_authentication_headers)
+
+    # Act
+    response = client.get(
+        "/api/v1/notifications/unread-count",
+        headers={**user_authentication_headers, "If-None-Match": response.headers["ETag"]},
+    )
+
+    # Assert
+    assert response.status_code == 304
+
+
+@pytest.mark.api
+def test_create_notifications_bulk(client: TestClient, admin_authentication_headers):
+    """Test a list body creates every notification and returns them in order."""
+    # Arrange
+    notifications_in = [
+        {
+            "user_id": user_id,
+            "title": "Kitchen closed",
+            "message": "The kitchen is closed on Friday",
+            "notification_type": "system",
+        }
+        for user_id in (2, 3)
+    ]
+
+    # Act
+    response = client.post(
+        "/api/v1/notifications/", json=notifications_in, headers=admin_authentication_headers
+    )
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data, list)
+    assert [n["user_id"] for n in data] == [2, 3]
+    assert all(n["id"] is not None and n["is_read"] is False for n in data)
+
+
+@pytest.mark.api
+def test_create_notification_single(client: TestClient, admin_authentication_headers):
+    """Test a single object body still creates and returns one notification."""
+    # Arrange
+    notification_in = {
+        "user_id": 3,
+        "title": "Welcome",
+        "message": "Welcome to the academy",
+        "notification_type": "system",
+    }
+
+    # Act
+    response = client.post(
+        "/api/v1/notifications/", json=notification_in, headers=admin_authentication_headers
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["title"] == "Welcome"
+
+
+@pytest.mark.api
+def test_mark_notifications_as_read_by_type(
+    client: TestClient, db: Session, user_authentication_headers
+):
+    """Test only unread notifications of the requested type are marked as read."""
+    # Arrange
+    _create_notifications(db, 2, NotificationType.PAYMENT)
+    _create_notifications(db, 1, NotificationType.COURSE)
+
+    # Act
+    response = client.put(
+        "/api/v1/notifications/read-by-type",
+        params={"notification_type": "payment"},
+        headers=user_authentication_headers,
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"count": 2}
+    unread = client.get(
+        "/api/v1/notifications/", params={"is_read": False}, headers=user_authentication_headers
+    ).json()
+    assert [n["notification_type"] for n in unread] == ["course"]
@@ -0,0 +1,117 @@
+"""
+Test cases for payment API endpoints.
+"""
+
+import uuid
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.domain.models.payment import Payment, PaymentStatus
+from app.services.payment_service import PaymentService
+
+
+@pytest.mark.api
+@pytest.mark.payment
+@pytest.mark.parametrize("params", [
+    {"skip": 10_001},
+    {"skip": -1},
+    {"limit": 0},
+    {"limit": 201},
+])
+def test_read_payments_pagination_bounds(client: TestClient, admin_authentication_headers, params):
+    """Test out-of-range pagination parameters are rejected."""
+    # Act
+    response = client.get("/api/v1/payments/", params=params, headers=admin_authentication_headers)
+
+    # Assert
+    assert response.status_code == 422
+
+
+@pytest.mark.api
+@pytest.mark.payment
+def test_read_payments_keyset_pages(
+    client: TestClient, db: Session, admin_authentication_headers
+):
+    """Test payment pages are ordered by ID and chained by X-Next-After-Id."""
+    # Arrange
+    db.add_all([
+        Payment(enrollment_id=1, amount=100.00 * (i + 1), status=PaymentStatus.COMPLETED)
+        for i in range(3)
+    ])
+    db.commit()
+
+    # Act
+    first = client.get(
+        "/api/v1/payments/", params={"limit": 2}, headers=admin_authentication_headers
+    )
+    second = client.get(
+        "/api/v1/payments/",
+        params={"limit": 2, "after_id": first.headers["X-Next-After-Id"]},
+        headers=admin_authentication_headers,
+    )
+
+    # Assert
+    assert first.status_code == 200
+    first_ids = [p["id"] for p in first.json()]
+    assert first_ids == sorted(first_ids)
+    assert len(first_ids) == 2
+    assert first.headers["X-Next-After-Id"] == str(first_ids[-1])
+    assert second.status_code == 200
+    assert len(second.json()) == 1
+    assert second.json()[0]["id"] > first_ids[-1]
+    assert "X-Next-After-Id" not in second.headers
+
+
+def _webhook_event(event_type: str) -> dict:
+    """Build a Stripe webhook payload with a unique event ID."""
+    return {
+        "id": f"evt_{uuid.uuid4().hex}",
+        "type": event_type,
+        "data": {"object": {"id": "pi_test", "metadata": {"payment_id": "1"}}},
+    }
+
+
+@pytest.fixture
+def processed_webhooks(monkeypatch) -> List[str]:
+    """Record the event IDs that reach the payment service instead of processing them."""
+    processed: List[str] = []
+
+    async def _process_payment_webhook(self, db, *, event_type, payment_intent, event_id=None):
+        processed.append(event_id)
+        return None
+
+    monkeypatch.setattr(PaymentService, "process_payment_webhook", _process_payment_webhook)
+    return processed
+
+
+@pytest.mark.api
+@pytest.mark.payment
+def test_webhook_duplicate_delivery_processed_once(client: TestClient, processed_webhooks):
+    """Test a redelivered webhook event is acknowledged without being processed again."""
+    # Arrange
+    event = _webhook_event("payment_intent.succeeded")
+
+    # Act
+    first = client.post("/api/v1/payments/webhook", json=event)
+    second = client.post("/api/v1/payments/webhook", json=event)
+
+    # Assert
+    assert first.json() == {"status": "success"}
+    assert second.json() == {"status": "success"}
+    assert processed_webhooks == [event["id"]]
+
+
+@pytest.mark.api
+@pytest.mark.payment
+def test_webhook_unhandled_event_skipped(client: TestClient, processed_webhooks):
+    """Test event types that don't concern payments are acknowledged and skipped."""
+    # Act
+    response = client.post("/api/v1/payments/webhook", json=_webhook_event("customer.created"))
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"status": "success"}
+    assert processed_webhooks == []
@@ -0,0 +1,53 @@
+"""
+Test cases for user API endpoints.
+
+The user endpoints are mounted under /api/v1/courses (see app/api/v1/router.py).
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.api
+def test_read_user_me_after_update(client: TestClient, user_authentication_headers):
+    """Test the cached profile is refreshed after the user updates it."""
+    # Arrange: the first read caches the profile
+    response = client.get("/api/v1/courses/me", headers=user_authentication_headers)
+    assert response.json()["email"] == "student@test.com"
+
+    # Act
+    update_response = client.put(
+        "/api/v1/courses/me",
+        json={"email": "renamed@test.com"},
+        headers=user_authentication_headers,
+    )
+    response = client.get("/api/v1/courses/me", headers=user_authentication_headers)
+
+    # Assert
+    assert update_response.status_code == 200
+    assert update_response.json()["email"] == "renamed@test.com"
+    assert response.json()["email"] == "renamed@test.com"
+
+
+@pytest.mark.api
+def test_deactivate_and_activate_user(client: TestClient, admin_authentication_headers):
+    """Test admins can deactivate a user and activate them again."""
+    # Act
+    deactivated = client.delete("/api/v1/courses/3", headers=admin_authentication_headers)
+    activated = client.put("/api/v1/courses/3/activate", headers=admin_authentication_headers)
+
+    # Assert
+    assert deactivated.status_code == 200
+    assert deactivated.json()["is_active"] is False
+    assert activated.status_code == 200
+    assert activated.json()["is_active"] is True
+
+
+@pytest.mark.api
+def test_activate_missing_user(client: TestClient, admin_authentication_headers):
+    """Test activating a user that doesn't exist returns 404."""
+    # Act
+    response = client.put("/api/v1/courses/999/activate", headers=admin_authentication_headers)
+
+    # Assert
+    assert response.status_code == 404
@@ -0,0 +1,92 @@
+"""
+etag.py - Entity tags for conditional requests
+This file builds ETags from record version data and checks them against the
+If-None-Match request header, so endpoints can answer repeat fetches with
+304 Not Modified before loading or serializing anything. It also formats and
+checks Last-Modified / If-Modified-Since dates for endpoints versioned by a
+timestamp.
+"""
+
+import hashlib  # Import hashlib for BLAKE2 digests
+from datetime import datetime, timezone  # Import datetime types for HTTP dates
+from email.utils import format_datetime, parsedate_to_datetime  # Import RFC 7231 date helpers
+from typing import Any  # Import type hints
+from starlette.requests import Request  # Import Starlette's request type
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values that version a response.
+
+    Args:
+        parts: Values identifying the record and its version (e.g. ID, updated_at)
+
+    Returns:
+        Quoted ETag header value
+    """
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a timestamp as an HTTP date for the Last-Modified header.
+
+    Args:
+        value: Timestamp (naive values are taken as UTC)
+
+    Returns:
+        Date in IMF-fixdate format, e.g. "Fri, 16 Oct 2026 09:30:00 GMT"
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(request: Request, last_modified: datetime) -> bool:
+    """
+    Check whether the request's If-Modified-Since covers a modification time.
+
+    If-None-Match takes precedence when present, as required by RFC 7232, so
+    this returns False for such requests.
+
+    Args:
+        request: Incoming request
+        last_modified: Time the resource last changed
+
+    Returns:
+        True if the client's copy is current
+    """
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or "if-none-match" in request.headers:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False  # Invalid dates are ignored
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
@@ -0,0 +1,36 @@
+"""
+file_storage.py - Local file storage for uploaded documents
+This file stores document files under UPLOAD_DIR for the Culinary Academy
+Student Registration system, one directory per user, with random file names
+so stored files cannot be guessed.
+"""
+
+import os
+import uuid
+from typing import Optional
+
+from app.core.config import settings
+
+
+class FileStorageManager:
+    """Store and remove files under the upload directory."""
+
+    def __init__(self, root_dir: Optional[str] = None):
+        self.root_dir = root_dir or settings.UPLOAD_DIR
+
+    def store_file(self, *, file_content: bytes, filename: str, user_id: int) -> str:
+        """Write a file to the user's directory and return its path."""
+        user_dir = os.path.join(self.root_dir, str(user_id))
+        os.makedirs(user_dir, exist_ok=True)
+        extension = os.path.splitext(filename or "")[1]
+        file_path = os.path.join(user_dir, f"{uuid.uuid4().hex}{extension}")
+        with open(file_path, "wb") as out:
+            out.write(file_content)
+        return file_path
+
+    def delete_file(self, file_path: str) -> None:
+        """Remove a stored file if it still exists."""
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass